@@ -0,0 +1,24 @@
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from infrastructure.db.catalog_cache import CatalogPayload
+
+# Catalogos protegidos por usuario: cache privada, revalidacion barata via ETag al caducar
+CATALOG_CACHE_CONTROL = "private, max-age=60"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def catalog_response(request: Request, payload: CatalogPayload) -> Response:
+    """JSON precalculado con ETag; 304 sin cuerpo si el cliente ya tiene esta version."""
+    # ETag debil: GZipMiddleware cambia los bytes enviados pero no el contenido
+    headers = {"ETag": f"W/{payload.etag}", "Cache-Control": CATALOG_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
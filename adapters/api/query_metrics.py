@@ -0,0 +1,72 @@
+import logging
+import os
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.db import query_metrics
+
+logger = logging.getLogger("http.queries")
+
+# en debug las respuestas llevan Server-Timing con consultas y tiempo de BD (visible en devtools)
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+
+def _route_name(scope: Scope) -> str:
+    # APIRoute deja la ruta resuelta en el scope: plantilla (/users/{user_id}) para poder agregar
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class QueryMetricsMiddleware:
+    """ASGI puro (no BaseHTTPMiddleware): no rompe el streaming ni copia el cuerpo."""
+
+    def __init__(self, app: ASGIApp, debug: bool = DEBUG):
+        self.app = app
+        self.debug = debug
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats, token = query_metrics.start(f"{scope['method']} {scope['path']}")
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.debug:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.ms};desc="{stats.count} queries", app;dur={total_ms:.2f}',
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_metrics.stop(token)
+            total_ms = round((time.perf_counter() - started) * 1000, 2)
+            route = _route_name(scope)
+            logger.info(
+                "[http][db] route=%s method=%s status=%s queries=%s db_ms=%s total_ms=%s",
+                route,
+                scope["method"],
+                status_code,
+                stats.count,
+                stats.ms,
+                total_ms,
+                extra={
+                    "route": route,
+                    "method": scope["method"],
+                    "status": status_code,
+                    "queries": stats.count,
+                    "db_ms": stats.ms,
+                    "total_ms": total_ms,
+                },
+            )
@@ -1,10 +1,10 @@
 import logging
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
 from typing import List, Optional, Dict, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Body
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy import and_
 
 from application.schemas import (
     CareerSnapshot,
@@ -16,30 +16,42 @@ from application.schemas import (
     WorkoutResultWithXp,
     WorkoutResultRead,
     WorkoutResultCreate,
+    RecommendationsResponse,
 )
 from application.services import (
     AthleteService,
+    AthleteStatsService,
     CareerService,
     AchievementService,
     MissionService,
+    PerformanceSketchService,
+    RecommendationService,
+    TrainingLoadService,
     WorkoutXPService,
     WorkoutResultService,
     WorkoutService,
+    overview_cache,
 )
+from application.services.athlete_stats_service import SKILL_AGGREGATE_NOTE
+from domain.services.training_load import session_load
 from infrastructure.auth.dependencies import get_current_user
 from infrastructure.db.session import get_session
+from infrastructure.db.lookup_registry import lookup_registry
+from infrastructure.db.repositories import UserPRRepository, UserSkillTotalsRepository
+from infrastructure.db.repositories.user_metrics_repository import SKILL_TOTAL_COLUMNS
 from infrastructure.db.models import (
     UserAchievementORM,
     UserCapacityProfileORM,
-    UserTrainingLoadORM,
+    UserCapacityCurrentORM,
     UserBiometricORM,
+    UserBiometricCurrentORM,
     UserProgressORM,
     PhysicalCapacityORM,
     WorkoutORM,
     WorkoutExecutionORM,
     WorkoutExecutionBlockORM,
     UserSkillORM,
-    UserPROM,
+    UserSkillCurrentORM,
     MovementORM,
     WorkoutAnalysisORM,
     WorkoutBlockMovementORM,
@@ -53,7 +65,6 @@ SKILL_CANDIDATES = {
     "skill_kettlebell_lunge": "Kettlebell Lunge",
     "skill_burpee_box_jump_over": "Burpee Box Jump Over",
 }
-PR_TIME_TYPES = {"time"}
 PR_TYPES_ORDER = {"BEST_TIME", "BEST_PACE", "MAX_REPS", "1RM", "3RM", "5RM"}
 
 
@@ -199,6 +210,15 @@ def missions(session: Session = Depends(get_session), current_user=Depends(get_c
     ]
 
 
+@router.get("/recommendations", response_model=RecommendationsResponse)
+def recommendations(
+    limit: int = Query(10, ge=1, le=50),
+    session: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+):
+    return RecommendationService(session).recommend(current_user.id, limit=limit)
+
+
 @router.get("/benchmarks", response_model=List[BenchmarkItem])
 def benchmarks(session: Session = Depends(get_session), current_user=Depends(get_current_user)):
     athlete_service = AthleteService(session)
@@ -313,16 +333,14 @@ def submit_result(
 
     # Persistir ejecución y bloques si aplica
     execution_id = None
-    impact_snapshot = {
-        "acute_load": float(total_seconds or 0),
-        "chronic_load": float(total_seconds or 0) * 0.65,
-    }
+    # carga de la sesion (sRPE); la aguda/cronica las mantiene TrainingLoadService
+    impact_snapshot = {"session_load": round(session_load(total_seconds, payload.difficulty), 2)}
     execution = (
         session.query(WorkoutExecutionORM)
         .filter(
             WorkoutExecutionORM.user_id == current_user.id,
             WorkoutExecutionORM.workout_id == workout_id,
-            func.date(WorkoutExecutionORM.executed_at) == date.today(),
+            _executed_on(date.today()),
         )
         .order_by(WorkoutExecutionORM.executed_at.desc())
         .first()
@@ -378,31 +396,22 @@ def submit_result(
                 )
             )
 
-    # actualizar carga diaria básica
-    tl_today = (
-        session.query(UserTrainingLoadORM)
-        .filter(UserTrainingLoadORM.user_id == current_user.id, UserTrainingLoadORM.load_date == date.today())
-        .with_for_update()
-        .first()
-    )
     if not skip_training_load:
-        if tl_today:
-            base_acute = float(tl_today.acute_load or 0)
-            base_chronic = float(tl_today.chronic_load or 0)
-            tl_today.acute_load = base_acute + float(impact_snapshot["acute_load"])
-            tl_today.chronic_load = base_chronic + float(impact_snapshot["chronic_load"])
-            tl_today.load_ratio = float(tl_today.acute_load) / float(tl_today.chronic_load or tl_today.acute_load or 1)
-        else:
-            tl_today = UserTrainingLoadORM(
-                user_id=current_user.id,
-                load_date=date.today(),
-                acute_load=float(impact_snapshot["acute_load"]),
-                chronic_load=float(impact_snapshot["chronic_load"]),
-                load_ratio=1.0,
-                notes=f"WOD {workout_id} metodo {payload.method}",
-            )
-            session.add(tl_today)
+        TrainingLoadService(session).record_session(
+            current_user.id,
+            impact_snapshot["session_load"],
+            notes=f"WOD {workout_id} metodo {payload.method}",
+            seconds=total_seconds,
+            domain_code=workout_row.domain.code if workout_row and workout_row.domain else None,
+        )
 
+    pr_candidates = _pr_candidates_from_execution(
+        workout_row,
+        ordered_blocks,
+        block_times if payload.method == "by_blocks" else [],
+        total_seconds,
+    )
+    PerformanceSketchService(session).record_movement_times(current_user.athlete_level_id, pr_candidates)
     session.commit()
 
     result_service = WorkoutResultService(session)
@@ -429,10 +438,9 @@ def submit_result(
         session=session,
         user_id=current_user.id,
         workout=workout_row,
-        ordered_blocks=ordered_blocks,
-        block_times=block_times if payload.method == "by_blocks" else [],
-        total_seconds=total_seconds,
+        candidates=pr_candidates,
     )
+    overview_cache.invalidate(current_user.id)
     completed, _ = mission_service.update_progress_for_workout(current_user.id, new_pr=new_pr)
     response = WorkoutResultWithXp(
         result=created,
@@ -446,14 +454,19 @@ def submit_result(
     return response
 
 
+def _executed_on(day: date):
+    """executed_at dentro de ``day`` como rango semiabierto [dia, dia + 1): a diferencia de func.date(), usa el indice."""
+    start = datetime.combine(day, time.min)
+    return and_(WorkoutExecutionORM.executed_at >= start, WorkoutExecutionORM.executed_at < start + timedelta(days=1))
+
+
 def _capacity_code_map(session: Session) -> Dict[str, int]:
     mapping: Dict[str, int] = {}
-    rows = session.query(PhysicalCapacityORM).all()
-    for row in rows:
-        key = (row.code or "").strip().lower()
+    for code, capacity_id in lookup_registry.ids(session, PhysicalCapacityORM).items():
+        key = (code or "").strip().lower()
         if not key:
             continue
-        mapping[key] = row.id
+        mapping[key] = capacity_id
     return mapping
 
 
@@ -532,26 +545,44 @@ def _map_profile_to_metrics(profile: dict) -> Dict[str, Any]:
             out["hrv"] = float(_get("hrv"))
         if _get("sleep_hours") is not None:
             out["sleep_hours"] = float(_get("sleep_hours"))
-    tl_rows = profile.get("training_load", [])
-    if tl_rows:
-        latest_tl = tl_rows[0]
-        getter = (lambda attr: latest_tl.get(attr)) if isinstance(latest_tl, dict) else (lambda attr: getattr(latest_tl, attr, None))
-        if getter("acute_load") is not None:
-            out["acute_load"] = float(getter("acute_load"))
-        if getter("chronic_load") is not None:
-            out["chronic_load"] = float(getter("chronic_load"))
-        if getter("load_ratio") is not None:
-            out["load_ratio"] = float(getter("load_ratio"))
+    # estado EWMA decaido a hoy, no la ultima foto diaria
+    load_now = profile.get("training_load_current")
+    if load_now:
+        for key in ("acute_load", "chronic_load", "load_ratio"):
+            if load_now.get(key) is not None:
+                out[key] = float(load_now[key])
     return out
 
 
 def _skill_movement_map(session: Session) -> Dict[str, int]:
-    mapping: Dict[str, int] = {}
-    for key, name in SKILL_CANDIDATES.items():
-        mv = session.query(MovementORM).filter(func.lower(MovementORM.name) == name.lower()).first()
-        if mv:
-            mapping[key] = mv.id
-    return mapping
+    ids = lookup_registry.ids_by_name(session, MovementORM, SKILL_CANDIDATES.values())
+    return {key: ids[name] for key, name in SKILL_CANDIDATES.items() if name in ids}
+
+
+def _latest_capacity_values(session: Session, user_id: int, capacity_ids) -> Dict[int, float]:
+    """Ultimo valor de cada capacidad del usuario, via la tabla de estado actual (lookup por PK)."""
+    if not capacity_ids:
+        return {}
+    rows = (
+        session.query(UserCapacityProfileORM.capacity_id, UserCapacityProfileORM.value)
+        .join(UserCapacityCurrentORM, UserCapacityCurrentORM.capacity_profile_id == UserCapacityProfileORM.id)
+        .filter(UserCapacityCurrentORM.user_id == user_id, UserCapacityCurrentORM.capacity_id.in_(capacity_ids))
+        .all()
+    )
+    return {capacity_id: float(value) for capacity_id, value in rows}
+
+
+def _latest_skill_rows(session: Session, user_id: int, movement_ids) -> Dict[int, UserSkillORM]:
+    """Ultima fila de skill por movimiento, via la tabla de estado actual (lookup por PK)."""
+    if not movement_ids:
+        return {}
+    rows = (
+        session.query(UserSkillORM)
+        .join(UserSkillCurrentORM, UserSkillCurrentORM.skill_id == UserSkillORM.id)
+        .filter(UserSkillCurrentORM.user_id == user_id, UserSkillCurrentORM.movement_id.in_(movement_ids))
+        .all()
+    )
+    return {row.movement_id: row for row in rows}
 
 
 def _infer_skill_deltas_from_workout(workout: WorkoutORM) -> Dict[str, float]:
@@ -571,48 +602,6 @@ def _infer_skill_deltas_from_workout(workout: WorkoutORM) -> Dict[str, float]:
     return deltas
 
 
-def _best_pr_row(session: Session, user_id: int, movement_id: int, pr_type: str) -> Optional[UserPROM]:
-    query = (
-        session.query(UserPROM)
-        .filter(UserPROM.user_id == user_id, UserPROM.movement_id == movement_id, UserPROM.pr_type == pr_type)
-    )
-    if pr_type == "time":
-        return query.order_by(UserPROM.value.asc()).first()
-    return query.order_by(UserPROM.value.desc()).first()
-
-
-def _register_pr_if_better(
-    session: Session, user_id: int, movement_id: int, pr_type: str, value: float, unit: Optional[str]
-) -> bool:
-    existing = _best_pr_row(session, user_id, movement_id, pr_type)
-    is_better = False
-    if not existing:
-        is_better = True
-    elif pr_type == "time":
-        try:
-            is_better = float(value) < float(existing.value)
-        except Exception:
-            is_better = False
-    else:
-        try:
-            is_better = float(value) > float(existing.value)
-        except Exception:
-            is_better = False
-    if not is_better:
-        return False
-    session.add(
-        UserPROM(
-            user_id=user_id,
-            movement_id=movement_id,
-            pr_type=pr_type,
-            value=value,
-            unit=unit or ("s" if pr_type == "time" else None),
-            achieved_at=datetime.utcnow(),
-        )
-    )
-    return True
-
-
 def _pr_candidates_from_execution(
     workout: Optional[WorkoutORM],
     ordered_blocks: List[Any],
@@ -639,76 +628,31 @@ def _pr_candidates_from_execution(
     return candidates
 
 
-def _load_skill_note(existing_note: Optional[str]) -> Dict[str, Any]:
-    import json
-    if not existing_note:
-        return {}
-    try:
-        parsed = json.loads(existing_note)
-        return parsed if isinstance(parsed, dict) else {}
-    except Exception:
-        return {}
-
-
-def _skill_primary_metric(totals: Dict[str, float]) -> tuple[str, float]:
-    for key in ["total_kg", "total_reps", "total_meters", "total_cals", "total_seconds"]:
-        val = float(totals.get(key) or 0)
-        if val > 0:
-            return key, val
-    return "total_seconds", float(totals.get("total_seconds") or 0)
-
-
 def _aggregate_skill_for_movement(
     session: Session,
     user_id: int,
     movement_id: int,
-    inc: Dict[str, float],
-    source: str = "wod_apply",
+    latest: Dict[int, UserSkillORM],
 ) -> None:
+    """Marca el movimiento como entrenado (fila ``SKILL_AGGREGATE_NOTE``) sin tocar su puntuacion 0-100.
+
+    El volumen acumulado vive solo en user_skill_totals; la fila conserva el ultimo skill_score
+    del movimiento. ``latest`` guarda la fila resultante.
+    """
     now = datetime.utcnow()
-    existing = (
-        session.query(UserSkillORM)
-        .filter(UserSkillORM.user_id == user_id, UserSkillORM.movement_id == movement_id)
-        .order_by(UserSkillORM.measured_at.desc())
-        .first()
-    )
-    totals = _load_skill_note(existing.note if existing else None)
-    totals["total_reps"] = float(totals.get("total_reps") or 0) + float(inc.get("reps") or 0)
-    totals["total_kg"] = float(totals.get("total_kg") or 0) + float(inc.get("kg") or 0)
-    totals["total_meters"] = float(totals.get("total_meters") or 0) + float(inc.get("meters") or 0)
-    totals["total_cals"] = float(totals.get("total_cals") or 0) + float(inc.get("cals") or 0)
-    totals["total_seconds"] = float(totals.get("total_seconds") or 0) + float(inc.get("seconds") or 0)
-    totals["last_increment"] = {
-        "reps": inc.get("reps", 0),
-        "kg": inc.get("kg", 0),
-        "meters": inc.get("meters", 0),
-        "cals": inc.get("cals", 0),
-        "seconds": inc.get("seconds", 0),
-    }
-    totals["source"] = source
-    totals["updated_at"] = now.isoformat()
-    primary_metric, primary_value = _skill_primary_metric(totals)
-    totals["primary_metric"] = primary_metric
-    totals["primary_value"] = primary_value
-    skill_score = primary_value
-
-    import json
-
-    if existing:
-        existing.skill_score = skill_score
-        existing.note = json.dumps(totals)
+    existing = latest.get(movement_id)
+    if existing is not None and existing.note == SKILL_AGGREGATE_NOTE:
         existing.measured_at = now
         session.add(existing)
-    else:
-        session.add(
-            UserSkillORM(
-                user_id=user_id,
-                movement_id=movement_id,
-                skill_score=skill_score,
-                note=json.dumps(totals),
-                measured_at=now,
-            )
-        )
+        return
+    latest[movement_id] = UserSkillORM(
+        user_id=user_id,
+        movement_id=movement_id,
+        skill_score=existing.skill_score if existing is not None else 0,
+        note=SKILL_AGGREGATE_NOTE,
+        measured_at=now,
+    )
+    session.add(latest[movement_id])
 
 
 def _extract_movements_payload(workout: WorkoutORM) -> List[WorkoutBlockMovementORM]:
@@ -726,167 +670,56 @@ def _movement_increment(mv: WorkoutBlockMovementORM) -> Dict[str, float]:
     reps = float(mv.reps or 0)
     load = float(mv.load or 0)
     inc = {
-        "reps": reps,
-        "kg": reps * load if reps and load else 0.0,
-        "meters": float(mv.distance_meters or 0),
-        "seconds": float(mv.duration_seconds or 0),
-        "cals": float(mv.calories or 0),
+        "total_reps": reps,
+        "total_kg": reps * load if reps and load else 0.0,
+        "total_meters": float(mv.distance_meters or 0),
+        "total_seconds": float(mv.duration_seconds or 0),
+        "total_cals": float(mv.calories or 0),
     }
     return inc
 
 
-def _upsert_skill_aggregates(session: Session, user_id: int, workout: WorkoutORM) -> int:
+def _upsert_skill_aggregates(
+    session: Session, user_id: int, workout: WorkoutORM, latest: Dict[int, UserSkillORM]
+) -> int:
     rows = _extract_movements_payload(workout)
     if not rows:
         return 0
     count = 0
+    increments: Dict[int, Dict[str, float]] = {}
     for mv in rows:
         if not mv.movement_id:
             continue
         inc = _movement_increment(mv)
         if all(v == 0 or v is None for v in inc.values()):
             continue
-        _aggregate_skill_for_movement(session, user_id, mv.movement_id, inc)
+        movement_inc = increments.setdefault(mv.movement_id, dict.fromkeys(SKILL_TOTAL_COLUMNS, 0.0))
+        for column, value in inc.items():
+            movement_inc[column] += value
         count += 1
+    # un solo upsert con total = total + inc
+    UserSkillTotalsRepository(session).increment(user_id, increments)
+    for movement_id in increments:
+        _aggregate_skill_for_movement(session, user_id, movement_id, latest)
     if count:
         session.flush()
     return count
 
 
-def _better_pr(pr_type: str, new_value: float, old_value: float) -> bool:
-    if pr_type in {"BEST_TIME", "BEST_PACE"}:
-        return new_value < old_value
-    return new_value > old_value
-
-
-def _upsert_pr(
-    session: Session,
-    user_id: int,
-    movement_id: int,
-    pr_type: str,
-    value: float,
-    unit: Optional[str],
-) -> bool:
-    existing = (
-        session.query(UserPROM)
-        .filter(UserPROM.user_id == user_id, UserPROM.movement_id == movement_id, UserPROM.pr_type == pr_type)
-        .order_by(UserPROM.achieved_at.desc())
-        .first()
-    )
-    now = datetime.utcnow()
-    if not existing:
-        session.add(UserPROM(user_id=user_id, movement_id=movement_id, pr_type=pr_type, value=value, unit=unit, achieved_at=now))
-        return True
-    try:
-        if _better_pr(pr_type, value, float(existing.value)):
-            existing.value = value
-            existing.unit = unit or existing.unit
-            existing.achieved_at = now
-            session.add(existing)
-            return True
-    except Exception:
-        return False
-    return False
-
-
 def _update_prs_from_execution(
     session: Session,
     user_id: int,
     workout: Optional[WorkoutORM],
-    ordered_blocks: List[Any],
-    block_times: List[float],
-    total_seconds: Optional[float],
+    candidates: List[Dict[str, Any]],
 ) -> bool:
-    candidates = _pr_candidates_from_execution(workout, ordered_blocks, block_times, total_seconds)
-    created = 0
-    for item in candidates:
-        if _register_pr_if_better(
-            session=session,
-            user_id=user_id,
-            movement_id=item["movement_id"],
-            pr_type=item["pr_type"],
-            value=item["value"],
-            unit=item.get("unit"),
-        ):
-            created += 1
+    # una sola sentencia: upsert condicional en user_pr + historico de las mejoras
+    created = UserPRRepository(session).register_bests(user_id, candidates)
     if created:
         session.commit()
         logger.info("[submit_result][pr] user=%s workout=%s new_prs=%s", user_id, workout.id if workout else None, created)
     return created > 0
 
 
-def _skill_rows(session: Session, athlete_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-    query = (
-        session.query(UserSkillORM)
-        .filter(UserSkillORM.user_id == athlete_id)
-        .join(MovementORM, MovementORM.id == UserSkillORM.movement_id)
-        .order_by(UserSkillORM.skill_score.desc())
-    )
-    if limit:
-        query = query.limit(limit)
-    rows = query.all()
-    import json
-    out = [
-        {
-            "key": sk.id,
-            "name": sk.movement.name if sk.movement else "",
-            "category": sk.movement.category if sk.movement else None,
-            "unit": (_load_skill_note(sk.note).get("primary_metric") if sk.note else None) or "pts",
-            "value": float(sk.skill_score),
-            "measured_at": sk.measured_at,
-            "breakdown": _load_skill_note(sk.note) if sk.note else {},
-        }
-        for sk in rows
-    ]
-    logger.info("[skills][read] athlete=%s count=%s limit=%s", athlete_id, len(out), limit)
-    return out
-
-
-def _pr_rows(session: Session, athlete_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-    query = (
-        session.query(UserPROM)
-        .filter(UserPROM.user_id == athlete_id)
-        .join(MovementORM, MovementORM.id == UserPROM.movement_id)
-    )
-    # ordenar: tiempos asc, otros desc
-    query = query.order_by(
-        case((UserPROM.pr_type.in_(PR_TIME_TYPES), UserPROM.value), else_=-UserPROM.value).asc()
-    )
-    if limit:
-        query = query.limit(limit)
-    rows = query.all()
-    out = [
-        {
-            "name": pr.movement.name if pr.movement else "",
-            "type": pr.pr_type,
-            "unit": pr.unit or ("s" if pr.pr_type in PR_TIME_TYPES else None),
-            "value": float(pr.value),
-            "achieved_at": pr.achieved_at,
-        }
-        for pr in rows
-    ]
-    logger.info("[prs][read] athlete=%s count=%s limit=%s", athlete_id, len(out), limit)
-    return out
-
-
-def _overview_payload(session: Session, athlete_id: int, top_limit: int = 5) -> Dict[str, Any]:
-    top_skills = _skill_rows(session, athlete_id, limit=top_limit)
-    top_prs = _pr_rows(session, athlete_id, limit=top_limit)
-    # aggregate totals from all skills breakdown
-    all_skills = _skill_rows(session, athlete_id, limit=None)
-    totals = {
-        "skills_total": sum(item["value"] for item in all_skills),
-        "prs_total": len(top_prs),
-        "total_reps": sum((item.get("breakdown") or {}).get("total_reps", 0) for item in all_skills),
-        "total_kg": sum((item.get("breakdown") or {}).get("total_kg", 0) for item in all_skills),
-        "total_meters": sum((item.get("breakdown") or {}).get("total_meters", 0) for item in all_skills),
-        "total_cals": sum((item.get("breakdown") or {}).get("total_cals", 0) for item in all_skills),
-        "total_seconds": sum((item.get("breakdown") or {}).get("total_seconds", 0) for item in all_skills),
-    }
-    logger.info("[stats][overview] athlete=%s skills=%s prs=%s", athlete_id, len(top_skills), len(top_prs))
-    return {"topSkills": top_skills, "topPrs": top_prs, "totals": totals}
-
-
 def _parse_capacity_focus(capacity_focus: List[dict]) -> Dict[str, float]:
     def _parse_value(val_raw) -> float:
         if isinstance(val_raw, (int, float)):
@@ -1079,8 +912,12 @@ def apply_workout_impact(
         analysis_row.id,
         list(impact_delta.keys()),
     )
+    # ultimas filas de skill (agregados + skills del impacto) en una sola query
+    skill_map = _skill_movement_map(session)
+    skill_movement_ids = {mv.movement_id for mv in _extract_movements_payload(workout) if mv.movement_id}
+    latest_skills = _latest_skill_rows(session, current_user.id, skill_movement_ids | set(skill_map.values()))
     # aggregate skills by movement exposure
-    skills_count = _upsert_skill_aggregates(session, current_user.id, workout)
+    skills_count = _upsert_skill_aggregates(session, current_user.id, workout, latest_skills)
     if skills_count:
         logger.info("[apply-impact][skills] user=%s workout=%s updated_skills=%s", current_user.id, workout_id, skills_count)
 
@@ -1115,9 +952,9 @@ def apply_workout_impact(
     except Exception:
         estimated_diff = None
     cap_code_map = _capacity_code_map(session)
-    skill_map = _skill_movement_map(session)
     skill_inferred = _infer_skill_deltas_from_workout(workout)
     applied_metrics: Dict[str, Any] = {}
+    new_rows: List[Any] = []
     now = datetime.utcnow()
     delta_acute = float(impact_delta.get("acute_load", 0))
     delta_chronic = float(impact_delta.get("chronic_load", 0))
@@ -1129,6 +966,7 @@ def apply_workout_impact(
     if impact_delta.get("fatigue_score") is not None:
         impact_delta["fatigue_score"] = float(impact_delta["fatigue_score"]) * level_factor_fatigue
 
+    capacity_deltas = []
     for key, delta in impact_delta.items():
         if key in {"fatigue_score", "acute_load", "chronic_load", "load_ratio"} or str(key).startswith("skill_"):
             continue
@@ -1140,28 +978,24 @@ def apply_workout_impact(
         if not cap_id:
             logger.warning("[apply-impact] Capacity %s not found in DB", canonical_code)
             continue
-        latest = (
-            session.query(UserCapacityProfileORM)
-            .filter(UserCapacityProfileORM.user_id == current_user.id, UserCapacityProfileORM.capacity_id == cap_id)
-            .order_by(UserCapacityProfileORM.measured_at.desc())
-            .first()
-        )
-        base_value = float(latest.value) if latest else 0.0
-        new_value = _clamp_capacity(base_value + delta)
+        capacity_deltas.append((key, cap_id, delta))
+
+    latest_capacities = _latest_capacity_values(session, current_user.id, {cap_id for _, cap_id, _ in capacity_deltas})
+    # claves que apuntan a la misma capacidad (p.ej. "strength" y "fuerza") se acumulan en una sola fila
+    capacity_rows: Dict[int, UserCapacityProfileORM] = {}
+    for key, cap_id, delta in capacity_deltas:
+        new_value = _clamp_capacity(latest_capacities.get(cap_id, 0.0) + delta)
+        latest_capacities[cap_id] = new_value
         applied_metrics[key] = new_value
-        session.add(
-            UserCapacityProfileORM(
-                user_id=current_user.id,
-                capacity_id=cap_id,
-                value=int(round(new_value)),
-                measured_at=now,
-            )
-        )
+        row = capacity_rows.get(cap_id)
+        if row is None:
+            row = capacity_rows[cap_id] = UserCapacityProfileORM(user_id=current_user.id, capacity_id=cap_id, measured_at=now)
+        row.value = int(round(new_value))
+    new_rows.extend(capacity_rows.values())
 
     fatigue_delta = impact_delta.get("fatigue_score")
     if fatigue_delta is not None:
         # factor por nivel y cantidad de sesiones en el día
-        progress_row = session.query(UserProgressORM).filter(UserProgressORM.user_id == current_user.id).first()
         level_factor = 1.0
         if progress_row:
             if progress_row.level <= 2:
@@ -1174,14 +1008,14 @@ def apply_workout_impact(
             session.query(WorkoutExecutionORM)
             .filter(
                 WorkoutExecutionORM.user_id == current_user.id,
-                func.date(WorkoutExecutionORM.executed_at) == date.today(),
+                _executed_on(date.today()),
             )
             .count()
         )
         latest_bio = (
             session.query(UserBiometricORM)
-            .filter(UserBiometricORM.user_id == current_user.id)
-            .order_by(UserBiometricORM.measured_at.desc())
+            .join(UserBiometricCurrentORM, UserBiometricCurrentORM.biometric_id == UserBiometricORM.id)
+            .filter(UserBiometricCurrentORM.user_id == current_user.id)
             .first()
         )
         base_fatigue = float(latest_bio.fatigue_score) if latest_bio and latest_bio.fatigue_score is not None else 0.0
@@ -1199,7 +1033,7 @@ def apply_workout_impact(
 
         # el campo es Numeric(4,2) en DB: max ~99.99, mantenemos margen
         new_fatigue = min(99.0, base_fatigue + fatigue_gain)
-        session.add(
+        new_rows.append(
             UserBiometricORM(
                 user_id=current_user.id,
                 measured_at=now,
@@ -1214,15 +1048,10 @@ def apply_workout_impact(
         delta = impact_delta.get(key) if key in impact_delta else skill_inferred.get(key)
         if delta is None:
             continue
-        latest_skill = (
-            session.query(UserSkillORM)
-            .filter(UserSkillORM.user_id == current_user.id, UserSkillORM.movement_id == mv_id)
-            .order_by(UserSkillORM.measured_at.desc())
-            .first()
-        )
+        latest_skill = latest_skills.get(mv_id)
         base_score = float(latest_skill.skill_score) if latest_skill else 0.0
         new_score = max(0.0, min(100.0, base_score + float(delta)))
-        session.add(
+        new_rows.append(
             UserSkillORM(
                 user_id=current_user.id,
                 movement_id=mv_id,
@@ -1232,13 +1061,15 @@ def apply_workout_impact(
             )
         )
         applied_metrics[key] = new_score
+    # un INSERT multi-fila por tabla en el flush (insertmanyvalues)
+    session.add_all(new_rows)
 
     existing_exec = (
         session.query(WorkoutExecutionORM)
         .filter(
             WorkoutExecutionORM.user_id == current_user.id,
             WorkoutExecutionORM.workout_id == workout.id,
-            func.date(WorkoutExecutionORM.executed_at) == date.today(),
+            _executed_on(date.today()),
         )
         .order_by(WorkoutExecutionORM.executed_at.desc())
         .with_for_update()
@@ -1259,49 +1090,29 @@ def apply_workout_impact(
             workout_id=workout.id,
             user_id=current_user.id,
             executed_at=now,
-            raw_ocr_json={"analysis_id": analysis_id, "impact_applied": True, "impact": impact_delta},
+            # session_load: la carga sumada al EWMA y a los rollups, como en submit_result
+            raw_ocr_json={
+                "analysis_id": analysis_id,
+                "impact_applied": True,
+                "impact": {**impact_delta, "session_load": delta_acute},
+            },
             notes=f"Impacto aplicado {now.isoformat()}",
         )
         session.add(exec_row)
 
     # si ya existia ejecucion del dia (por submit_result), no sumamos carga de nuevo
     if not skip_load_update:
-        tl_today = (
-            session.query(UserTrainingLoadORM)
-            .filter(UserTrainingLoadORM.user_id == current_user.id, UserTrainingLoadORM.load_date == date.today())
-            .with_for_update()
-            .first()
-        )
-        tl_latest = (
-            session.query(UserTrainingLoadORM)
-            .filter(UserTrainingLoadORM.user_id == current_user.id)
-            .order_by(UserTrainingLoadORM.load_date.desc())
-            .first()
+        # acute_load del impacto es la carga de la sesion; el engine EWMA calcula aguda, cronica y ratio
+        load_snapshot = TrainingLoadService(session).record_session(
+            current_user.id,
+            delta_acute,
+            notes=f"Impacto WOD {workout.id} analysis {analysis_id}",
+            domain_code=workout.domain.code if workout.domain else None,
         )
-        base_acute = float(tl_latest.acute_load) if tl_latest and tl_latest.acute_load is not None else 0.0
-        base_chronic = float(tl_latest.chronic_load) if tl_latest and tl_latest.chronic_load is not None else 0.0
-        base_ratio = float(tl_latest.load_ratio) if tl_latest and tl_latest.load_ratio is not None else None
-        new_acute = base_acute + delta_acute
-        new_chronic = base_chronic + delta_chronic
-        computed_ratio = delta_ratio if delta_ratio is not None else (new_acute / new_chronic if new_chronic else base_ratio)
-        if tl_today:
-            tl_today.acute_load = new_acute
-            tl_today.chronic_load = new_chronic
-            tl_today.load_ratio = computed_ratio
-        else:
-            tl_today = UserTrainingLoadORM(
-                user_id=current_user.id,
-                load_date=date.today(),
-                acute_load=new_acute,
-                chronic_load=new_chronic,
-                load_ratio=computed_ratio or 1.0,
-                notes=f"Impacto WOD {workout.id} analysis {analysis_id}",
-            )
-            session.add(tl_today)
-        applied_metrics["acute_load"] = new_acute
-        applied_metrics["chronic_load"] = new_chronic
-        if computed_ratio is not None:
-            applied_metrics["load_ratio"] = computed_ratio
+        applied_metrics["acute_load"] = load_snapshot["acute_load"]
+        applied_metrics["chronic_load"] = load_snapshot["chronic_load"]
+        if load_snapshot["load_ratio"] is not None:
+            applied_metrics["load_ratio"] = load_snapshot["load_ratio"]
     else:
         applied_metrics["acute_load"] = delta_acute
         applied_metrics["chronic_load"] = delta_chronic
@@ -1327,6 +1138,7 @@ def apply_workout_impact(
         career_snapshot = CareerService(session).snapshot(current_user.id)
 
     session.commit()
+    overview_cache.invalidate(current_user.id)
 
     logger.info(
         "[apply-impact] Applied impact for user=%s workout=%s metrics_updated=%s xp=%s",
@@ -1361,35 +1173,35 @@ def apply_workout_impact(
 def athlete_skills_top(athlete_id: int, limit: int = 5, session: Session = Depends(get_session), current_user=Depends(get_current_user)):
     if current_user.id != athlete_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to this athlete")
-    return _skill_rows(session, athlete_id, limit=limit)
+    return AthleteStatsService(session).top_skills(athlete_id, limit)
 
 
 @router.get("/{athlete_id}/skills")
 def athlete_skills(athlete_id: int, session: Session = Depends(get_session), current_user=Depends(get_current_user)):
     if current_user.id != athlete_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to this athlete")
-    return _skill_rows(session, athlete_id, limit=None)
+    return AthleteStatsService(session).skills(athlete_id)
 
 
 @router.get("/{athlete_id}/prs/top")
 def athlete_prs_top(athlete_id: int, limit: int = 5, session: Session = Depends(get_session), current_user=Depends(get_current_user)):
     if current_user.id != athlete_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to this athlete")
-    return _pr_rows(session, athlete_id, limit=limit)
+    return AthleteStatsService(session).top_prs(athlete_id, limit)
 
 
 @router.get("/{athlete_id}/prs")
 def athlete_prs(athlete_id: int, session: Session = Depends(get_session), current_user=Depends(get_current_user)):
     if current_user.id != athlete_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to this athlete")
-    return _pr_rows(session, athlete_id, limit=None)
+    return AthleteStatsService(session).prs(athlete_id)
 
 
 @router.get("/{athlete_id}/stats/overview")
 def athlete_stats_overview(athlete_id: int, session: Session = Depends(get_session), current_user=Depends(get_current_user)):
     if current_user.id != athlete_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to this athlete")
-    return _overview_payload(session, athlete_id, top_limit=5)
+    return AthleteStatsService(session).overview(athlete_id)
 
 
 def _clamp_capacity(value: float) -> float:
@@ -1,19 +1,27 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from adapters.api.http_cache import catalog_response
 from application.schemas.equipment import EquipmentCreate, EquipmentUpdate, EquipmentRead
 from application.services import EquipmentService
+from infrastructure.db.catalog_cache import catalog_cache
 from infrastructure.db.session import get_session
 
 router = APIRouter()
+_equipment_list = TypeAdapter(List[EquipmentRead])
 
 
-@router.get("/", response_model=List[EquipmentRead])
-def list_equipment(session: Session = Depends(get_session)):
+def _equipment_json(session: Session) -> bytes:
     service = EquipmentService(session)
-    return service.list()
+    return _equipment_list.dump_json([EquipmentRead.model_validate(item) for item in service.list()])
+
+
+@router.get("/", response_model=List[EquipmentRead])
+def list_equipment(request: Request, session: Session = Depends(get_session)):
+    return catalog_response(request, catalog_cache.get(session, "equipment", _equipment_json))
 
 
 @router.post("/", response_model=EquipmentRead, status_code=status.HTTP_201_CREATED)
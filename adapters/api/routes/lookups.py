@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
+from adapters.api.http_cache import catalog_response
 from application.schemas.lookups import LookupTables, LookupItem
 from application.services import LookupService
+from infrastructure.db.catalog_cache import catalog_cache
 from infrastructure.db.session import get_session
 
 router = APIRouter()
@@ -12,8 +14,7 @@ def _map(items):
     return [LookupItem.model_validate(item) for item in items]
 
 
-@router.get("/", response_model=LookupTables)
-def list_lookup_tables(session: Session = Depends(get_session)):
+def _lookup_tables_json(session: Session) -> bytes:
     service = LookupService(session)
     data = service.all()
     return LookupTables(
@@ -23,4 +24,9 @@ def list_lookup_tables(session: Session = Depends(get_session)):
         physical_capacities=_map(data["physical_capacities"]),
         muscle_groups=_map(data["muscle_groups"]),
         hyrox_stations=_map(data["hyrox_stations"]),
-    )
+    ).model_dump_json().encode()
+
+
+@router.get("/", response_model=LookupTables)
+def list_lookup_tables(request: Request, session: Session = Depends(get_session)):
+    return catalog_response(request, catalog_cache.get(session, "lookups", _lookup_tables_json))
@@ -1,13 +1,17 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from adapters.api.http_cache import catalog_response
 from application.schemas.movements import MovementRead, MovementCreate, MovementUpdate, MovementMuscleSchema
 from application.services import MovementService
+from infrastructure.db.catalog_cache import catalog_cache
 from infrastructure.db.session import get_session
 
 router = APIRouter()
+_movement_list = TypeAdapter(List[MovementRead])
 
 
 def _to_read_model(movement) -> MovementRead:
@@ -34,10 +38,14 @@ def _to_read_model(movement) -> MovementRead:
     )
 
 
-@router.get("/", response_model=List[MovementRead])
-def list_movements(session: Session = Depends(get_session)):
+def _movements_json(session: Session) -> bytes:
     service = MovementService(session)
-    return [_to_read_model(m) for m in service.list()]
+    return _movement_list.dump_json([_to_read_model(m) for m in service.list()])
+
+
+@router.get("/", response_model=List[MovementRead])
+def list_movements(request: Request, session: Session = Depends(get_session)):
+    return catalog_response(request, catalog_cache.get(session, "movements", _movements_json))
 
 
 @router.get("/{movement_id}", response_model=MovementRead)
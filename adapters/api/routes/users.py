@@ -1,13 +1,21 @@
-from typing import List
+from datetime import date
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from application.schemas.users import UserCreate, UserUpdate, UserRead, UserProfile
-from application.schemas.user_metrics import UserTrainingLoadRead, UserCapacityProfileRead, UserCapacityProfileResponse
+from application.schemas.user_metrics import (
+    UserTrainingLoadRead,
+    UserCapacityProfileRead,
+    UserCapacityProfileResponse,
+    TrainingLoadRollupResponse,
+)
 from application.schemas.events import EventRead
 from application.schemas.results import WorkoutResultRead
-from application.services import UserService
+from application.services import TrainingLoadService, UserService
+from application.services.training_load_service import TRAINING_LOAD_MAX_DAYS, TRAINING_LOAD_WINDOW_DAYS
+from domain.services.training_load import session_load
 from infrastructure.db.session import get_session
 from infrastructure.auth.dependencies import get_current_user
 from infrastructure.db.models import UserORM, WorkoutExecutionORM, WorkoutORM
@@ -97,16 +105,42 @@ def user_events(user_id: int, session: Session = Depends(get_session), current=D
 
 
 @router.get("/{user_id}/training-load", response_model=List[UserTrainingLoadRead])
-def user_training_load(user_id: int, session: Session = Depends(get_session), current=Depends(get_current_user)):
+def user_training_load(
+    user_id: int,
+    days: int = Query(TRAINING_LOAD_WINDOW_DAYS, ge=1, le=TRAINING_LOAD_MAX_DAYS),
+    session: Session = Depends(get_session),
+    current=Depends(get_current_user),
+):
     if current.id != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     service = UserService(session)
-    loads = service.training_load(user_id)
+    loads = service.training_load(user_id, days=days)
     if loads is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return [UserTrainingLoadRead.model_validate(item) for item in loads]
 
 
+@router.get("/{user_id}/training-load/rollups", response_model=TrainingLoadRollupResponse)
+def user_training_load_rollups(
+    user_id: int,
+    granularity: str = Query("week", pattern="^(day|week|month)$"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    session: Session = Depends(get_session),
+    current=Depends(get_current_user),
+):
+    """Carga, sesiones y segundos por dia/semana/mes (y por dominio) leidos de los rollups."""
+    if current.id != user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if start and end and start > end:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="start must be <= end")
+    try:
+        buckets = TrainingLoadService(session).rollups(user_id, granularity, start=start, end=end)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+    return TrainingLoadRollupResponse(user_id=user_id, granularity=granularity, buckets=buckets)
+
+
 @router.get("/{user_id}/training-load/details")
 def user_training_load_details(user_id: int, session: Session = Depends(get_session), current=Depends(get_current_user)):
     """
@@ -129,13 +163,12 @@ def user_training_load_details(user_id: int, session: Session = Depends(get_sess
         impact = {}
         if isinstance(exe.raw_ocr_json, dict):
             impact = exe.raw_ocr_json.get("impact") or {}
-        acute = impact.get("acute_load")
+        # carga de la sesion (sRPE); impact.acute_load de ejecuciones antiguas son segundos
+        acute = impact.get("session_load")
         chronic = impact.get("chronic_load")
-        # fallback: usar tiempo total si no hay impacto
+        # fallback: sRPE con el tiempo total
         if acute is None and exe.total_time_seconds is not None:
-            acute = float(exe.total_time_seconds) or 0.0
-        if chronic is None and exe.total_time_seconds is not None:
-            chronic = float(exe.total_time_seconds) * 0.65
+            acute = session_load(exe.total_time_seconds)
         details.append(
             {
                 "id": exe.id,
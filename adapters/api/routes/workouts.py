@@ -1,13 +1,8 @@
 import json
 from typing import List, Optional
 
-import io
 import logging
-import cv2
-import numpy as np
-from PIL import Image
-import pytesseract
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, status, Request, File
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, UploadFile, status, Request, File
 from sqlalchemy.orm import Session
 
 from application.schemas.workouts import (
@@ -19,15 +14,19 @@ from application.schemas.workouts import (
     WorkoutCapacitySchema,
     WorkoutHyroxStationSchema,
     WorkoutAnalysisResponse,
+    AnalysisCacheStats,
     WorkoutStatsRead,
+    LeaderboardPage,
+    WorkoutImportReport,
 )
 from application.schemas.workout_blocks import WorkoutBlockSchema, WorkoutBlockMovementSchema
 from application.schemas.movements import MovementRead, MovementMuscleSchema
-from application.services import WorkoutService
+from application.services import WorkoutService, WorkoutResultService, analysis_cache
 from application.services.xp_service import compute_xp_estimate
 from domain.services.workout_analysis import analyze_workout
 from application.services.ocr_workout_parser import parse_workout_text
 from infrastructure.db.repositories.movement_repository import MovementRepository
+from infrastructure.db.repositories.workout_stats_repository import time_stddev_seconds
 from domain.models.enums import EnergyDomain, MuscleGroup
 from infrastructure.db.session import get_session
 from infrastructure.auth.dependencies import get_current_user
@@ -109,14 +108,16 @@ def _block_to_schema(block) -> WorkoutBlockSchema:
     )
 
 
+def _xp_from_analysis(analysis: Optional[dict]) -> Optional[int]:
+    fatigue = analysis.get("fatigue_score") if analysis else None
+    if fatigue is None:
+        return None
+    return int(compute_xp_estimate(float(fatigue), None)["xp"])
+
+
 def _compute_xp_estimate_from_workout(service: WorkoutService, workout: WorkoutORM) -> Optional[int]:
     try:
-        domain_model = service._to_domain(workout)
-        analysis = analyze_workout(domain_model)
-        fatigue = analysis.get("fatigue_score")
-        if fatigue is None:
-            return None
-        return int(compute_xp_estimate(float(fatigue), None)["xp"])
+        return _xp_from_analysis(analyze_workout(service._to_analysis_input(workout)))
     except Exception:
         return None
 
@@ -196,8 +197,8 @@ def list_workouts(
     filters = WorkoutFilter(level=level, domain=domain, muscle=muscle)
     workouts = service.list(filters)
     result: List[WorkoutRead] = []
-    for workout in workouts:
-        xp_estimate = _compute_xp_estimate_from_workout(service, workout)
+    for workout, analysis in zip(workouts, service.analyze_many(workouts)):
+        xp_estimate = _xp_from_analysis(analysis)
         result.append(to_read_model(workout, xp_estimate=xp_estimate))
     return result
 
@@ -215,6 +216,8 @@ def list_workout_stats(session: Session = Depends(get_session)):
             avg_rating=_decimal_to_float(w.stats.avg_rating) if w.stats else None,
             avg_difficulty=_decimal_to_float(w.stats.avg_difficulty) if w.stats else None,
             rating_count=w.stats.rating_count if w.stats else None,
+            result_count=w.stats.result_count if w.stats else None,
+            time_stddev_seconds=time_stddev_seconds(w.stats),
         )
         for w in workouts
         if w.stats
@@ -232,13 +235,10 @@ async def ocr_wod_image(file: UploadFile = File(...)):
     filename = file.filename
 
     try:
-        image = Image.open(io.BytesIO(data)).convert("RGB")
-        np_image = np.array(image)
-        gray = cv2.cvtColor(np_image, cv2.COLOR_RGB2GRAY)
-        resized = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-        denoised = cv2.medianBlur(resized, 3)
-        thresh = cv2.adaptiveThreshold(denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 5)
-        text = pytesseract.image_to_string(thresh, lang="spa+eng", config="--psm 6")
+        # Import diferido: cv2/numpy/PIL/pytesseract solo se cargan al primer OCR.
+        from application.services.ocr_image import extract_text
+
+        text = extract_text(data)
     except Exception as exc:
         logging.exception("OCR processing failed: %s", exc)
         raise HTTPException(status_code=500, detail="No se pudo procesar la imagen.")
@@ -275,6 +275,16 @@ def create_workout(payload: WorkoutCreate, session: Session = Depends(get_sessio
     return to_read_model(workout)
 
 
+@router.post("/import", response_model=WorkoutImportReport)
+def import_workouts(
+    items: List[dict] = Body(...),
+    batch_size: int = Query(200, ge=1, le=1000),
+    session: Session = Depends(get_session),
+):
+    service = WorkoutService(session)
+    return service.import_workouts(items, batch_size=batch_size)
+
+
 @router.get("/{workout_id}", response_model=WorkoutRead)
 def get_workout(workout_id: int, session: Session = Depends(get_session)):
     service = WorkoutService(session)
@@ -382,10 +392,38 @@ async def analyze_workout_payload(
     return _with_xp_estimate(analysis, current_user)
 
 
+@analysis_router.get("/workout-analysis/cache", response_model=AnalysisCacheStats)
+def analysis_cache_stats():
+    return analysis_cache.stats()
+
+
+@router.get("/{workout_id}/leaderboard", response_model=LeaderboardPage)
+def workout_leaderboard(
+    workout_id: int,
+    level: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    session: Session = Depends(get_session),
+    current_user: UserORM = Depends(get_current_user),
+):
+    service = WorkoutResultService(session)
+    try:
+        page = service.leaderboard(workout_id, level=level, limit=limit, cursor=cursor, current_user_id=current_user.id)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if not page:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workout not found")
+    return page
+
+
 @router.get("/{workout_id}/similar", response_model=List[WorkoutRead])
-def similar_workouts(workout_id: int, session: Session = Depends(get_session)):
+def similar_workouts(
+    workout_id: int,
+    limit: int = Query(6, ge=1, le=50),
+    session: Session = Depends(get_session),
+):
     service = WorkoutService(session)
-    workouts = service.similar(workout_id)
+    workouts = service.similar(workout_id, limit=limit)
     return [to_read_model(workout) for workout in workouts]
 
 
@@ -0,0 +1,171 @@
+"""Add seed_state table and bulk-seed the base catalog.
+
+Revision ID: 20261019_01_seed_state
+Revises: 20260206_05_seed_strongman
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# revision identifiers, used by Alembic.
+revision = "20261019_01_seed_state"
+down_revision = "20260206_05_seed_strongman"
+branch_labels = None
+depends_on = None
+
+# Datos congelados a esta revision (CATALOG_SEED_VERSION = 1): no importar infrastructure.db.seed,
+# que sigue los modelos actuales.
+CATALOG_SEED_NAME = "catalog"
+CATALOG_SEED_VERSION = 1
+
+BAD_TO_GOOD_CODES = {
+    "AerÃƒÂ³bico": "Aeróbico",
+    "AnaerÃƒÂ³bico": "Anaeróbico",
+    "GimnÃ¡sticos": "Gimnásticos",
+}
+
+INTENSITY_LEVELS = [
+    {"code": "Baja", "name": "Baja", "sort_order": 1},
+    {"code": "Media", "name": "Media", "sort_order": 2},
+    {"code": "Alta", "name": "Alta", "sort_order": 3},
+]
+ENERGY_DOMAINS = [{"code": code, "name": code} for code in ("Aeróbico", "Anaeróbico", "Mixto")]
+PHYSICAL_CAPACITIES = [
+    {"code": code, "name": code}
+    for code in ("Fuerza", "Resistencia", "Velocidad", "Gimnásticos", "Metcon", "Carga muscular")
+]
+MUSCLE_GROUPS = [
+    {"code": code, "name": code} for code in ("Piernas", "Core", "Hombros", "Posterior", "Grip", "Pecho", "Brazos")
+]
+HYROX_STATIONS = [
+    {"code": code, "name": code}
+    for code in (
+        "SkiErg",
+        "Sled Push",
+        "Sled Pull",
+        "Farmers Carry",
+        "Burpee Broad Jump",
+        "Row",
+        "Sandbag Lunges",
+        "Wall Balls",
+    )
+]
+ACHIEVEMENTS = [
+    {"code": "LEVEL_5", "name": "Nivel 5 alcanzado", "category": "progression", "xp_reward": 100},
+    {"code": "LEVEL_10", "name": "Nivel 10 alcanzado", "category": "progression", "xp_reward": 200},
+    {"code": "CONSISTENCY_WEEK", "name": "3 entrenos esta semana", "category": "consistency", "xp_reward": 120},
+    {"code": "FIRST_PR", "name": "Primer PR registrado", "category": "pr", "xp_reward": 50},
+    {"code": "HYROX_TRANSFER", "name": "Transfer HYROX alto", "category": "hyrox", "xp_reward": 150},
+]
+MISSIONS = [
+    {
+        "type": "daily",
+        "title": "Haz un WOD hoy",
+        "description": "Completa cualquier entrenamiento en el dia",
+        "xp_reward": 20,
+        "condition_json": {"type": "wods", "target": 1, "window": "day"},
+    },
+    {
+        "type": "weekly",
+        "title": "Completa 3 entrenos esta semana",
+        "description": "Consigue 3 sesiones registradas en 7 dias",
+        "xp_reward": 100,
+        "condition_json": {"type": "wods", "target": 3, "window": "week"},
+    },
+    {
+        "type": "epic",
+        "title": "Rompe un PR esta semana",
+        "description": "Mejora cualquiera de tus marcas personales",
+        "xp_reward": 300,
+        "condition_json": {"type": "pr", "target": 1, "window": "week"},
+    },
+]
+
+
+def _xp_levels():
+    levels = []
+    min_xp = 0
+    for lvl in range(1, 51):
+        max_xp = min_xp + int(round(200 * (lvl ** 1.35)))
+        levels.append(
+            {
+                "code": f"L{lvl}",
+                "name": f"Nivel {lvl}",
+                "description": f"Rango {min_xp}-{max_xp} XP",
+                "sort_order": lvl,
+                "min_xp": min_xp,
+                "max_xp": max_xp,
+            }
+        )
+        min_xp = max_xp
+    return levels
+
+
+def _lookup(name, *extra):
+    return sa.table(name, sa.column("code"), sa.column("name"), sa.column("description"), *extra)
+
+
+def upgrade():
+    op.create_table(
+        "seed_state",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("applied_at", sa.DateTime(timezone=False), nullable=False, server_default=sa.text("now()")),
+    )
+
+    # Paso de datos: lookups, logros y misiones via INSERT ... ON CONFLICT DO NOTHING.
+    conn = op.get_bind()
+    for table_name in ("energy_domains", "physical_capacities"):
+        for bad, good in BAD_TO_GOOD_CODES.items():
+            # si ya existe el codigo bueno el malo se deja para no violar uq_*_code
+            conn.execute(
+                sa.text(
+                    f"UPDATE {table_name} SET code = :good, name = :good WHERE code = :bad "
+                    f"AND NOT EXISTS (SELECT 1 FROM {table_name} WHERE code = :good)"
+                ),
+                {"bad": bad, "good": good},
+            )
+
+    lookups = [
+        (_lookup("athlete_levels", sa.column("sort_order"), sa.column("min_xp"), sa.column("max_xp")), _xp_levels()),
+        (_lookup("intensity_levels", sa.column("sort_order")), INTENSITY_LEVELS),
+        (_lookup("energy_domains"), ENERGY_DOMAINS),
+        (_lookup("physical_capacities"), PHYSICAL_CAPACITIES),
+        (_lookup("muscle_groups"), MUSCLE_GROUPS),
+        (_lookup("hyrox_stations"), HYROX_STATIONS),
+        (
+            sa.table("achievements", sa.column("code"), sa.column("name"), sa.column("category"), sa.column("xp_reward")),
+            ACHIEVEMENTS,
+        ),
+    ]
+    for table, rows in lookups:
+        conn.execute(pg_insert(table).values(rows).on_conflict_do_nothing(index_elements=["code"]))
+
+    # missions no tiene clave unica: solo las que falten por (type, title)
+    missions = sa.table(
+        "missions",
+        sa.column("type"),
+        sa.column("title"),
+        sa.column("description"),
+        sa.column("xp_reward"),
+        sa.column("condition_json", postgresql.JSONB),
+    )
+    existing = {(row.type, row.title) for row in conn.execute(sa.select(missions.c.type, missions.c.title))}
+    missing = [mission for mission in MISSIONS if (mission["type"], mission["title"]) not in existing]
+    if missing:
+        conn.execute(missions.insert().values(missing))
+
+    seed_state = sa.table("seed_state", sa.column("name"), sa.column("version"))
+    conn.execute(
+        pg_insert(seed_state)
+        .values(name=CATALOG_SEED_NAME, version=CATALOG_SEED_VERSION)
+        .on_conflict_do_update(index_elements=["name"], set_={"version": CATALOG_SEED_VERSION})
+    )
+
+
+def downgrade():
+    # El catalogo sembrado se conserva para no romper datos existentes
+    op.drop_table("seed_state")
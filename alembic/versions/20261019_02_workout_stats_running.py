@@ -0,0 +1,82 @@
+"""Running aggregates (count, sum, sum of squares) on workout_stats.
+
+Revision ID: 20261019_02_stats_running
+Revises: 20261019_01_seed_state
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_02_stats_running"
+down_revision = "20261019_01_seed_state"
+branch_labels = None
+depends_on = None
+
+AGGREGATE_COLUMNS = [
+    ("result_count", sa.Integer()),
+    ("time_sum", sa.BigInteger()),
+    ("time_sq_sum", sa.BigInteger()),
+    ("rating_sum", sa.Integer()),
+    ("rating_sq_sum", sa.Integer()),
+    ("difficulty_count", sa.Integer()),
+    ("difficulty_sum", sa.Integer()),
+    ("difficulty_sq_sum", sa.Integer()),
+]
+
+
+def upgrade():
+    for name, type_ in AGGREGATE_COLUMNS:
+        op.add_column("workout_stats", sa.Column(name, type_, nullable=False, server_default="0"))
+
+    # Backfill: una sola pasada sobre workout_result; a partir de aqui se mantiene incrementalmente
+    op.execute(
+        """
+        INSERT INTO workout_stats (workout_id, rating_count)
+        SELECT DISTINCT r.workout_id, 0 FROM workout_result r
+        ON CONFLICT (workout_id) DO NOTHING
+        """
+    )
+    # Las medias solo se derivan de resultados: lo que no tenga muestras queda a cero / NULL
+    op.execute(
+        "UPDATE workout_stats SET rating_count = 0, avg_rating = NULL, avg_difficulty = NULL, avg_time_seconds = NULL"
+    )
+    op.execute(
+        """
+        UPDATE workout_stats ws SET
+            result_count = agg.n,
+            time_sum = agg.t_sum,
+            time_sq_sum = agg.t_sq,
+            rating_count = agg.r_n,
+            rating_sum = agg.r_sum,
+            rating_sq_sum = agg.r_sq,
+            difficulty_count = agg.d_n,
+            difficulty_sum = agg.d_sum,
+            difficulty_sq_sum = agg.d_sq,
+            avg_time_seconds = round(agg.t_sum::numeric / agg.n)::smallint,
+            avg_rating = CASE WHEN agg.r_n > 0 THEN round(agg.r_sum::numeric / agg.r_n, 2) ELSE NULL END,
+            avg_difficulty = CASE WHEN agg.d_n > 0 THEN round(agg.d_sum::numeric / agg.d_n, 1) ELSE NULL END
+        FROM (
+            SELECT
+                workout_id,
+                count(*) AS n,
+                sum(time_seconds)::bigint AS t_sum,
+                sum(time_seconds::bigint * time_seconds) AS t_sq,
+                count(rating) AS r_n,
+                coalesce(sum(rating), 0) AS r_sum,
+                coalesce(sum(rating * rating), 0) AS r_sq,
+                count(difficulty) AS d_n,
+                coalesce(sum(difficulty), 0) AS d_sum,
+                coalesce(sum(difficulty * difficulty), 0) AS d_sq
+            FROM workout_result
+            GROUP BY workout_id
+        ) agg
+        WHERE ws.workout_id = agg.workout_id
+        """
+    )
+
+
+def downgrade():
+    for name, _ in reversed(AGGREGATE_COLUMNS):
+        op.drop_column("workout_stats", name)
@@ -0,0 +1,56 @@
+"""Quantile sketches for workout_stats_by_level and global_performance_data.
+
+Revision ID: 20261019_03_perf_sketches
+Revises: 20261019_02_stats_running
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261019_03_perf_sketches"
+down_revision = "20261019_02_stats_running"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("workout_stats_by_level", sa.Column("time_digest", postgresql.JSONB(), nullable=True))
+
+    # global_performance_data se elimino en 20260205_01 pero el modelo sigue mapeado; se recrea
+    # como destino de los percentiles por (movimiento, nivel).
+    op.create_table(
+        "global_performance_data",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("workout_id", sa.Integer(), sa.ForeignKey("workouts.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("movement_id", sa.Integer(), sa.ForeignKey("movements.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("athlete_level_id", sa.Integer(), sa.ForeignKey("athlete_levels.id"), nullable=True),
+        sa.Column("source", sa.String(length=50), nullable=True),
+        sa.Column("avg_time_seconds", sa.Numeric(8, 2), nullable=True),
+        sa.Column("avg_reps", sa.Numeric(8, 2), nullable=True),
+        sa.Column("avg_load", sa.Numeric(8, 2), nullable=True),
+        sa.Column("percentile_25", sa.Numeric(8, 2), nullable=True),
+        sa.Column("percentile_50", sa.Numeric(8, 2), nullable=True),
+        sa.Column("percentile_75", sa.Numeric(8, 2), nullable=True),
+        sa.Column("percentile_90", sa.Numeric(8, 2), nullable=True),
+        sa.Column("sample_size", sa.Integer(), nullable=True),
+        sa.Column("digest", postgresql.JSONB(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=False), nullable=False, server_default=sa.text("now()")),
+    )
+    op.create_index("ix_global_perf_level", "global_performance_data", ["athlete_level_id"])
+    op.create_index(
+        "uq_global_perf_movement_level",
+        "global_performance_data",
+        ["movement_id", "athlete_level_id"],
+        unique=True,
+        postgresql_where=sa.text("workout_id IS NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("uq_global_perf_movement_level", table_name="global_performance_data")
+    op.drop_index("ix_global_perf_level", table_name="global_performance_data")
+    op.drop_table("global_performance_data")
+    op.drop_column("workout_stats_by_level", "time_digest")
@@ -0,0 +1,55 @@
+"""Leaderboard: best result per athlete and (workout_id, time_seconds) index.
+
+Revision ID: 20261019_04_leaderboard
+Revises: 20261019_03_perf_sketches
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_04_leaderboard"
+down_revision = "20261019_03_perf_sketches"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # El indice compuesto cubre el prefijo workout_id, el simple queda redundante
+    op.create_index("ix_workout_result_workout_time", "workout_result", ["workout_id", "time_seconds"])
+    op.drop_index("ix_workout_result_workout", table_name="workout_result")
+
+    op.create_table(
+        "workout_best_result",
+        sa.Column("workout_id", sa.Integer(), sa.ForeignKey("workouts.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("athlete_level_id", sa.Integer(), sa.ForeignKey("athlete_levels.id"), nullable=True),
+        sa.Column("time_seconds", sa.SmallInteger(), nullable=False),
+        sa.Column("achieved_at", sa.DateTime(timezone=False), nullable=False, server_default=sa.text("now()")),
+    )
+    op.create_index("ix_workout_best_result_rank", "workout_best_result", ["workout_id", "time_seconds", "user_id"])
+    op.create_index(
+        "ix_workout_best_result_level_rank",
+        "workout_best_result",
+        ["workout_id", "athlete_level_id", "time_seconds", "user_id"],
+    )
+
+    op.execute(
+        """
+        INSERT INTO workout_best_result (workout_id, user_id, athlete_level_id, time_seconds, achieved_at)
+        SELECT DISTINCT ON (r.workout_id, r.user_id)
+            r.workout_id, r.user_id, u.athlete_level_id, r.time_seconds, r.created_at
+        FROM workout_result r
+        JOIN users u ON u.id = r.user_id
+        ORDER BY r.workout_id, r.user_id, r.time_seconds, r.created_at
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_workout_best_result_level_rank", table_name="workout_best_result")
+    op.drop_index("ix_workout_best_result_rank", table_name="workout_best_result")
+    op.drop_table("workout_best_result")
+    op.create_index("ix_workout_result_workout", "workout_result", ["workout_id"])
+    op.drop_index("ix_workout_result_workout_time", table_name="workout_result")
@@ -0,0 +1,64 @@
+"""Catalog version stamps bumped by statement-level triggers.
+
+Revision ID: 20261019_05_catalog_versions
+Revises: 20261019_04_leaderboard
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_05_catalog_versions"
+down_revision = "20261019_04_leaderboard"
+branch_labels = None
+depends_on = None
+
+# tabla -> grupos de catalogo cuya respuesta depende de ella
+CATALOG_TABLES = {
+    "athlete_levels": ("lookups",),
+    "intensity_levels": ("lookups",),
+    "energy_domains": ("lookups",),
+    "physical_capacities": ("lookups",),
+    "hyrox_stations": ("lookups",),
+    "muscle_groups": ("lookups", "movements"),
+    "movements": ("movements",),
+    "movement_muscles": ("movements",),
+    "movement_aliases": ("movements",),
+    "equipment": ("equipment",),
+}
+
+
+def upgrade():
+    op.create_table(
+        "catalog_version",
+        sa.Column("name", sa.String(length=32), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="1"),
+        sa.Column("updated_at", sa.DateTime(timezone=False), nullable=False, server_default=sa.text("now()")),
+    )
+    op.execute("INSERT INTO catalog_version (name) VALUES ('lookups'), ('movements'), ('equipment')")
+    op.execute(
+        """
+        CREATE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE catalog_version SET version = version + 1, updated_at = now() WHERE name = ANY(TG_ARGV);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Por sentencia: un seed o import masivo incrementa la version una sola vez
+    for table, groups in CATALOG_TABLES.items():
+        args = ", ".join(f"'{group}'" for group in groups)
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_catalog_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version({args})"
+        )
+
+
+def downgrade():
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_catalog_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_version()")
+    op.drop_table("catalog_version")
@@ -0,0 +1,118 @@
+"""Per-user current-state tables for capacities, skills and biometrics.
+
+Revision ID: 20261019_06_user_current_state
+Revises: 20261019_05_catalog_versions
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_06_user_current_state"
+down_revision = "20261019_05_catalog_versions"
+branch_labels = None
+depends_on = None
+
+# historico -> (tabla actual, columnas clave, columna puntero)
+CURRENT_TABLES = {
+    "user_capacity_profile": ("user_capacity_current", ("user_id", "capacity_id"), "capacity_profile_id"),
+    "user_skills": ("user_skill_current", ("user_id", "movement_id"), "skill_id"),
+    "user_biometrics": ("user_biometric_current", ("user_id",), "biometric_id"),
+}
+
+
+def _sync_function(history: str, current: str, keys: tuple, pointer: str) -> str:
+    """Trigger por fila: el puntero apunta siempre a la fila mas reciente por (measured_at, id)."""
+    key_list = ", ".join(keys)
+    same_key = " AND ".join(f"NEW.{key} = OLD.{key}" for key in keys)
+    old_filter = " AND ".join(f"{key} = OLD.{key}" for key in keys)
+    upsert = (
+        f"ON CONFLICT ({key_list}) DO UPDATE SET {pointer} = EXCLUDED.{pointer}, measured_at = EXCLUDED.measured_at "
+        f"WHERE (EXCLUDED.measured_at, EXCLUDED.{pointer}) >= ({current}.measured_at, {current}.{pointer})"
+    )
+    return f"""
+        CREATE FUNCTION sync_{current}() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND NOT ({same_key} AND NEW.measured_at >= OLD.measured_at)) THEN
+                -- la fila actual desaparece o retrocede: se recalcula desde el historico
+                -- (el ON DELETE CASCADE del puntero puede haber borrado ya la fila actual)
+                DELETE FROM {current} WHERE {pointer} = OLD.id;
+                IF NOT EXISTS (SELECT 1 FROM {current} WHERE {old_filter}) THEN
+                    INSERT INTO {current} ({key_list}, {pointer}, measured_at)
+                    SELECT {key_list}, id, measured_at FROM {history}
+                    WHERE {old_filter}
+                    ORDER BY measured_at DESC, id DESC
+                    LIMIT 1
+                    {upsert};
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {current} ({key_list}, {pointer}, measured_at)
+                VALUES ({", ".join(f"NEW.{key}" for key in keys)}, NEW.id, NEW.measured_at)
+                {upsert};
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade():
+    op.create_table(
+        "user_capacity_current",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column(
+            "capacity_id", sa.Integer(), sa.ForeignKey("physical_capacities.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column(
+            "capacity_profile_id",
+            sa.Integer(),
+            sa.ForeignKey("user_capacity_profile.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("measured_at", sa.DateTime(timezone=False), nullable=False),
+    )
+    op.create_table(
+        "user_skill_current",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("movement_id", sa.Integer(), sa.ForeignKey("movements.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column(
+            "skill_id", sa.Integer(), sa.ForeignKey("user_skills.id", ondelete="CASCADE"), nullable=False, unique=True
+        ),
+        sa.Column("measured_at", sa.DateTime(timezone=False), nullable=False),
+    )
+    op.create_table(
+        "user_biometric_current",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column(
+            "biometric_id",
+            sa.Integer(),
+            sa.ForeignKey("user_biometrics.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("measured_at", sa.DateTime(timezone=False), nullable=False),
+    )
+
+    for history, (current, keys, pointer) in CURRENT_TABLES.items():
+        key_list = ", ".join(keys)
+        op.execute(
+            f"INSERT INTO {current} ({key_list}, {pointer}, measured_at) "
+            f"SELECT DISTINCT ON ({key_list}) {key_list}, id, measured_at FROM {history} "
+            f"ORDER BY {key_list}, measured_at DESC, id DESC"
+        )
+        op.execute(_sync_function(history, current, keys, pointer))
+        op.execute(
+            f"CREATE TRIGGER trg_{history}_current "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {history} "
+            f"FOR EACH ROW EXECUTE FUNCTION sync_{current}()"
+        )
+
+
+def downgrade():
+    for history, (current, _, _) in CURRENT_TABLES.items():
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{history}_current ON {history}")
+        op.execute(f"DROP FUNCTION IF EXISTS sync_{current}()")
+        op.drop_table(current)
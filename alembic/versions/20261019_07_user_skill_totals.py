@@ -0,0 +1,53 @@
+"""Numeric skill volume totals instead of JSON in user_skills.note.
+
+Revision ID: 20261019_07_user_skill_totals
+Revises: 20261019_06_user_current_state
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_07_user_skill_totals"
+down_revision = "20261019_06_user_current_state"
+branch_labels = None
+depends_on = None
+
+TOTAL_COLUMNS = ("total_reps", "total_kg", "total_meters", "total_cals", "total_seconds")
+AGGREGATE_NOTE = "wod_apply"
+
+
+def upgrade():
+    op.create_table(
+        "user_skill_totals",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("movement_id", sa.Integer(), sa.ForeignKey("movements.id", ondelete="CASCADE"), primary_key=True),
+        *(sa.Column(column, sa.Numeric(14, 2), nullable=False, server_default="0") for column in TOTAL_COLUMNS),
+        sa.Column("updated_at", sa.DateTime(timezone=False), nullable=False, server_default=sa.text("now()")),
+    )
+    # Los totales vivian en el JSON de la ultima fila agregada de cada movimiento
+    totals = ", ".join(f"COALESCE((note::jsonb ->> '{column}')::numeric, 0)" for column in TOTAL_COLUMNS)
+    op.execute(
+        f"""
+        INSERT INTO user_skill_totals (user_id, movement_id, {", ".join(TOTAL_COLUMNS)}, updated_at)
+        SELECT DISTINCT ON (user_id, movement_id) user_id, movement_id, {totals}, measured_at
+        FROM user_skills
+        WHERE note LIKE '{{%'
+        ORDER BY user_id, movement_id, measured_at DESC, id DESC
+        """
+    )
+    op.execute(f"UPDATE user_skills SET note = '{AGGREGATE_NOTE}' WHERE note LIKE '{{%'")
+
+
+def downgrade():
+    fields = ", ".join(f"'{column}', t.{column}" for column in TOTAL_COLUMNS)
+    op.execute(
+        f"""
+        UPDATE user_skills s
+        SET note = json_build_object({fields}, 'source', '{AGGREGATE_NOTE}')::text
+        FROM user_skill_totals t
+        WHERE s.note = '{AGGREGATE_NOTE}' AND t.user_id = s.user_id AND t.movement_id = s.movement_id
+        """
+    )
+    op.drop_table("user_skill_totals")
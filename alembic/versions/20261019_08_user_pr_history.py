@@ -0,0 +1,42 @@
+"""PR history table next to the unique best-PR table.
+
+Revision ID: 20261019_08_user_pr_history
+Revises: 20261019_07_user_skill_totals
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_08_user_pr_history"
+down_revision = "20261019_07_user_skill_totals"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_pr_history",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("movement_id", sa.Integer(), sa.ForeignKey("movements.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("pr_type", sa.String(length=30), nullable=False),
+        sa.Column("value", sa.Numeric(10, 2), nullable=False),
+        sa.Column("previous_value", sa.Numeric(10, 2), nullable=True),
+        sa.Column("unit", sa.String(length=20), nullable=True),
+        sa.Column("achieved_at", sa.DateTime(timezone=False), nullable=False, server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "ix_user_pr_history_key", "user_pr_history", ["user_id", "movement_id", "pr_type", "achieved_at"]
+    )
+    # user_pr ya es unica por (user_id, movement_id, pr_type): cada fila es el primer punto de su historico
+    op.execute(
+        "INSERT INTO user_pr_history (user_id, movement_id, pr_type, value, unit, achieved_at) "
+        "SELECT user_id, movement_id, pr_type, value, unit, achieved_at FROM user_pr"
+    )
+
+
+def downgrade():
+    op.drop_index("ix_user_pr_history_key", table_name="user_pr_history")
+    op.drop_table("user_pr_history")
@@ -0,0 +1,55 @@
+"""EWMA training-load state per user.
+
+Revision ID: 20261019_09_training_load_state
+Revises: 20261019_08_user_pr_history
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_09_training_load_state"
+down_revision = "20261019_08_user_pr_history"
+branch_labels = None
+depends_on = None
+
+# congelado a esta revision (domain.services.training_load): lambda = 2 / (N + 1), N = 7 y 28 dias
+ACUTE_LAMBDA = 2.0 / 8
+CHRONIC_LAMBDA = 2.0 / 29
+DEFAULT_RPE = 5.0
+
+
+def upgrade():
+    op.create_table(
+        "user_training_load_state",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("acute_load", sa.Numeric(12, 4), nullable=False, server_default="0"),
+        sa.Column("chronic_load", sa.Numeric(12, 4), nullable=False, server_default="0"),
+        sa.Column("as_of", sa.Date(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=False), nullable=False, server_default=sa.text("now()")),
+    )
+    # Se reconstruye reproduciendo las ejecuciones: user_training_load guardaba segundos, no sRPE.
+    # EWMA cerrada al ultimo dia con carga: sum(lambda * carga * (1 - lambda) ** dias_hasta_ese_dia)
+    op.execute(
+        f"""
+        INSERT INTO user_training_load_state (user_id, acute_load, chronic_load, as_of)
+        SELECT user_id,
+               SUM({ACUTE_LAMBDA} * load * POWER(1 - {ACUTE_LAMBDA}, last_day - day)),
+               SUM({CHRONIC_LAMBDA} * load * POWER(1 - {CHRONIC_LAMBDA}, last_day - day)),
+               last_day
+        FROM (
+            SELECT user_id,
+                   executed_at::date AS day,
+                   MAX(executed_at::date) OVER (PARTITION BY user_id) AS last_day,
+                   total_time_seconds / 60.0 * {DEFAULT_RPE} AS load
+            FROM workout_execution
+            WHERE total_time_seconds > 0
+        ) sessions
+        GROUP BY user_id, last_day
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("user_training_load_state")
@@ -0,0 +1,54 @@
+"""Daily/weekly/monthly training-load rollups per user and energy domain.
+
+Revision ID: 20261019_10_user_load_rollup
+Revises: 20261019_09_training_load_state
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_10_user_load_rollup"
+down_revision = "20261019_09_training_load_state"
+branch_labels = None
+depends_on = None
+
+GRANULARITIES = ("day", "week", "month")
+DEFAULT_RPE = 5
+
+
+def _number(path: str) -> str:
+    return f"CASE WHEN jsonb_typeof(e.raw_ocr_json #> '{path}') = 'number' THEN (e.raw_ocr_json #>> '{path}')::numeric END"
+
+
+def upgrade():
+    op.create_table(
+        "user_load_rollup",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("granularity", sa.String(length=5), primary_key=True),
+        sa.Column("bucket_start", sa.Date(), primary_key=True),
+        sa.Column("domain_code", sa.String(length=50), primary_key=True, server_default="none"),
+        sa.Column("load", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("sessions", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_seconds", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=False), nullable=False, server_default=sa.text("now()")),
+    )
+    # carga por ejecucion: session_load (sRPE) o sRPE con RPE por defecto. impact.acute_load no sirve:
+    # el codigo anterior guardaba ahi segundos
+    load = f"COALESCE({_number('{impact,session_load}')}, COALESCE(e.total_time_seconds, 0) / 60.0 * {DEFAULT_RPE})"
+    for granularity in GRANULARITIES:
+        op.execute(
+            "INSERT INTO user_load_rollup (user_id, granularity, bucket_start, domain_code, load, sessions, total_seconds) "
+            f"SELECT e.user_id, '{granularity}', date_trunc('{granularity}', e.executed_at)::date, "
+            "COALESCE(d.code, 'none'), "
+            f"SUM({load}), COUNT(*), SUM(COALESCE(e.total_time_seconds, 0)) "
+            "FROM workout_execution e "
+            "JOIN workouts w ON w.id = e.workout_id "
+            "LEFT JOIN energy_domains d ON d.id = w.domain_id "
+            "GROUP BY 1, 2, 3, 4"
+        )
+
+
+def downgrade():
+    op.drop_table("user_load_rollup")
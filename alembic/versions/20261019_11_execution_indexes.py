@@ -0,0 +1,29 @@
+"""Composite (user_id, executed_at) indexes on workout_execution.
+
+Revision ID: 20261019_11_execution_indexes
+Revises: 20261019_10_user_load_rollup
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_11_execution_indexes"
+down_revision = "20261019_10_user_load_rollup"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_workout_execution_user_executed", "workout_execution", ["user_id", "executed_at"])
+    op.create_index(
+        "ix_workout_execution_user_workout_executed", "workout_execution", ["user_id", "workout_id", "executed_at"]
+    )
+    # (user_id, executed_at) cubre las busquedas que solo filtran por usuario
+    op.drop_index("ix_workout_execution_user", table_name="workout_execution")
+
+
+def downgrade():
+    op.create_index("ix_workout_execution_user", "workout_execution", ["user_id"])
+    op.drop_index("ix_workout_execution_user_workout_executed", table_name="workout_execution")
+    op.drop_index("ix_workout_execution_user_executed", table_name="workout_execution")
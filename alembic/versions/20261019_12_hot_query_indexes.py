@@ -0,0 +1,54 @@
+"""Composite indexes matched to the hot query shapes; drop single-column indexes they make redundant.
+
+Revision ID: 20261019_12_hot_query_indexes
+Revises: 20261019_11_execution_indexes
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_12_hot_query_indexes"
+down_revision = "20261019_11_execution_indexes"
+branch_labels = None
+depends_on = None
+
+# (indice, tabla, columnas): ver scripts/explain_hot_queries.py para la consulta que sirve cada uno
+INDEXES = [
+    # recalculo del puntero actual (trigger) y ultima skill por movimiento
+    ("ix_user_skills_user_movement_measured", "user_skills", ["user_id", "movement_id", "measured_at"]),
+    # AthleteService._skills: ultimas N skills del usuario
+    ("ix_user_skills_user_measured", "user_skills", ["user_id", "measured_at"]),
+    # recalculo del puntero actual de biometria
+    ("ix_user_biometrics_user_measured", "user_biometrics", ["user_id", "measured_at"]),
+    # ultimo resultado por (usuario, workout) y racha semanal por usuario
+    ("ix_workout_result_user_workout_created", "workout_result", ["user_id", "workout_id", "created_at"]),
+    ("ix_workout_result_user_created", "workout_result", ["user_id", "created_at"]),
+    # apply-impact: ultimo analisis del usuario para el workout
+    ("ix_workout_analysis_user_workout_created", "workout_analysis", ["user_id", "workout_id", "created_at"]),
+]
+
+# indices de una columna cubiertos por el prefijo de otro indice o restriccion unica
+REDUNDANT = [
+    ("ix_user_skills_user", "user_skills", ["user_id"]),
+    ("ix_user_biometrics_user", "user_biometrics", ["user_id"]),
+    ("ix_workout_result_user", "workout_result", ["user_id"]),
+    ("ix_workout_analysis_user", "workout_analysis", ["user_id"]),
+    ("ix_user_pr_user", "user_pr", ["user_id"]),  # uq_user_pr_unique
+    ("ix_user_training_load_user", "user_training_load", ["user_id"]),  # uq_user_load_date
+    ("ix_user_missions_user", "user_missions", ["user_id"]),  # uq_user_mission
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, _ in REDUNDANT:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade():
+    for name, table, columns in REDUNDANT:
+        op.create_index(name, table, columns)
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
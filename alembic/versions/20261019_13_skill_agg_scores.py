@@ -0,0 +1,42 @@
+"""Aggregate skill rows keep the 0-100 score instead of the raw volume.
+
+Revision ID: 20261019_13_skill_agg_scores
+Revises: 20261019_12_hot_query_indexes
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_13_skill_agg_scores"
+down_revision = "20261019_12_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+AGGREGATE_NOTE = "wod_apply"
+
+
+def upgrade():
+    # El volumen ya esta en user_skill_totals: la fila agregada hereda la ultima puntuacion
+    # real del movimiento (o 0 si nunca la tuvo)
+    op.execute(
+        f"""
+        UPDATE user_skills s
+        SET skill_score = COALESCE((
+            SELECT LEAST(GREATEST(p.skill_score, 0), 100)
+            FROM user_skills p
+            WHERE p.user_id = s.user_id
+              AND p.movement_id = s.movement_id
+              AND p.note IS DISTINCT FROM '{AGGREGATE_NOTE}'
+              AND (p.measured_at, p.id) < (s.measured_at, s.id)
+            ORDER BY p.measured_at DESC, p.id DESC
+            LIMIT 1
+        ), 0)
+        WHERE s.note = '{AGGREGATE_NOTE}'
+        """
+    )
+
+
+def downgrade():
+    # Paso de datos: el volumen sigue en user_skill_totals, no se vuelve a copiar
+    pass
@@ -10,6 +10,8 @@ from .athlete import (
     BiometricsItem,
     TrainingLoadItem,
     PRItem,
+    RecommendationItem,
+    RecommendationsResponse,
 )
 from .workouts import (
     WorkoutCreate,
@@ -17,12 +19,29 @@ from .workouts import (
     WorkoutRead,
     WorkoutFilter,
     WorkoutAnalysisResponse,
+    AnalysisCacheStats,
     WorkoutStatsRead,
+    LeaderboardEntry,
+    LeaderboardPage,
+    WorkoutImportItem,
+    WorkoutImportReport,
+)
+from .workout_blocks import (
+    WorkoutBlockSchema,
+    WorkoutBlockMovementSchema,
+    WorkoutBlockInput,
+    WorkoutBlockMovementInput,
+    WorkoutStructure,
 )
-from .workout_blocks import WorkoutBlockSchema, WorkoutBlockMovementSchema, WorkoutStructure
 from .movements import MovementCreate, MovementUpdate, MovementRead, MovementMuscleSchema
 from .lookups import LookupTables, LookupItem
-from .user_metrics import UserTrainingLoadRead, UserCapacityProfileRead, UserCapacityProfileResponse
+from .user_metrics import (
+    UserTrainingLoadRead,
+    UserCapacityProfileRead,
+    UserCapacityProfileResponse,
+    TrainingLoadBucket,
+    TrainingLoadRollupResponse,
+)
 from .equipment import EquipmentCreate, EquipmentUpdate, EquipmentRead
 from .events import EventCreate, EventUpdate, EventRead, EventParticipants
 from .training_plans import TrainingPlanCreate, TrainingPlanUpdate, TrainingPlanRead, TrainingPlanDayRead
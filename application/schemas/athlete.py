@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -94,3 +94,18 @@ class AthleteProfileResponse(BaseModel):
     achievements: List[AchievementItem]
     missions: List[MissionItem]
     benchmarks: List[BenchmarkItem]
+
+
+class RecommendationItem(BaseModel):
+    workout_id: int
+    title: str
+    score: float
+    focus: List[str] = []
+    days_since_last: Optional[int] = None
+
+
+class RecommendationsResponse(BaseModel):
+    load_ratio: Optional[float] = None
+    target_load: float
+    capacity_gaps: Dict[str, float]
+    items: List[RecommendationItem]
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import Field
 
@@ -16,6 +16,23 @@ class UserTrainingLoadRead(ORMModel):
     notes: Optional[str] = None
 
 
+class TrainingLoadTotals(ORMModel):
+    load: float
+    sessions: int
+    total_seconds: float
+
+
+class TrainingLoadBucket(TrainingLoadTotals):
+    bucket_start: date
+    by_domain: Dict[str, TrainingLoadTotals] = Field(default_factory=dict)
+
+
+class TrainingLoadRollupResponse(ORMModel):
+    user_id: int
+    granularity: str
+    buckets: List[TrainingLoadBucket] = Field(default_factory=list)
+
+
 class UserCapacityProfileRead(ORMModel):
     id: int
     user_id: int
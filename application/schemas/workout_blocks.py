@@ -32,5 +32,27 @@ class WorkoutBlockSchema(ORMModel):
     movements: List[WorkoutBlockMovementSchema] = Field(default_factory=list)
 
 
+class WorkoutBlockMovementInput(ORMModel):
+    movement_id: int
+    position: Optional[int] = None
+    reps: Optional[float] = None
+    load: Optional[float] = None
+    load_unit: Optional[str] = None
+    distance_meters: Optional[float] = None
+    duration_seconds: Optional[int] = None
+    calories: Optional[float] = None
+
+
+class WorkoutBlockInput(ORMModel):
+    position: Optional[int] = None
+    block_type: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    duration_seconds: Optional[int] = None
+    rounds: Optional[int] = None
+    notes: Optional[str] = None
+    movements: List[WorkoutBlockMovementInput] = Field(default_factory=list)
+
+
 class WorkoutStructure(ORMModel):
     blocks: List[WorkoutBlockSchema] = Field(default_factory=list)
@@ -1,9 +1,10 @@
+from datetime import datetime
 from typing import List, Optional
 
 from pydantic import Field
 
 from domain.models.enums import PhysicalCapacity, MuscleGroup, HyroxStation, EnergyDomain
-from .workout_blocks import WorkoutBlockSchema
+from .workout_blocks import WorkoutBlockSchema, WorkoutBlockInput
 from .base import ORMModel
 
 
@@ -67,6 +68,23 @@ class WorkoutCreate(WorkoutBase):
     similar_workout_ids: List[int] = Field(default_factory=list)
 
 
+class WorkoutImportItem(WorkoutCreate):
+    blocks: List[WorkoutBlockInput] = Field(default_factory=list)
+
+
+class WorkoutImportError(ORMModel):
+    index: int
+    title: Optional[str] = None
+    error: str
+
+
+class WorkoutImportReport(ORMModel):
+    received: int
+    created: int
+    workout_ids: List[int] = Field(default_factory=list)
+    errors: List[WorkoutImportError] = Field(default_factory=list)
+
+
 class WorkoutUpdate(ORMModel):
     parent_workout_id: Optional[int] = None
     version: Optional[int] = None
@@ -137,6 +155,15 @@ class WorkoutAnalysisResponse(ORMModel):
     xp_components: Optional[dict] = None
 
 
+class AnalysisCacheStats(ORMModel):
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
+
+
 class WorkoutStatsRead(ORMModel):
     workout_id: int
     title: Optional[str] = None
@@ -145,3 +172,22 @@ class WorkoutStatsRead(ORMModel):
     avg_rating: Optional[float] = None
     avg_difficulty: Optional[float] = None
     rating_count: Optional[int] = None
+    result_count: Optional[int] = None
+    time_stddev_seconds: Optional[float] = None
+
+
+class LeaderboardEntry(ORMModel):
+    rank: int
+    user_id: int
+    user_name: Optional[str] = None
+    athlete_level: Optional[str] = None
+    time_seconds: int
+    achieved_at: datetime
+
+
+class LeaderboardPage(ORMModel):
+    workout_id: int
+    level: Optional[str] = None
+    entries: List[LeaderboardEntry]
+    next_cursor: Optional[str] = None
+    me: Optional[LeaderboardEntry] = None
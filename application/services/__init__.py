@@ -12,3 +12,8 @@ from .mission_service import MissionService
 from .achievement_service import AchievementService
 from .workout_xp_service import WorkoutXPService
 from .athlete_service import AthleteService
+from .performance_sketch_service import PerformanceSketchService
+from .analysis_cache import AnalysisCache, analysis_cache
+from .recommendation_service import RecommendationService
+from .athlete_stats_service import AthleteStatsService, OverviewCache, overview_cache
+from .training_load_service import TrainingLoadService
@@ -1,19 +1,19 @@
 from typing import List
 
-from sqlalchemy import func
-
 from infrastructure.db.models import (
     UserORM,
     UserCapacityProfileORM,
+    UserCapacityCurrentORM,
     UserSkillORM,
     UserBiometricORM,
+    UserBiometricCurrentORM,
     UserPROM,
-    UserTrainingLoadORM,
     GlobalCapacityBenchmarkORM,
 )
 from .career_service import CareerService
 from .achievement_service import AchievementService
 from .mission_service import MissionService
+from .training_load_service import TrainingLoadService
 
 
 class AthleteService:
@@ -22,40 +22,25 @@ class AthleteService:
         self.career_service = CareerService(session)
         self.achievement_service = AchievementService(session)
         self.mission_service = MissionService(session)
+        self.training_load_service = TrainingLoadService(session)
 
     def _latest_biometrics(self, user_id: int):
         return (
             self.session.query(UserBiometricORM)
-            .filter(UserBiometricORM.user_id == user_id)
-            .order_by(UserBiometricORM.measured_at.desc())
+            .join(UserBiometricCurrentORM, UserBiometricCurrentORM.biometric_id == UserBiometricORM.id)
+            .filter(UserBiometricCurrentORM.user_id == user_id)
             .first()
         )
 
     def _latest_training_load(self, user_id: int):
-        return (
-            self.session.query(UserTrainingLoadORM)
-            .filter(UserTrainingLoadORM.user_id == user_id)
-            .order_by(UserTrainingLoadORM.load_date.desc())
-            .all()
-        )
+        # ventana acotada de fotos diarias, no todo el historico
+        return self.training_load_service.daily(user_id)
 
     def _latest_capacity(self, user_id: int) -> List[UserCapacityProfileORM]:
-        sub = (
-            self.session.query(
-                UserCapacityProfileORM.capacity_id,
-                func.max(UserCapacityProfileORM.measured_at).label("max_date"),
-            )
-            .filter(UserCapacityProfileORM.user_id == user_id)
-            .group_by(UserCapacityProfileORM.capacity_id)
-            .subquery()
-        )
         return (
             self.session.query(UserCapacityProfileORM)
-            .join(
-                sub,
-                (UserCapacityProfileORM.capacity_id == sub.c.capacity_id)
-                & (UserCapacityProfileORM.measured_at == sub.c.max_date),
-            )
+            .join(UserCapacityCurrentORM, UserCapacityCurrentORM.capacity_profile_id == UserCapacityProfileORM.id)
+            .filter(UserCapacityCurrentORM.user_id == user_id)
             .all()
         )
 
@@ -90,6 +75,7 @@ class AthleteService:
         career = self.career_service.snapshot(user_id)
         biometrics = self._latest_biometrics(user_id)
         training_load = self._latest_training_load(user_id)
+        training_load_current = self.training_load_service.current(user_id)
         capacities = self._latest_capacity(user_id)
         skills = self._skills(user_id)
         prs = self._prs(user_id)
@@ -101,6 +87,7 @@ class AthleteService:
             "career": career,
             "biometrics": biometrics,
             "training_load": training_load,
+            "training_load_current": training_load_current,
             "capacities": capacities,
             "skills": skills,
             "prs": prs,
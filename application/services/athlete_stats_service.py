@@ -0,0 +1,283 @@
+"""Estadisticas del atleta para el dashboard: skills, PRs y totales de volumen.
+
+``overview`` resuelve top skills, top PRs y todos los totales en una sola sentencia
+(UNION ALL de tres ramas; el ranking y los totales de cada rama salen de funciones ventana)
+y se cachea por atleta. apply-impact y submit_result invalidan la entrada tras escribir; el
+TTL cubre las escrituras hechas desde otros procesos.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, String, case, cast, func, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from infrastructure.db.models import MovementORM, UserPROM, UserSkillORM, UserSkillTotalsORM
+from infrastructure.db.repositories.user_metrics_repository import PR_LOWER_IS_BETTER, SKILL_TOTAL_COLUMNS
+
+logger = logging.getLogger("athlete.stats")
+
+# note de las filas de skill que marcan volumen acumulado; el valor mostrado sale de user_skill_totals
+SKILL_AGGREGATE_NOTE = "wod_apply"
+PR_TIME_TYPES = {"time"}
+OVERVIEW_TOP_LIMIT = 5
+OVERVIEW_CACHE_SIZE = int(os.getenv("OVERVIEW_CACHE_SIZE", "1024"))
+OVERVIEW_CACHE_SECONDS = float(os.getenv("OVERVIEW_CACHE_SECONDS", "60"))
+
+
+# orden de preferencia de la metrica principal de una fila de volumen
+SKILL_PRIMARY_ORDER = ("total_kg", "total_reps", "total_meters", "total_cals", "total_seconds")
+
+
+def skill_primary_metric(totals: Dict[str, float]) -> Tuple[str, float]:
+    for key in SKILL_PRIMARY_ORDER:
+        val = float(totals.get(key) or 0)
+        if val > 0:
+            return key, val
+    return "total_seconds", float(totals.get("total_seconds") or 0)
+
+
+def skill_breakdown(totals: Optional[Dict[str, Any]], updated_at) -> Dict[str, Any]:
+    if totals is None:
+        return {}
+    breakdown: Dict[str, Any] = {column: float(totals[column]) for column in SKILL_TOTAL_COLUMNS}
+    breakdown["primary_metric"], breakdown["primary_value"] = skill_primary_metric(breakdown)
+    breakdown["updated_at"] = updated_at.isoformat() if updated_at else None
+    return breakdown
+
+
+def _skill_item(row) -> Dict[str, Any]:
+    totals = {column: row[column] for column in SKILL_TOTAL_COLUMNS} if row["totals_updated_at"] else None
+    # solo las filas de volumen acumulado llevan desglose (y muestran su metrica principal);
+    # el resto son puntuaciones 0-100
+    breakdown = skill_breakdown(totals, row["totals_updated_at"]) if row["label"] == SKILL_AGGREGATE_NOTE else {}
+    return {
+        "key": row["id"],
+        "name": row["name"] or "",
+        "category": row["category"],
+        "unit": breakdown.get("primary_metric") or "pts",
+        "value": breakdown["primary_value"] if breakdown else float(row["value"]),
+        "measured_at": row["at"],
+        "breakdown": breakdown,
+    }
+
+
+def _pr_item(row) -> Dict[str, Any]:
+    return {
+        "name": row["name"] or "",
+        "type": row["label"],
+        "unit": row["unit"] or ("s" if row["label"] in PR_TIME_TYPES else None),
+        "value": float(row["value"]),
+        "achieved_at": row["at"],
+    }
+
+
+class OverviewCache:
+    """Overview por atleta con TTL y expulsion LRU. Los valores se comparten: no mutarlos."""
+
+    def __init__(self, max_entries: int = OVERVIEW_CACHE_SIZE, ttl_seconds: float = OVERVIEW_CACHE_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[float, dict]]" = OrderedDict()
+
+    def get(self, athlete_id: int) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(athlete_id)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[athlete_id]
+                return None
+            self._entries.move_to_end(athlete_id)
+            return value
+
+    def put(self, athlete_id: int, value: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[athlete_id] = (time.monotonic(), value)
+            self._entries.move_to_end(athlete_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, athlete_id: int) -> None:
+        with self._lock:
+            self._entries.pop(athlete_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+overview_cache = OverviewCache()
+
+
+class AthleteStatsService:
+    def __init__(self, session: Session, cache: OverviewCache = overview_cache):
+        self.session = session
+        self.cache = cache
+
+    def overview(self, athlete_id: int) -> Dict[str, Any]:
+        cached = self.cache.get(athlete_id)
+        if cached is not None:
+            return cached
+        payload = self._overview(athlete_id, OVERVIEW_TOP_LIMIT)
+        self.cache.put(athlete_id, payload)
+        logger.info(
+            "[stats][overview] athlete=%s skills=%s prs=%s",
+            athlete_id,
+            len(payload["topSkills"]),
+            len(payload["topPrs"]),
+        )
+        return payload
+
+    def top_skills(self, athlete_id: int, limit: int) -> List[Dict[str, Any]]:
+        if 0 < limit <= OVERVIEW_TOP_LIMIT:
+            return self.overview(athlete_id)["topSkills"][:limit]
+        return self.skills(athlete_id, limit=limit)
+
+    def top_prs(self, athlete_id: int, limit: int) -> List[Dict[str, Any]]:
+        if 0 < limit <= OVERVIEW_TOP_LIMIT:
+            return self.overview(athlete_id)["topPrs"][:limit]
+        return self.prs(athlete_id, limit=limit)
+
+    def skills(self, athlete_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        query = self._skills_select(athlete_id).order_by(UserSkillORM.skill_score.desc(), UserSkillORM.id)
+        if limit:
+            query = query.limit(limit)
+        out = [_skill_item(row._mapping) for row in self.session.execute(query)]
+        logger.info("[skills][read] athlete=%s count=%s limit=%s", athlete_id, len(out), limit)
+        return out
+
+    def prs(self, athlete_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        query = self._prs_select(athlete_id).order_by(self._pr_order(), UserPROM.id)
+        if limit:
+            query = query.limit(limit)
+        out = [_pr_item(row._mapping) for row in self.session.execute(query)]
+        logger.info("[prs][read] athlete=%s count=%s limit=%s", athlete_id, len(out), limit)
+        return out
+
+    def _overview(self, athlete_id: int, top_limit: int) -> Dict[str, Any]:
+        skill_rank = func.row_number().over(order_by=(UserSkillORM.skill_score.desc(), UserSkillORM.id))
+        ranked_skills = self._skills_select(
+            athlete_id,
+            rank=skill_rank,
+            group_count=func.count().over(),
+            group_sum=func.sum(self._skill_value()).over(),
+        ).subquery()
+        ranked_prs = self._prs_select(
+            athlete_id,
+            rank=func.row_number().over(order_by=(self._pr_order(), UserPROM.id)),
+            group_count=func.count().over(),
+            group_sum=cast(null(), UserSkillORM.skill_score.type),
+        ).subquery()
+        totals_table = UserSkillTotalsORM.__table__
+        totals = select(
+            literal("totals").label("kind"),
+            *self._empty_columns(),
+            *(func.coalesce(func.sum(totals_table.c[column]), 0).label(column) for column in SKILL_TOTAL_COLUMNS),
+            cast(null(), totals_table.c.updated_at.type).label("totals_updated_at"),
+            literal(0).label("rank"),
+            literal(0).label("group_count"),
+            literal(0).label("group_sum"),
+        ).where(totals_table.c.user_id == athlete_id)
+        statement = union_all(
+            select(literal("skill").label("kind"), *ranked_skills.c).where(ranked_skills.c.rank <= top_limit),
+            select(literal("pr").label("kind"), *ranked_prs.c).where(ranked_prs.c.rank <= top_limit),
+            totals,
+        )
+
+        top_skills: List[Tuple[int, Dict[str, Any]]] = []
+        top_prs: List[Tuple[int, Dict[str, Any]]] = []
+        skills_total, prs_total = 0.0, 0
+        volume: Dict[str, float] = {}
+        for row in self.session.execute(statement):
+            row = row._mapping
+            if row["kind"] == "skill":
+                top_skills.append((row["rank"], _skill_item(row)))
+                skills_total = float(row["group_sum"] or 0)
+            elif row["kind"] == "pr":
+                top_prs.append((row["rank"], _pr_item(row)))
+                prs_total = int(row["group_count"])
+            else:
+                volume = {column: float(row[column]) for column in SKILL_TOTAL_COLUMNS}
+        return {
+            "topSkills": [item for _, item in sorted(top_skills, key=lambda pair: pair[0])],
+            "topPrs": [item for _, item in sorted(top_prs, key=lambda pair: pair[0])],
+            "totals": {"skills_total": skills_total, "prs_total": prs_total, **volume},
+        }
+
+    @staticmethod
+    def _pr_order():
+        # tiempos asc, resto desc
+        return case((UserPROM.pr_type.in_(PR_LOWER_IS_BETTER), UserPROM.value), else_=-UserPROM.value).asc()
+
+    @staticmethod
+    def _skill_value():
+        """Valor mostrado de una skill en SQL (ver _skill_item): skills_total suma lo que se ve."""
+        totals_table = UserSkillTotalsORM.__table__
+        primary = case(
+            *((totals_table.c[column] > 0, totals_table.c[column]) for column in SKILL_PRIMARY_ORDER[:-1]),
+            else_=totals_table.c.total_seconds,
+        )
+        is_volume = (UserSkillORM.note == SKILL_AGGREGATE_NOTE) & totals_table.c.updated_at.isnot(None)
+        return case((is_volume, primary), else_=UserSkillORM.skill_score)
+
+    @staticmethod
+    def _empty_columns():
+        return (
+            cast(null(), Integer).label("id"),
+            cast(null(), String).label("name"),
+            cast(null(), String).label("category"),
+            cast(null(), String).label("label"),
+            cast(null(), String).label("unit"),
+            cast(null(), UserPROM.value.type).label("value"),
+            cast(null(), UserSkillORM.measured_at.type).label("at"),
+        )
+
+    def _skills_select(self, athlete_id: int, **window):
+        totals_table = UserSkillTotalsORM.__table__
+        return (
+            select(
+                UserSkillORM.id.label("id"),
+                MovementORM.name.label("name"),
+                MovementORM.category.label("category"),
+                UserSkillORM.note.label("label"),
+                cast(null(), String).label("unit"),
+                UserSkillORM.skill_score.label("value"),
+                UserSkillORM.measured_at.label("at"),
+                *(totals_table.c[column] for column in SKILL_TOTAL_COLUMNS),
+                totals_table.c.updated_at.label("totals_updated_at"),
+                *(expression.label(name) for name, expression in window.items()),
+            )
+            .join(MovementORM, MovementORM.id == UserSkillORM.movement_id)
+            .outerjoin(
+                totals_table,
+                (totals_table.c.user_id == UserSkillORM.user_id) & (totals_table.c.movement_id == UserSkillORM.movement_id),
+            )
+            .where(UserSkillORM.user_id == athlete_id)
+        )
+
+    def _prs_select(self, athlete_id: int, **window):
+        return (
+            select(
+                UserPROM.id.label("id"),
+                MovementORM.name.label("name"),
+                cast(null(), String).label("category"),
+                UserPROM.pr_type.label("label"),
+                UserPROM.unit.label("unit"),
+                UserPROM.value.label("value"),
+                UserPROM.achieved_at.label("at"),
+                *(cast(null(), UserSkillTotalsORM.total_reps.type).label(column) for column in SKILL_TOTAL_COLUMNS),
+                cast(null(), UserSkillTotalsORM.updated_at.type).label("totals_updated_at"),
+                *(expression.label(name) for name, expression in window.items()),
+            )
+            .join(MovementORM, MovementORM.id == UserPROM.movement_id)
+            .where(UserPROM.user_id == athlete_id)
+        )
@@ -0,0 +1,33 @@
+"""Pipeline OCR de imagenes de WOD (OpenCV + Pillow + Tesseract).
+
+Este modulo arrastra dependencias pesadas (cv2, numpy, PIL, pytesseract), por eso
+no se re-exporta en ``application.services`` y la ruta lo importa solo en la
+primera peticion de OCR. No importarlo a nivel de modulo desde el API.
+"""
+
+from __future__ import annotations
+
+import io
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+
+OCR_LANG = "spa+eng"
+OCR_CONFIG = "--psm 6"
+
+
+def preprocess_image(data: bytes):
+    """Escala de grises, reescalado x2, mediana y umbral adaptativo."""
+    image = Image.open(io.BytesIO(data)).convert("RGB")
+    np_image = np.array(image)
+    gray = cv2.cvtColor(np_image, cv2.COLOR_RGB2GRAY)
+    resized = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+    denoised = cv2.medianBlur(resized, 3)
+    return cv2.adaptiveThreshold(denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 5)
+
+
+def extract_text(data: bytes) -> str:
+    thresh = preprocess_image(data)
+    return pytesseract.image_to_string(thresh, lang=OCR_LANG, config=OCR_CONFIG)
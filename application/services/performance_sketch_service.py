@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from domain.services.quantile_sketch import TDigest
+from infrastructure.db.models import GlobalPerformanceDataORM, WorkoutStatsByLevelORM
+
+SKETCH_SOURCE = "sketch"
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+class PerformanceSketchService:
+    """Percentiles de tiempo por (workout, nivel) y (movimiento, nivel) via t-digest.
+
+    Cada envio fusiona la muestra en el sketch persistido (fila creada con ON CONFLICT DO
+    NOTHING y bloqueada con FOR UPDATE) y refresca las columnas de percentiles, de modo
+    que leerlas no requiere recalculo.
+    No hace commit: se confirma con la transaccion del resultado.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def record_workout_time(self, workout_id: int, athlete_level_id: Optional[int], time_seconds: float) -> None:
+        if not athlete_level_id or not time_seconds or time_seconds <= 0:
+            return
+        self.session.execute(
+            pg_insert(WorkoutStatsByLevelORM)
+            .values(workout_id=workout_id, athlete_level_id=athlete_level_id)
+            .on_conflict_do_nothing(index_elements=["workout_id", "athlete_level_id"])
+        )
+        row = (
+            self.session.query(WorkoutStatsByLevelORM)
+            .filter(
+                WorkoutStatsByLevelORM.workout_id == workout_id,
+                WorkoutStatsByLevelORM.athlete_level_id == athlete_level_id,
+            )
+            .with_for_update()
+            .one()
+        )
+        digest = TDigest.from_json(row.time_digest)
+        digest.add(time_seconds)
+        row.time_digest = digest.to_json()
+        row.sample_size = int(digest.count)
+        row.avg_time_seconds = _round(digest.mean())
+        row.median_time_seconds = _round(digest.quantile(0.5))
+        row.percentile_10 = _round(digest.quantile(0.1))
+        row.percentile_90 = _round(digest.quantile(0.9))
+        self.session.flush()
+
+    def record_movement_times(self, athlete_level_id: Optional[int], candidates: Iterable[dict]) -> None:
+        """Registra tiempos por movimiento (candidatos de PR de tipo time) para el nivel del atleta."""
+        if not athlete_level_id:
+            return
+        for item in candidates:
+            if item.get("pr_type") != "time" or not item.get("value"):
+                continue
+            self._record_movement_time(item["movement_id"], athlete_level_id, float(item["value"]))
+        self.session.flush()
+
+    def _record_movement_time(self, movement_id: int, athlete_level_id: int, value: float) -> None:
+        self.session.execute(
+            pg_insert(GlobalPerformanceDataORM)
+            .values(movement_id=movement_id, athlete_level_id=athlete_level_id, source=SKETCH_SOURCE)
+            .on_conflict_do_nothing(
+                index_elements=["movement_id", "athlete_level_id"],
+                index_where=GlobalPerformanceDataORM.workout_id.is_(None),
+            )
+        )
+        row = (
+            self.session.query(GlobalPerformanceDataORM)
+            .filter(
+                GlobalPerformanceDataORM.movement_id == movement_id,
+                GlobalPerformanceDataORM.athlete_level_id == athlete_level_id,
+                GlobalPerformanceDataORM.workout_id.is_(None),
+            )
+            .with_for_update()
+            .one()
+        )
+        digest = TDigest.from_json(row.digest)
+        digest.add(value)
+        row.digest = digest.to_json()
+        row.sample_size = int(digest.count)
+        row.avg_time_seconds = _round(digest.mean())
+        row.percentile_25 = _round(digest.quantile(0.25))
+        row.percentile_50 = _round(digest.quantile(0.5))
+        row.percentile_75 = _round(digest.quantile(0.75))
+        row.percentile_90 = _round(digest.quantile(0.9))
+        row.updated_at = datetime.utcnow()
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+
+from application.schemas.athlete import RecommendationItem, RecommendationsResponse
+from infrastructure.db.lookup_registry import lookup_registry
+from infrastructure.db.models import (
+    GlobalCapacityBenchmarkORM,
+    PhysicalCapacityORM,
+    UserCapacityCurrentORM,
+    UserCapacityProfileORM,
+    UserORM,
+    WorkoutExecutionORM,
+)
+from infrastructure.db.repositories import WorkoutRepository
+from .training_load_service import TrainingLoadService
+
+RECOMMENDATION_LIMIT = 10
+RECENT_EXECUTION_DAYS = 28
+FOCUS_MIN_VALUE = 50
+FOCUS_MAX_ITEMS = 3
+
+
+class RecommendationService:
+    """Ranking de todo el catalogo activo contra deficits de capacidad, carga y ejecuciones recientes."""
+
+    def __init__(self, session):
+        self.session = session
+        self.workout_repo = WorkoutRepository(session)
+
+    def recommend(self, user_id: int, limit: int = RECOMMENDATION_LIMIT) -> RecommendationsResponse:
+        # Import diferido: numpy y el indice de features solo se cargan al recomendar
+        import numpy as np
+
+        from domain.services.recommendation_scoring import gap_weights, score_workouts, target_load, top_indices
+        from .workout_similarity import similarity_index
+
+        catalog = similarity_index.catalog(self.session)
+        user = self.session.get(UserORM, user_id)
+        gaps = np.array(self._capacity_gaps(user, catalog.capacity_codes), dtype=np.float32)
+        load_ratio = self._latest_load_ratio(user_id)
+        load_target = target_load(load_ratio)
+
+        days_since = np.full(len(catalog.workout_ids), np.inf)
+        for workout_id, days in self._days_since_last(user_id).items():
+            days_since[catalog.workout_ids == workout_id] = days
+
+        scores = score_workouts(catalog.capacities, catalog.session_load, gaps, load_target, days_since)
+        top = top_indices(scores, limit)
+        workouts = {w.id: w for w in self.workout_repo.get_many(catalog.workout_ids[top].tolist())}
+        weights = gap_weights(gaps)
+
+        items: List[RecommendationItem] = []
+        for row in top.tolist():
+            workout = workouts.get(int(catalog.workout_ids[row]))
+            if not workout:
+                continue
+            values = catalog.capacities[row]
+            # Foco: capacidades fuertes del workout ordenadas por cuanto cubren los deficits
+            order = np.argsort(-(values * weights), kind="stable")
+            focus = [catalog.capacity_codes[c] for c in order.tolist() if values[c] >= FOCUS_MIN_VALUE][:FOCUS_MAX_ITEMS]
+            days = days_since[row]
+            items.append(
+                RecommendationItem(
+                    workout_id=workout.id,
+                    title=workout.title,
+                    score=round(float(scores[row]), 4),
+                    focus=focus,
+                    days_since_last=int(days) if np.isfinite(days) else None,
+                )
+            )
+        return RecommendationsResponse(
+            load_ratio=load_ratio,
+            target_load=round(load_target, 3),
+            capacity_gaps={code: round(float(gap), 3) for code, gap in zip(catalog.capacity_codes, gaps.tolist())},
+            items=items,
+        )
+
+    def _capacity_gaps(self, user: Optional[UserORM], capacity_codes: List[str]) -> List[float]:
+        """Deficit 0-1 por capacidad: benchmark del nivel (o media propia si no hay) menos el ultimo valor."""
+        if not user:
+            return [0.0] * len(capacity_codes)
+        current = dict(
+            self.session.query(UserCapacityProfileORM.capacity_id, UserCapacityProfileORM.value)
+            .join(UserCapacityCurrentORM, UserCapacityCurrentORM.capacity_profile_id == UserCapacityProfileORM.id)
+            .filter(UserCapacityCurrentORM.user_id == user.id)
+            .all()
+        )
+        if not current:
+            return [0.0] * len(capacity_codes)
+        benchmarks: Dict[int, float] = {}
+        if user.athlete_level_id:
+            for capacity_id, p50, avg in self.session.query(
+                GlobalCapacityBenchmarkORM.capacity_id,
+                GlobalCapacityBenchmarkORM.percentile_50,
+                GlobalCapacityBenchmarkORM.avg_value,
+            ).filter(GlobalCapacityBenchmarkORM.athlete_level_id == user.athlete_level_id):
+                reference = p50 if p50 is not None else avg
+                if reference is not None:
+                    benchmarks[capacity_id] = float(reference)
+        own_mean = sum(current.values()) / len(current)
+        ids = lookup_registry.ids(self.session, PhysicalCapacityORM)
+        gaps = []
+        for code in capacity_codes:
+            capacity_id = ids.get(code)
+            value = current.get(capacity_id)
+            reference = benchmarks.get(capacity_id, own_mean)
+            gaps.append(max(0.0, reference - value) / 100.0 if value is not None else 0.0)
+        return gaps
+
+    def _latest_load_ratio(self, user_id: int) -> Optional[float]:
+        current = TrainingLoadService(self.session).current(user_id)
+        return current["load_ratio"] if current else None
+
+    def _days_since_last(self, user_id: int) -> Dict[int, float]:
+        now = datetime.utcnow()
+        rows = (
+            self.session.query(WorkoutExecutionORM.workout_id, func.max(WorkoutExecutionORM.executed_at))
+            .filter(
+                WorkoutExecutionORM.user_id == user_id,
+                WorkoutExecutionORM.executed_at >= now - timedelta(days=RECENT_EXECUTION_DAYS),
+            )
+            .group_by(WorkoutExecutionORM.workout_id)
+            .all()
+        )
+        return {workout_id: max(0.0, (now - last).total_seconds() / 86400.0) for workout_id, last in rows}
@@ -0,0 +1,127 @@
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from domain.services import training_load
+from domain.services.training_load import LoadState
+from infrastructure.db.models import UserTrainingLoadORM, UserTrainingLoadStateORM
+from infrastructure.db.repositories import UserLoadRollupRepository, UserTrainingLoadRepository
+
+logger = logging.getLogger("training_load")
+
+TRAINING_LOAD_WINDOW_DAYS = int(os.getenv("TRAINING_LOAD_WINDOW_DAYS", "28"))
+TRAINING_LOAD_MAX_DAYS = 365
+NO_DOMAIN = "none"
+# rango por defecto de los rollups y maximo de buckets por consulta
+ROLLUP_DEFAULT_BUCKETS = {"day": 28, "week": 12, "month": 12}
+ROLLUP_MAX_BUCKETS = 400
+
+
+def _state(row: Optional[UserTrainingLoadStateORM]) -> Optional[LoadState]:
+    if row is None:
+        return None
+    return LoadState(acute=float(row.acute_load or 0), chronic=float(row.chronic_load or 0), as_of=row.as_of)
+
+
+def _snapshot(state: LoadState) -> Dict[str, Any]:
+    return {
+        "as_of": state.as_of,
+        "acute_load": round(state.acute, 2),
+        "chronic_load": round(state.chronic, 2),
+        "load_ratio": state.ratio,
+    }
+
+
+class TrainingLoadService:
+    """Carga aguda/cronica EWMA (ver domain.services.training_load).
+
+    ``record_session`` es O(1): bloquea la fila de estado del usuario, aplica la sesion, deja
+    la foto del dia en user_training_load y suma la sesion a los rollups dia/semana/mes.
+    Las lecturas decaen el estado hasta hoy; los rangos se sirven de los rollups (O(buckets)).
+    No hace commit: se confirma con la transaccion de la ejecucion.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.repo = UserTrainingLoadRepository(session)
+        self.rollup_repo = UserLoadRollupRepository(session)
+
+    def record_session(
+        self,
+        user_id: int,
+        load: float,
+        on_date: Optional[date] = None,
+        notes: Optional[str] = None,
+        seconds: Optional[float] = None,
+        domain_code: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        on_date = on_date or date.today()
+        self.rollup_repo.add(
+            user_id,
+            {granularity: training_load.bucket_start(on_date, granularity) for granularity in training_load.GRANULARITIES},
+            domain_code or NO_DOMAIN,
+            float(load or 0),
+            float(seconds or 0),
+        )
+        row = self.repo.lock_state(user_id, on_date)
+        state = training_load.add_load(_state(row), float(load or 0), on_date)
+        row.acute_load = state.acute
+        row.chronic_load = state.chronic
+        row.as_of = state.as_of
+        row.updated_at = datetime.utcnow()
+        snapshot = _snapshot(state)
+        self.repo.upsert_day(
+            user_id, state.as_of, snapshot["acute_load"], snapshot["chronic_load"], snapshot["load_ratio"], notes
+        )
+        logger.info(
+            "[training_load][record] user=%s load=%.1f acute=%s chronic=%s ratio=%s",
+            user_id,
+            float(load or 0),
+            snapshot["acute_load"],
+            snapshot["chronic_load"],
+            snapshot["load_ratio"],
+        )
+        return snapshot
+
+    def current(self, user_id: int, as_of: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        state = _state(self.repo.get_state(user_id))
+        if state is None:
+            return None
+        return _snapshot(training_load.decay(state, as_of or date.today()))
+
+    def daily(self, user_id: int, days: int = TRAINING_LOAD_WINDOW_DAYS) -> List[UserTrainingLoadORM]:
+        days = max(1, min(days, TRAINING_LOAD_MAX_DAYS))
+        return self.repo.list_for_user(user_id, since=date.today() - timedelta(days=days - 1))
+
+    def rollups(
+        self, user_id: int, granularity: str, start: Optional[date] = None, end: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """Buckets de ``start`` a ``end`` (ambos incluidos, alineados al bucket) con el desglose por dominio."""
+        end = training_load.bucket_start(end or date.today(), granularity)
+        if start is None:
+            start = training_load.shift_bucket(end, granularity, 1 - ROLLUP_DEFAULT_BUCKETS[granularity])
+        start = training_load.bucket_start(start, granularity)
+        if training_load.shift_bucket(start, granularity, ROLLUP_MAX_BUCKETS) <= end:
+            raise ValueError(f"range exceeds {ROLLUP_MAX_BUCKETS} buckets")
+        buckets: Dict[date, Dict[str, Any]] = {}
+        for row in self.rollup_repo.list_range(user_id, granularity, start, end):
+            bucket = buckets.setdefault(
+                row.bucket_start,
+                {"bucket_start": row.bucket_start, "load": 0.0, "sessions": 0, "total_seconds": 0.0, "by_domain": {}},
+            )
+            bucket["load"] += float(row.load)
+            bucket["sessions"] += row.sessions
+            bucket["total_seconds"] += float(row.total_seconds)
+            # sin dominio solo cuenta en los totales del bucket
+            if row.domain_code == NO_DOMAIN:
+                continue
+            bucket["by_domain"][row.domain_code] = {
+                "load": float(row.load),
+                "sessions": row.sessions,
+                "total_seconds": float(row.total_seconds),
+            }
+        return list(buckets.values())
+
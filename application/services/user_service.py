@@ -7,10 +7,11 @@ from infrastructure.db.repositories import (
     UserRepository,
     EventRepository,
     WorkoutResultRepository,
-    UserTrainingLoadRepository,
     UserCapacityProfileRepository,
 )
+from infrastructure.db.lookup_registry import lookup_registry
 from infrastructure.auth.security import hash_password
+from .training_load_service import TRAINING_LOAD_WINDOW_DAYS, TrainingLoadService
 
 
 class UserService:
@@ -19,7 +20,7 @@ class UserService:
         self.repo = UserRepository(session)
         self.event_repo = EventRepository(session)
         self.result_repo = WorkoutResultRepository(session)
-        self.training_repo = UserTrainingLoadRepository(session)
+        self.training_load_service = TrainingLoadService(session)
         self.capacity_repo = UserCapacityProfileRepository(session)
 
     def list(self):
@@ -61,10 +62,10 @@ class UserService:
         results = self.result_repo.list_by_user(user_id)
         return {"user": user, "events": events, "results": results}
 
-    def training_load(self, user_id: int):
+    def training_load(self, user_id: int, days: int = TRAINING_LOAD_WINDOW_DAYS):
         if not self.repo.get(user_id):
             return None
-        return self.training_repo.list_for_user(user_id)
+        return self.training_load_service.daily(user_id, days=days)
 
     def capacity_profile(self, user_id: int):
         if not self.repo.get(user_id):
@@ -77,6 +78,5 @@ class UserService:
             payload["email"] = payload["email"].lower()
         if level:
             code = level if isinstance(level, str) else getattr(level, "value", level)
-            level_row = self.session.query(AthleteLevelORM).filter(AthleteLevelORM.code == code).first()
-            payload["athlete_level_id"] = level_row.id if level_row else None
+            payload["athlete_level_id"] = lookup_registry.id_for(self.session, AthleteLevelORM, code)
         return payload
@@ -1,15 +1,42 @@
 from typing import Optional
 
 from application.schemas.results import WorkoutResultCreate, WorkoutResultUpdate
-from infrastructure.db.repositories import WorkoutResultRepository, UserRepository, WorkoutRepository
-from infrastructure.db.models import WorkoutResultORM
+from application.schemas.workouts import LeaderboardEntry, LeaderboardPage
+from infrastructure.db.repositories import (
+    WorkoutResultRepository,
+    UserRepository,
+    WorkoutRepository,
+    WorkoutStatsRepository,
+    LeaderboardRepository,
+)
+from infrastructure.db.lookup_registry import lookup_registry
+from infrastructure.db.models import AthleteLevelORM, WorkoutResultORM
+from .performance_sketch_service import PerformanceSketchService
+
+LEADERBOARD_MAX_LIMIT = 100
+
+
+def _encode_cursor(time_seconds: int, user_id: int, position: int, rank: int) -> str:
+    return f"{time_seconds}:{user_id}:{position}:{rank}"
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        time_seconds, user_id, position, rank = (int(part) for part in cursor.split(":"))
+    except (AttributeError, ValueError):
+        raise ValueError("invalid cursor")
+    return time_seconds, user_id, position, rank
 
 
 class WorkoutResultService:
     def __init__(self, session):
+        self.session = session
         self.repo = WorkoutResultRepository(session)
         self.user_repo = UserRepository(session)
         self.workout_repo = WorkoutRepository(session)
+        self.stats_repo = WorkoutStatsRepository(session)
+        self.leaderboard_repo = LeaderboardRepository(session)
+        self.sketches = PerformanceSketchService(session)
 
     def list(self):
         return self.repo.list()
@@ -18,22 +45,105 @@ class WorkoutResultService:
         return self.repo.get(result_id)
 
     def create(self, data: WorkoutResultCreate):
-        if not self.user_repo.get(data.user_id) or not self.workout_repo.get(data.workout_id):
+        user = self.user_repo.get(data.user_id)
+        if not user or not self.workout_repo.get(data.workout_id):
             return None
-        return self.repo.create(**data.model_dump())
+        values = data.model_dump()
+        # Agregados, sketches y leaderboard se actualizan en la misma transaccion que el insert (commit en repo.create)
+        self.stats_repo.apply_result_change(data.workout_id, added=WorkoutResultORM(**values))
+        self.sketches.record_workout_time(data.workout_id, user.athlete_level_id, data.time_seconds)
+        self.leaderboard_repo.record(data.workout_id, data.user_id, user.athlete_level_id, data.time_seconds)
+        return self.repo.create(**values)
 
     def update(self, result_id: int, data: WorkoutResultUpdate):
         result = self.repo.get(result_id)
         if not result:
             return None
         payload = data.model_dump(exclude_none=True)
+        previous = WorkoutResultORM(time_seconds=result.time_seconds, rating=result.rating, difficulty=result.difficulty)
+        current = WorkoutResultORM(
+            time_seconds=payload.get("time_seconds", result.time_seconds),
+            rating=payload.get("rating", result.rating),
+            difficulty=payload.get("difficulty", result.difficulty),
+        )
+        self.stats_repo.apply_result_change(result.workout_id, added=current, removed=previous)
+        if "time_seconds" in payload:
+            result.time_seconds = payload["time_seconds"]
+            self.session.flush()
+            self.leaderboard_repo.refresh_user(result.workout_id, result.user_id, self._level_id(result.user_id))
         return self.repo.update(result, **payload)
 
     def delete(self, result_id: int):
         result = self.repo.get(result_id)
         if not result:
             return None
+        self.stats_repo.apply_result_change(result.workout_id, removed=result)
+        self.leaderboard_repo.refresh_user(
+            result.workout_id, result.user_id, self._level_id(result.user_id), exclude_result_id=result.id
+        )
         return self.repo.delete(result)
 
     def by_workout(self, workout_id: int):
         return self.repo.list_by_workout(workout_id)
+
+    def leaderboard(
+        self,
+        workout_id: int,
+        level: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        current_user_id: Optional[int] = None,
+    ) -> Optional[LeaderboardPage]:
+        """Top-N por mejor tiempo de cada atleta, paginado por cursor. ValueError si level/cursor no son validos."""
+        if not self.workout_repo.get(workout_id):
+            return None
+        level_id = None
+        if level:
+            level_id = lookup_registry.id_for(self.session, AthleteLevelORM, level)
+            if not level_id:
+                raise ValueError("unknown level")
+        limit = max(1, min(limit, LEADERBOARD_MAX_LIMIT))
+
+        after, position, rank, last_time = None, 0, 0, None
+        if cursor:
+            last_time, last_user, position, rank = _decode_cursor(cursor)
+            after = (last_time, last_user)
+        rows = self.leaderboard_repo.page(workout_id, level_id, limit + 1, after)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        entries = []
+        for row in rows:
+            position += 1
+            # Rango de competicion: empates comparten puesto
+            if row.time_seconds != last_time:
+                rank = position
+            last_time = row.time_seconds
+            entries.append(self._entry(row, rank))
+
+        me = None
+        if current_user_id is not None:
+            mine = self.leaderboard_repo.get_entry(workout_id, current_user_id)
+            if mine and (level_id is None or mine.athlete_level_id == level_id):
+                my_rank = self.leaderboard_repo.count_faster(workout_id, level_id, mine.time_seconds) + 1
+                me = self._entry(mine, my_rank)
+
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = _encode_cursor(rows[-1].time_seconds, rows[-1].user_id, position, rank)
+        return LeaderboardPage(workout_id=workout_id, level=level, entries=entries, next_cursor=next_cursor, me=me)
+
+    def _level_id(self, user_id: int) -> Optional[int]:
+        user = self.user_repo.get(user_id)
+        return user.athlete_level_id if user else None
+
+    @staticmethod
+    def _entry(row, rank: int) -> LeaderboardEntry:
+        return LeaderboardEntry(
+            rank=rank,
+            user_id=row.user_id,
+            user_name=row.user.name if row.user else None,
+            athlete_level=row.athlete_level.code if row.athlete_level else None,
+            time_seconds=row.time_seconds,
+            achieved_at=row.achieved_at,
+        )
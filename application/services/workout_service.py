@@ -1,70 +1,92 @@
+import logging
 from decimal import Decimal
-from typing import Optional
-
-from application.schemas.workouts import WorkoutCreate, WorkoutUpdate, WorkoutFilter
-from domain.models.entities import (
-    Workout,
-    WorkoutLevelTime,
-    WorkoutCapacity,
-    WorkoutHyroxStation,
-    WorkoutMuscle,
-    WorkoutEquipment,
-    WorkoutBlock,
-    WorkoutBlockMovement,
-    Movement,
-    MovementMuscle,
+from typing import List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from application.schemas.workouts import (
+    WorkoutCreate,
+    WorkoutUpdate,
+    WorkoutFilter,
+    WorkoutImportItem,
+    WorkoutImportError,
+    WorkoutImportReport,
 )
-from domain.models.enums import EnergyDomain, IntensityLevel, MuscleGroup, PhysicalCapacity, HyroxStation
+from domain.models.analysis import WorkoutAnalysisInput, AnalysisLevelTime, AnalysisCapacity, AnalysisHyroxStation
+from domain.models.enums import EnergyDomain, IntensityLevel, PhysicalCapacity
 from domain.services.workout_analysis import analyze_workout
 from infrastructure.db.models import WorkoutORM, MovementORM
 from infrastructure.db.repositories import WorkoutRepository
+from .analysis_cache import analysis_cache, payload_key
+
+
+logger = logging.getLogger("workouts.import")
+IMPORT_BATCH_SIZE = 200
+SIMILAR_LIMIT = 6
+BLOCK_METRIC_FIELDS = ("reps", "load", "distance_meters", "duration_seconds", "calories")
 
 
 def _to_float(value):
     return float(value) if isinstance(value, Decimal) else value
 
 
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'item'}: {err['msg']}" for err in exc.errors())
+
+
 class WorkoutService:
     def __init__(self, session):
         self.repo = WorkoutRepository(session)
         self._calorie_codes = {"row", "skierg", "bike_erg", "assault_bike", "echo_bike"}
 
-    def _movement_allows_calories(self, movement_id: int | None) -> bool:
-        if movement_id is None:
-            return False
-        mv = (
+    def _calorie_movement_ids(self, movement_ids) -> set:
+        """Ids (de los pedidos) que admiten calorias, resueltos con una sola consulta IN."""
+        ids = {mid for mid in movement_ids if mid is not None}
+        if not ids:
+            return set()
+        rows = (
             self.repo.session.query(MovementORM.id, MovementORM.code, MovementORM.supports_calories)
-            .filter(MovementORM.id == movement_id)
-            .first()
+            .filter(MovementORM.id.in_(ids))
+            .all()
         )
-        if not mv:
-            return False
-        if mv.supports_calories:
-            return True
-        return (mv.code or "").lower() in self._calorie_codes
+        return {mv.id for mv in rows if mv.supports_calories or (mv.code or "").lower() in self._calorie_codes}
+
+    @staticmethod
+    def _payload_movements(payload: dict) -> list:
+        movements = []
+        # builder_blocks stored inside extra_attributes_json from front
+        for block in (payload.get("extra_attributes_json") or {}).get("builder_blocks", []) or []:
+            movements.extend(block.get("movements", []) or [])
+        # payload.blocks (if ever sent)
+        for block in payload.get("blocks", []) or []:
+            movements.extend(block.get("movements", []) or [])
+        return movements
+
+    @staticmethod
+    def _movement_ref(mv_dict: dict):
+        return mv_dict.get("movement_id") or (mv_dict.get("movement") or {}).get("id")
 
     def _strip_calories_from_payload(self, payload: dict):
         """
         Ensure calories only survive for ERG movements (row/ski/bike). Mutates payload in place.
         """
-        def sanitize_mv(mv_dict: dict):
-            mid = mv_dict.get("movement_id") or mv_dict.get("movement", {}).get("id")
-            if not self._movement_allows_calories(mid):
-                mv_dict["calories"] = None
-                # mirror nested movement if present
-                if "movement" in mv_dict and isinstance(mv_dict["movement"], dict):
-                    mv_dict["movement"]["calories"] = None
+        self._strip_calories_from_payloads([payload])
 
-        # builder_blocks stored inside extra_attributes_json from front
-        blocks = payload.get("extra_attributes_json", {}).get("builder_blocks", [])
-        for block in blocks or []:
-            for mv in block.get("movements", []) or []:
-                sanitize_mv(mv)
-
-        # payload.blocks (if ever sent)
-        for block in payload.get("blocks", []) or []:
-            for mv in block.get("movements", []) or []:
-                sanitize_mv(mv)
+    def _strip_calories_from_payloads(self, payloads: list, allowed: Optional[set] = None):
+        """Same rule for many payloads: all movement ids resolved in one query, applied in memory."""
+        movements = [mv for payload in payloads for mv in self._payload_movements(payload)]
+        if not movements:
+            return
+        if allowed is None:
+            allowed = self._calorie_movement_ids(self._movement_ref(mv) for mv in movements)
+        for mv_dict in movements:
+            if self._movement_ref(mv_dict) in allowed:
+                continue
+            mv_dict["calories"] = None
+            # mirror nested movement if present
+            if "movement" in mv_dict and isinstance(mv_dict["movement"], dict):
+                mv_dict["movement"]["calories"] = None
 
     def list(self, filters: WorkoutFilter):
         return self.repo.list_filtered(filters.level, filters.domain, filters.muscle)
@@ -75,7 +97,83 @@ class WorkoutService:
     def create(self, data: WorkoutCreate):
         payload = data.model_dump()
         self._strip_calories_from_payload(payload)
-        return self.repo.create_with_relations(payload)
+        workout = self.repo.create_with_relations(payload)
+        self._refresh_similarity([workout.id])
+        return workout
+
+    def import_workouts(self, items: List[dict], batch_size: int = IMPORT_BATCH_SIZE) -> WorkoutImportReport:
+        """
+        Importa workouts en lotes: valida cada item, inserta el lote con sentencias multi-fila
+        y hace un commit por lote. Los items invalidos se reportan sin abortar el resto.
+        """
+        report = WorkoutImportReport(received=len(items), created=0)
+        batch_size = max(1, batch_size)
+        for start in range(0, len(items), batch_size):
+            batch = list(enumerate(items[start : start + batch_size], start=start))
+            valid = self._validate_import_batch(batch, report)
+            if not valid:
+                continue
+            try:
+                ids = self.repo.bulk_insert_with_relations([payload for _, payload in valid])
+                self.repo.session.commit()
+            except SQLAlchemyError as exc:
+                self.repo.session.rollback()
+                message = str(getattr(exc, "orig", None) or exc).splitlines()[0]
+                logger.warning("[import] batch_start=%s size=%s failed: %s", start, len(valid), message)
+                report.errors.extend(
+                    WorkoutImportError(index=idx, title=payload.get("title"), error=f"batch failed: {message}")
+                    for idx, payload in valid
+                )
+                continue
+            report.created += len(ids)
+            report.workout_ids.extend(ids)
+            self._refresh_similarity(ids)
+            logger.info("[import] batch_start=%s created=%s", start, len(ids))
+        return report
+
+    def _validate_import_batch(self, batch: list, report: WorkoutImportReport) -> list:
+        parsed = []
+        for idx, raw in batch:
+            try:
+                item = WorkoutImportItem.model_validate(raw)
+            except ValidationError as exc:
+                title = raw.get("title") if isinstance(raw, dict) else None
+                report.errors.append(WorkoutImportError(index=idx, title=title, error=_validation_message(exc)))
+                continue
+            parsed.append((idx, item.model_dump()))
+
+        # Referencias externas resueltas con una consulta IN por tabla para todo el lote
+        movement_ids = {mv["movement_id"] for _, p in parsed for block in p["blocks"] for mv in block["movements"]}
+        workout_refs = {ref for _, p in parsed for ref in p["similar_workout_ids"] + [p["parent_workout_id"]]}
+        known_movements = self.repo.existing_ids(MovementORM, movement_ids)
+        known_workouts = self.repo.existing_ids(WorkoutORM, workout_refs)
+        calorie_movements = self._calorie_movement_ids(movement_ids)
+
+        valid = []
+        for idx, payload in parsed:
+            errors = []
+            for b_pos, block in enumerate(payload["blocks"]):
+                for m_pos, mv in enumerate(block["movements"]):
+                    where = f"blocks.{b_pos}.movements.{m_pos}"
+                    if mv["movement_id"] not in known_movements:
+                        errors.append(f"{where}: unknown movement_id {mv['movement_id']}")
+                    metrics = [field for field in BLOCK_METRIC_FIELDS if mv.get(field) is not None]
+                    if not metrics:
+                        errors.append(f"{where}: at least one metric is required")
+                    elif metrics == ["calories"] and mv["movement_id"] not in calorie_movements:
+                        # las calorias se descartan fuera de los ergos: quedaria sin metrica
+                        errors.append(f"{where}: calories are only allowed for erg movements")
+            missing = [ref for ref in payload["similar_workout_ids"] if ref not in known_workouts]
+            if missing:
+                errors.append(f"similar_workout_ids: unknown workouts {missing}")
+            if payload["parent_workout_id"] is not None and payload["parent_workout_id"] not in known_workouts:
+                errors.append(f"parent_workout_id: unknown workout {payload['parent_workout_id']}")
+            if errors:
+                report.errors.append(WorkoutImportError(index=idx, title=payload.get("title"), error="; ".join(errors)))
+                continue
+            valid.append((idx, payload))
+        self._strip_calories_from_payloads([payload for _, payload in valid], calorie_movements)
+        return valid
 
     def update(self, workout_id: int, data: WorkoutUpdate):
         workout = self.repo.get(workout_id)
@@ -83,31 +181,70 @@ class WorkoutService:
             return None
         payload = data.model_dump(exclude_none=True)
         self._strip_calories_from_payload(payload)
-        return self.repo.update_with_relations(workout, payload)
+        workout = self.repo.update_with_relations(workout, payload)
+        self._refresh_similarity([workout_id])
+        return workout
 
     def delete(self, workout_id: int):
         workout = self.repo.get(workout_id)
         if not workout:
             return None
-        return self.repo.delete(workout)
+        deleted = self.repo.delete(workout)
+        self._refresh_similarity([workout_id])
+        return deleted
+
+    def similar(self, workout_id: int, limit: int = SIMILAR_LIMIT):
+        """Enlaces curados primero; el resto hasta ``limit`` sale del indice de similitud."""
+        from .workout_similarity import similarity_index
+
+        curated = self.repo.get_similar_workouts(workout_id)[:limit]
+        exclude = {w.id for w in curated}
+        neighbours = similarity_index.nearest(self.repo.session, workout_id, limit + len(exclude))
+        ids = [wid for wid, _ in neighbours if wid not in exclude][: limit - len(curated)]
+        return curated + self.repo.get_many(ids)
 
-    def similar(self, workout_id: int):
-        return self.repo.get_similar_workouts(workout_id)
+    def _refresh_similarity(self, workout_ids: List[int]) -> None:
+        # Import diferido (numpy); si el indice aun no se ha construido no hay nada que actualizar
+        from .workout_similarity import similarity_index
+
+        similarity_index.refresh(self.repo.session, workout_ids)
 
     def analysis(self, workout_id: int):
         workout = self.repo.get(workout_id)
         if not workout:
             return None
-        domain_model = self._to_domain(workout)
-        return analyze_workout(domain_model)
+        return analyze_workout(self._to_analysis_input(workout))
+
+    def analyze_many(self, workouts: List[WorkoutORM]) -> List[Optional[dict]]:
+        """Analisis vectorizado de un listado; None en los workouts que no se pueden mapear."""
+        # Import diferido: numpy no se carga al arrancar la API
+        from domain.services.workout_analysis_batch import analyze_workouts_batch
+
+        analyses: List[Optional[dict]] = [None] * len(workouts)
+        positions, inputs = [], []
+        for idx, workout in enumerate(workouts):
+            try:
+                inputs.append(self._to_analysis_input(workout))
+            except ValueError:
+                continue
+            positions.append(idx)
+        for idx, analysis in zip(positions, analyze_workouts_batch(inputs)):
+            analyses[idx] = analysis
+        return analyses
 
     def analyze_payload(self, payload: dict):
+        # Payloads repetidos (ediciones/undo en el builder) no repiten validacion ni consultas
+        key = payload_key(payload)
+        cached = analysis_cache.get(key)
+        if cached is not None:
+            return cached
         workout_input = WorkoutCreate.model_validate(payload)
         payload = workout_input.model_dump()
         self._strip_calories_from_payload(payload)
         workout_input = WorkoutCreate.model_validate(payload)
-        domain_model = self._to_domain_from_payload(workout_input)
-        return analyze_workout(domain_model)
+        analysis = analyze_workout(self._analysis_input_from_payload(workout_input))
+        analysis_cache.put(key, analysis)
+        return analysis
 
     def structure(self, workout_id: int):
         return self.repo.get_with_structure(workout_id)
@@ -118,49 +255,24 @@ class WorkoutService:
     def stats(self):
         return self.repo.list_stats()
 
-    def _to_domain(self, workout: WorkoutORM) -> Workout:
+    def _to_analysis_input(self, workout: WorkoutORM) -> WorkoutAnalysisInput:
+        """Mapeo directo ORM -> entrada de analisis: no toca bloques, movimientos ni musculos."""
         metadata = workout.metadata_rel
         stats = workout.stats
         domain_code = workout.domain.code if workout.domain else None
         intensity_code = workout.intensity_level.code if workout.intensity_level else None
         hyrox_code = workout.hyrox_transfer_level.code if workout.hyrox_transfer_level else None
-        main_muscle_code = workout.main_muscle_group.code if workout.main_muscle_group else None
-        return Workout(
+        return WorkoutAnalysisInput(
             id=workout.id,
-            parent_workout_id=workout.parent_workout_id,
-            version=workout.version,
-            is_active=workout.is_active,
-            title=workout.title,
-            description=workout.description,
             domain=EnergyDomain(domain_code) if domain_code else None,
             intensity=IntensityLevel(intensity_code) if intensity_code else None,
             hyrox_transfer=IntensityLevel(hyrox_code) if hyrox_code else None,
-            wod_type=workout.wod_type,
-            volume_total=metadata.volume_total if metadata else None,
-            work_rest_ratio=metadata.work_rest_ratio if metadata else None,
-            dominant_stimulus=metadata.dominant_stimulus if metadata else None,
-            load_type=metadata.load_type if metadata else None,
             estimated_difficulty=_to_float(stats.estimated_difficulty) if stats else None,
-            main_muscle_chain=MuscleGroup(main_muscle_code) if main_muscle_code else None,
-            extra_attributes_json=metadata.extra_attributes_json if metadata else None,
-            athlete_profile_desc=metadata.athlete_profile_desc if metadata else None,
-            target_athlete_desc=metadata.target_athlete_desc if metadata else None,
+            avg_time_seconds=stats.avg_time_seconds if stats else None,
             session_load=metadata.session_load if metadata else None,
             session_feel=metadata.session_feel if metadata else None,
-            official_tag=workout.official_tag,
-            pacing_tip=metadata.pacing_tip if metadata else None,
-            pacing_detail=metadata.pacing_detail if metadata else None,
-            break_tip=metadata.break_tip if metadata else None,
-            rx_variant=metadata.rx_variant if metadata else None,
-            scaled_variant=metadata.scaled_variant if metadata else None,
-            ai_observation=metadata.ai_observation if metadata else None,
-            avg_time_seconds=stats.avg_time_seconds if stats else None,
-            avg_rating=_to_float(stats.avg_rating) if stats and stats.avg_rating is not None else None,
-            avg_difficulty=_to_float(stats.avg_difficulty) if stats and stats.avg_difficulty is not None else None,
-            rating_count=stats.rating_count if stats else None,
             level_times=[
-                WorkoutLevelTime(
-                    workout_id=lt.workout_id,
+                AnalysisLevelTime(
                     athlete_level=lt.athlete_level.code if lt.athlete_level else None,
                     time_minutes=_to_float(lt.time_minutes),
                     time_range=lt.time_range,
@@ -168,123 +280,31 @@ class WorkoutService:
                 for lt in workout.level_times
             ],
             capacities=[
-                WorkoutCapacity(
-                    workout_id=cap.workout_id,
+                AnalysisCapacity(
                     capacity=PhysicalCapacity(cap.capacity.code) if cap.capacity else None,
                     value=cap.value,
                     note=cap.note,
                 )
                 for cap in workout.capacities
             ],
-            hyrox_stations=[
-                WorkoutHyroxStation(
-                    workout_id=hs.workout_id,
-                    station=HyroxStation(hs.station.code) if hs.station else None,
-                    transfer_pct=hs.transfer_pct,
-                )
-                for hs in workout.hyrox_stations
-            ],
-            muscles=[
-                WorkoutMuscle(workout_id=m.workout_id, muscle=MuscleGroup(m.muscle_group.code) if m.muscle_group else None)
-                for m in workout.muscles
-            ],
-            equipment=[WorkoutEquipment(workout_id=eq.workout_id, equipment_id=eq.equipment_id) for eq in workout.equipment_links],
-            blocks=[
-                WorkoutBlock(
-                    id=block.id,
-                    workout_id=block.workout_id,
-                    position=block.position,
-                    block_type=block.block_type,
-                    title=block.title,
-                    description=block.description,
-                    duration_seconds=block.duration_seconds,
-                    rounds=block.rounds,
-                    notes=block.notes,
-                    movements=[
-                        WorkoutBlockMovement(
-                            id=mv.id,
-                            movement_id=mv.movement_id,
-                            position=mv.position,
-                            reps=_to_float(mv.reps),
-                            load=_to_float(mv.load),
-                            load_unit=mv.load_unit,
-                            distance_meters=_to_float(mv.distance_meters),
-                            duration_seconds=mv.duration_seconds,
-                            calories=_to_float(mv.calories),
-                            movement=Movement(
-                                id=mv.movement.id if mv.movement else None,
-                                name=mv.movement.name if mv.movement else "",
-                                category=mv.movement.category if mv.movement else None,
-                                description=mv.movement.description if mv.movement else None,
-                                default_load_unit=mv.movement.default_load_unit if mv.movement else None,
-                                video_url=mv.movement.video_url if mv.movement else None,
-                                muscles=[
-                                    MovementMuscle(
-                                        movement_id=muscle.movement_id,
-                                        muscle_group=MuscleGroup(muscle.muscle_group.code),
-                                        is_primary=muscle.is_primary,
-                                    )
-                                    for muscle in (mv.movement.muscles if mv.movement else [])
-                                    if muscle.muscle_group
-                                ],
-                            ),
-                        )
-                        for mv in block.movements
-                    ],
-                )
-                for block in workout.blocks
-            ],
+            hyrox_stations=[AnalysisHyroxStation(transfer_pct=hs.transfer_pct) for hs in workout.hyrox_stations],
         )
 
-    def _to_domain_from_payload(self, data: WorkoutCreate) -> Workout:
-        return Workout(
-            parent_workout_id=data.parent_workout_id,
-            version=data.version,
-            is_active=data.is_active,
-            title=data.title,
-            description=data.description,
+    def _analysis_input_from_payload(self, data: WorkoutCreate) -> WorkoutAnalysisInput:
+        return WorkoutAnalysisInput(
+            id=None,
             domain=data.domain,
             intensity=data.intensity,
             hyrox_transfer=data.hyrox_transfer,
-            wod_type=data.wod_type,
-            volume_total=data.volume_total,
-            work_rest_ratio=data.work_rest_ratio,
-            dominant_stimulus=data.dominant_stimulus,
-            load_type=data.load_type,
             estimated_difficulty=data.estimated_difficulty,
-            main_muscle_chain=data.main_muscle_chain,
-            extra_attributes_json=data.extra_attributes_json,
-            athlete_profile_desc=data.athlete_profile_desc,
-            target_athlete_desc=data.target_athlete_desc,
+            avg_time_seconds=data.avg_time_seconds,
             session_load=data.session_load,
             session_feel=data.session_feel,
-            official_tag=data.official_tag,
-            pacing_tip=data.pacing_tip,
-            pacing_detail=data.pacing_detail,
-            break_tip=data.break_tip,
-            rx_variant=data.rx_variant,
-            scaled_variant=data.scaled_variant,
-            ai_observation=data.ai_observation,
-            avg_time_seconds=data.avg_time_seconds,
-            avg_rating=data.avg_rating,
-            avg_difficulty=data.avg_difficulty,
-            rating_count=data.rating_count,
             level_times=[
-                WorkoutLevelTime(
-                    workout_id=0,
-                    athlete_level=lt.athlete_level,
-                    time_minutes=lt.time_minutes,
-                    time_range=lt.time_range,
-                )
+                AnalysisLevelTime(athlete_level=lt.athlete_level, time_minutes=lt.time_minutes, time_range=lt.time_range)
                 for lt in data.level_times
             ],
-            capacities=[
-                WorkoutCapacity(workout_id=0, capacity=cap.capacity, value=cap.value, note=cap.note)
-                for cap in data.capacities
-            ],
-            hyrox_stations=[
-                WorkoutHyroxStation(workout_id=0, station=hs.station, transfer_pct=hs.transfer_pct) for hs in data.hyrox_stations
-            ],
-            muscles=[WorkoutMuscle(workout_id=0, muscle=m) for m in data.muscles],
-            equipment=[WorkoutEquipment(workout_id=0, equipment_id=eq) for eq in data.equipment_ids],
+            capacities=[AnalysisCapacity(capacity=cap.capacity, value=cap.value, note=cap.note) for cap in data.capacities],
+            hyrox_stations=[AnalysisHyroxStation(transfer_pct=hs.transfer_pct) for hs in data.hyrox_stations],
         )
+
@@ -0,0 +1,356 @@
+"""Indice de similitud de workouts (vecinos mas cercanos por coseno, NumPy).
+
+Cada workout activo se representa con bloques de features: capacidades (0-100), grupos
+musculares, dominio, intensidad, movimientos (hashing en ``MOVEMENT_BUCKETS`` cubetas) y
+tramo de duracion. Cada bloque se normaliza y pondera, y la fila final va normalizada L2:
+el coseno contra todo el catalogo es un unico producto matriz-vector.
+
+El indice se construye en la primera consulta (una query por tabla), se actualiza fila a
+fila al crear/editar/borrar workouts en este proceso y se reconstruye cada
+``INDEX_MAX_AGE_SECONDS`` para recoger escrituras de otros procesos.
+
+Ademas guarda las features crudas (capacidades 0-100 y carga de sesion) que usa el
+recomendador para puntuar todo el catalogo en bloque.
+
+Importa numpy: cargar solo de forma diferida (ver tests/test_import_time.py).
+"""
+
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from domain.models.enums import IntensityLevel
+from domain.services.workout_analysis import duration_factor, intensity_factor
+from infrastructure.db.lookup_registry import lookup_registry
+from infrastructure.db.models import (
+    EnergyDomainORM,
+    IntensityLevelORM,
+    MuscleGroupORM,
+    PhysicalCapacityORM,
+    WorkoutBlockMovementORM,
+    WorkoutBlockORM,
+    WorkoutCapacityORM,
+    WorkoutLevelTimeORM,
+    WorkoutMuscleORM,
+    WorkoutORM,
+    WorkoutStatsORM,
+)
+
+logger = logging.getLogger("workouts.similarity")
+
+MOVEMENT_BUCKETS = 64
+INDEX_MAX_AGE_SECONDS = 300.0
+DEFAULT_DURATION_MINUTES = 15.0
+# Mismos tramos que workout_analysis.duration_factor
+DURATION_EDGES = (5.0, 15.0, 30.0)
+# Peso de cada bloque en el coseno (cada bloque se normaliza antes de ponderar)
+GROUP_WEIGHTS = (
+    ("capacity", 1.0),
+    ("muscle", 0.6),
+    ("domain", 0.5),
+    ("intensity", 0.4),
+    ("movement", 0.8),
+    ("duration", 0.3),
+)
+
+
+def _columns(ids: Dict[str, int]) -> Dict[int, int]:
+    """id lookup -> columna, en orden de code para que el layout sea estable."""
+    return {ids[code]: col for col, code in enumerate(sorted(ids))}
+
+
+class FeatureLayout:
+    """Columnas de cada bloque a partir de los mapas code -> id de los lookups."""
+
+    def __init__(
+        self,
+        capacity_ids: Dict[str, int],
+        muscle_ids: Dict[str, int],
+        domain_ids: Dict[str, int],
+        intensity_ids: Dict[str, int],
+    ):
+        self.capacity = _columns(capacity_ids)
+        self.muscle = _columns(muscle_ids)
+        self.domain = _columns(domain_ids)
+        self.intensity = _columns(intensity_ids)
+        self.capacity_codes = sorted(capacity_ids)
+        self.intensity_codes = {row_id: code for code, row_id in intensity_ids.items()}
+        sizes = {
+            "capacity": len(self.capacity),
+            "muscle": len(self.muscle),
+            "domain": len(self.domain),
+            "intensity": len(self.intensity),
+            "movement": MOVEMENT_BUCKETS,
+            "duration": len(DURATION_EDGES) + 1,
+        }
+        self.slices: Dict[str, slice] = {}
+        offset = 0
+        for name, _ in GROUP_WEIGHTS:
+            self.slices[name] = slice(offset, offset + sizes[name])
+            offset += sizes[name]
+        self.dim = offset
+
+    @classmethod
+    def from_session(cls, session: Session) -> "FeatureLayout":
+        return cls(
+            lookup_registry.ids(session, PhysicalCapacityORM),
+            lookup_registry.ids(session, MuscleGroupORM),
+            lookup_registry.ids(session, EnergyDomainORM),
+            lookup_registry.ids(session, IntensityLevelORM),
+        )
+
+
+@dataclass
+class WorkoutFeatures:
+    domain_id: Optional[int]
+    intensity_id: Optional[int]
+    minutes: Optional[float]
+    capacities: Dict[int, int] = field(default_factory=dict)
+    muscles: set = field(default_factory=set)
+    movements: set = field(default_factory=set)
+
+
+def load_features(session: Session, workout_ids: Optional[Iterable[int]] = None) -> Dict[int, WorkoutFeatures]:
+    """Features de los workouts activos (todos o los indicados) con una consulta por tabla."""
+    query = session.query(
+        WorkoutORM.id, WorkoutORM.domain_id, WorkoutORM.intensity_level_id, WorkoutStatsORM.avg_time_seconds
+    ).outerjoin(WorkoutStatsORM, WorkoutStatsORM.workout_id == WorkoutORM.id)
+    query = query.filter(WorkoutORM.is_active.is_(True))
+    if workout_ids is not None:
+        query = query.filter(WorkoutORM.id.in_(list(workout_ids)))
+    features = {
+        wid: WorkoutFeatures(domain_id, intensity_id, avg_seconds / 60.0 if avg_seconds else None)
+        for wid, domain_id, intensity_id, avg_seconds in query.all()
+    }
+    if not features:
+        return features
+
+    def scoped(query, column):
+        return query.filter(column.in_(list(features))) if workout_ids is not None else query
+
+    for wid, capacity_id, value in scoped(
+        session.query(WorkoutCapacityORM.workout_id, WorkoutCapacityORM.capacity_id, WorkoutCapacityORM.value),
+        WorkoutCapacityORM.workout_id,
+    ):
+        if wid in features:
+            features[wid].capacities[capacity_id] = value
+    for wid, muscle_id in scoped(
+        session.query(WorkoutMuscleORM.workout_id, WorkoutMuscleORM.muscle_group_id), WorkoutMuscleORM.workout_id
+    ):
+        if wid in features:
+            features[wid].muscles.add(muscle_id)
+    movements = session.query(WorkoutBlockORM.workout_id, WorkoutBlockMovementORM.movement_id).join(
+        WorkoutBlockMovementORM, WorkoutBlockMovementORM.workout_block_id == WorkoutBlockORM.id
+    )
+    for wid, movement_id in scoped(movements, WorkoutBlockORM.workout_id):
+        if wid in features:
+            features[wid].movements.add(movement_id)
+    # Sin tiempo medio registrado, la duracion sale de la media de tiempos por nivel
+    level_minutes = session.query(WorkoutLevelTimeORM.workout_id, func.avg(WorkoutLevelTimeORM.time_minutes))
+    for wid, minutes in scoped(level_minutes, WorkoutLevelTimeORM.workout_id).group_by(WorkoutLevelTimeORM.workout_id):
+        if wid in features and features[wid].minutes is None and minutes is not None:
+            features[wid].minutes = float(minutes)
+    return features
+
+
+def build_vectors(layout: FeatureLayout, features: List[WorkoutFeatures]) -> np.ndarray:
+    matrix = np.zeros((len(features), layout.dim), dtype=np.float32)
+    s = layout.slices
+    for row, feat in enumerate(features):
+        for capacity_id, value in feat.capacities.items():
+            col = layout.capacity.get(capacity_id)
+            if col is not None:
+                matrix[row, s["capacity"].start + col] = value / 100.0
+        for muscle_id in feat.muscles:
+            col = layout.muscle.get(muscle_id)
+            if col is not None:
+                matrix[row, s["muscle"].start + col] = 1.0
+        if feat.domain_id in layout.domain:
+            matrix[row, s["domain"].start + layout.domain[feat.domain_id]] = 1.0
+        if feat.intensity_id in layout.intensity:
+            matrix[row, s["intensity"].start + layout.intensity[feat.intensity_id]] = 1.0
+        for movement_id in feat.movements:
+            matrix[row, s["movement"].start + movement_id % MOVEMENT_BUCKETS] = 1.0
+        minutes = feat.minutes if feat.minutes is not None else DEFAULT_DURATION_MINUTES
+        matrix[row, s["duration"].start + bisect.bisect_left(DURATION_EDGES, minutes)] = 1.0
+
+    for name, weight in GROUP_WEIGHTS:
+        block = matrix[:, s[name]]
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        np.divide(block, norms, out=block, where=norms > 0)
+        block *= weight
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _session_load(layout: FeatureLayout, feat: WorkoutFeatures) -> float:
+    """Carga relativa de la sesion: factores de intensidad y duracion del analisis."""
+    try:
+        intensity = IntensityLevel(layout.intensity_codes.get(feat.intensity_id))
+    except ValueError:
+        intensity = None
+    minutes = feat.minutes if feat.minutes is not None else DEFAULT_DURATION_MINUTES
+    return intensity_factor(intensity) * duration_factor(minutes)
+
+
+def raw_features(layout: FeatureLayout, features: List[WorkoutFeatures]) -> Tuple[np.ndarray, np.ndarray]:
+    """Valores de capacidad 0-100 (n, capacidades) y carga de sesion (n,) sin normalizar."""
+    capacities = np.zeros((len(features), len(layout.capacity)), dtype=np.float32)
+    for row, feat in enumerate(features):
+        for capacity_id, value in feat.capacities.items():
+            col = layout.capacity.get(capacity_id)
+            if col is not None:
+                capacities[row, col] = value
+    loads = np.array([_session_load(layout, feat) for feat in features], dtype=np.float32)
+    return capacities, loads
+
+
+class CatalogFeatures(NamedTuple):
+    workout_ids: np.ndarray
+    capacity_codes: List[str]
+    capacities: np.ndarray
+    session_load: np.ndarray
+
+
+class WorkoutSimilarityIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._layout: Optional[FeatureLayout] = None
+        self._matrix: Optional[np.ndarray] = None  # filas [0, _size) validas, resto es holgura
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._capacities: Optional[np.ndarray] = None
+        self._loads = np.zeros(0, dtype=np.float32)
+        self._rows: Dict[int, int] = {}
+        self._size = 0
+        self._built_at = 0.0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def nearest(self, session: Session, workout_id: int, k: int) -> List[Tuple[int, float]]:
+        """Top-k (workout_id, coseno) mas parecidos, sin incluir el propio workout."""
+        self._ensure(session)
+        with self._lock:
+            row = self._rows.get(workout_id)
+            k = min(k, self._size - 1)
+            if row is None or k <= 0:
+                return []
+            scores = self._matrix[: self._size] @ self._matrix[row]
+            scores[row] = -np.inf
+            top = np.argpartition(-scores, k - 1)[:k]
+            top_ids, top_scores = self._ids[top], scores[top]
+            order = np.lexsort((top_ids, -top_scores))
+            return [(int(top_ids[i]), float(top_scores[i])) for i in order]
+
+    def catalog(self, session: Session) -> CatalogFeatures:
+        """Copia de las features crudas del catalogo activo (para puntuar en bloque)."""
+        self._ensure(session)
+        with self._lock:
+            return CatalogFeatures(
+                workout_ids=self._ids[: self._size].copy(),
+                capacity_codes=list(self._layout.capacity_codes),
+                capacities=self._capacities[: self._size].copy(),
+                session_load=self._loads[: self._size].copy(),
+            )
+
+    def refresh(self, session: Session, workout_ids: Iterable[int]) -> None:
+        """Recalcula las filas indicadas (alta, edicion o baja). Sin indice construido no hace nada."""
+        workout_ids = list(workout_ids)
+        if self._matrix is None or not workout_ids:
+            return
+        self._apply(workout_ids, load_features(session, workout_ids))
+
+    def _apply(self, workout_ids: List[int], features: Dict[int, WorkoutFeatures]) -> None:
+        """Los ids con features se insertan o actualizan; los que faltan (baja/inactivo) se quitan."""
+        with self._lock:
+            present = [wid for wid in workout_ids if wid in features]
+            if present:
+                batch = [features[wid] for wid in present]
+                vectors = build_vectors(self._layout, batch)
+                capacities, loads = raw_features(self._layout, batch)
+                for pos, wid in enumerate(present):
+                    self._upsert(wid, vectors[pos], capacities[pos], loads[pos])
+            for wid in workout_ids:
+                if wid not in features:
+                    self._remove(wid)
+
+    def rebuild(self, session: Session) -> None:
+        started = time.perf_counter()
+        layout = FeatureLayout.from_session(session)
+        self._replace(layout, load_features(session))
+        logger.info(
+            "[similarity] rebuilt workouts=%s dim=%s ms=%.1f",
+            self._size,
+            layout.dim,
+            (time.perf_counter() - started) * 1000,
+        )
+
+    def _replace(self, layout: FeatureLayout, features: Dict[int, WorkoutFeatures]) -> None:
+        ids = sorted(features)
+        batch = [features[wid] for wid in ids]
+        matrix = build_vectors(layout, batch)
+        capacities, loads = raw_features(layout, batch)
+        with self._lock:
+            self._layout = layout
+            self._matrix = matrix
+            self._capacities = capacities
+            self._loads = loads
+            self._ids = np.array(ids, dtype=np.int64)
+            self._rows = {wid: row for row, wid in enumerate(ids)}
+            self._size = len(ids)
+            self._built_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self._size = 0
+            self._rows = {}
+
+    def _ensure(self, session: Session) -> None:
+        if self._matrix is None or time.monotonic() - self._built_at > INDEX_MAX_AGE_SECONDS:
+            self.rebuild(session)
+
+    def _upsert(self, workout_id: int, vector: np.ndarray, capacities: np.ndarray, load: float) -> None:
+        row = self._rows.get(workout_id)
+        if row is None:
+            if self._size == len(self._matrix):
+                # Crecimiento geometrico: las altas cuestan O(1) amortizado
+                capacity = max(16, 2 * len(self._matrix))
+                self._matrix = np.resize(self._matrix, (capacity, self._matrix.shape[1]))
+                self._capacities = np.resize(self._capacities, (capacity, self._capacities.shape[1]))
+                self._ids = np.resize(self._ids, capacity)
+                self._loads = np.resize(self._loads, capacity)
+            row = self._size
+            self._size += 1
+            self._rows[workout_id] = row
+            self._ids[row] = workout_id
+        self._matrix[row] = vector
+        self._capacities[row] = capacities
+        self._loads[row] = load
+
+    def _remove(self, workout_id: int) -> None:
+        row = self._rows.pop(workout_id, None)
+        if row is None:
+            return
+        last = self._size - 1
+        if row != last:
+            # La ultima fila ocupa el hueco para mantener el bloque [0, size) compacto
+            moved_id = int(self._ids[last])
+            self._matrix[row] = self._matrix[last]
+            self._capacities[row] = self._capacities[last]
+            self._loads[row] = self._loads[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._size = last
+
+
+similarity_index = WorkoutSimilarityIndex()
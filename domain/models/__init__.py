@@ -22,3 +22,9 @@ from .entities import (
     WorkoutResult,
     SimilarWorkout,
 )
+from .analysis import (
+    WorkoutAnalysisInput,
+    AnalysisLevelTime,
+    AnalysisCapacity,
+    AnalysisHyroxStation,
+)
@@ -0,0 +1,42 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .enums import EnergyDomain, IntensityLevel, PhysicalCapacity
+
+
+# Entrada compacta del analisis: solo los campos que lee domain.services.workout_analysis.
+# slots=True evita el __dict__ por instancia al analizar el catalogo completo.
+
+
+@dataclass(slots=True)
+class AnalysisLevelTime:
+    athlete_level: Optional[str]
+    time_minutes: float
+    time_range: str
+
+
+@dataclass(slots=True)
+class AnalysisCapacity:
+    capacity: Optional[PhysicalCapacity]
+    value: int
+    note: str
+
+
+@dataclass(slots=True)
+class AnalysisHyroxStation:
+    transfer_pct: int
+
+
+@dataclass(slots=True)
+class WorkoutAnalysisInput:
+    id: Optional[int]
+    domain: EnergyDomain | str | None
+    intensity: IntensityLevel | str | None
+    hyrox_transfer: IntensityLevel | str | None
+    estimated_difficulty: Optional[float] = None
+    avg_time_seconds: Optional[int] = None
+    session_load: Optional[str] = None
+    session_feel: Optional[str] = None
+    level_times: List[AnalysisLevelTime] = field(default_factory=list)
+    capacities: List[AnalysisCapacity] = field(default_factory=list)
+    hyrox_stations: List[AnalysisHyroxStation] = field(default_factory=list)
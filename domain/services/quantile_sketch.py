@@ -0,0 +1,127 @@
+"""Sketch de cuantiles fusionable (t-digest "merging", funcion de escala k1).
+
+Tamano acotado por ``compression`` (O(compression) centroides) independientemente del
+numero de muestras; dos sketches se fusionan sin perder precision relevante en colas.
+"""
+
+import math
+from typing import Dict, List, Optional
+
+DEFAULT_COMPRESSION = 100
+
+
+class TDigest:
+    def __init__(self, compression: int = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self._centroids: List[List[float]] = []  # [mean, weight] ordenados por mean
+        self._buffer: List[List[float]] = []
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @property
+    def count(self) -> float:
+        return sum(w for _, w in self._centroids) + sum(w for _, w in self._buffer)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        value = float(value)
+        self._buffer.append([value, float(weight)])
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self._buffer) >= self.compression * 2:
+            self._compress()
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        other._compress()
+        self._buffer.extend([m, w] for m, w in other._centroids)
+        for bound in (other.min, other.max):
+            if bound is not None:
+                self.min = bound if self.min is None else min(self.min, bound)
+                self.max = bound if self.max is None else max(self.max, bound)
+        self._compress()
+        return self
+
+    def mean(self) -> Optional[float]:
+        self._compress()
+        total = self.count
+        if not total:
+            return None
+        return sum(m * w for m, w in self._centroids) / total
+
+    def quantile(self, q: float) -> Optional[float]:
+        self._compress()
+        if not self._centroids:
+            return None
+        if len(self._centroids) == 1:
+            return self._centroids[0][0]
+        q = min(max(q, 0.0), 1.0)
+        total = self.count
+        target = q * total
+        # Interpolacion lineal entre centros de centroides (y min/max en los extremos)
+        first_mean, first_weight = self._centroids[0]
+        if target <= first_weight / 2:
+            return self._interpolate(self.min, first_mean, target / (first_weight / 2))
+        cumulative = 0.0
+        for (left_mean, left_weight), (right_mean, right_weight) in zip(self._centroids, self._centroids[1:]):
+            left_center = cumulative + left_weight / 2
+            right_center = cumulative + left_weight + right_weight / 2
+            if target <= right_center:
+                return self._interpolate(left_mean, right_mean, (target - left_center) / (right_center - left_center))
+            cumulative += left_weight
+        last_mean, last_weight = self._centroids[-1]
+        tail = last_weight / 2
+        return self._interpolate(last_mean, self.max, (target - (total - tail)) / tail)
+
+    def to_json(self) -> Dict:
+        self._compress()
+        return {
+            "c": self.compression,
+            "min": self.min,
+            "max": self.max,
+            "m": [[round(m, 3), w] for m, w in self._centroids],
+        }
+
+    @classmethod
+    def from_json(cls, data: Optional[Dict]) -> "TDigest":
+        if not data:
+            return cls()
+        digest = cls(compression=int(data.get("c") or DEFAULT_COMPRESSION))
+        digest._centroids = [[float(m), float(w)] for m, w in data.get("m") or []]
+        digest.min = data.get("min")
+        digest.max = data.get("max")
+        return digest
+
+    @staticmethod
+    def _interpolate(low: Optional[float], high: Optional[float], fraction: float) -> float:
+        if low is None:
+            return high
+        if high is None:
+            return low
+        fraction = min(max(fraction, 0.0), 1.0)
+        return low + (high - low) * fraction
+
+    def _q_limit(self, q: float) -> float:
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        return (math.sin(min(k * 2 * math.pi / self.compression, math.pi / 2)) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted(self._centroids + self._buffer, key=lambda item: item[0])
+        self._buffer = []
+        total = sum(w for _, w in items)
+        merged: List[List[float]] = []
+        so_far = 0.0
+        cur_mean, cur_weight = items[0]
+        q_limit = self._q_limit(0.0)
+        for mean, weight in items[1:]:
+            proposed = cur_weight + weight
+            if (so_far + proposed) / total <= q_limit:
+                cur_mean += (mean - cur_mean) * weight / proposed
+                cur_weight = proposed
+            else:
+                merged.append([cur_mean, cur_weight])
+                so_far += cur_weight
+                q_limit = self._q_limit(so_far / total)
+                cur_mean, cur_weight = mean, weight
+        merged.append([cur_mean, cur_weight])
+        self._centroids = merged
@@ -0,0 +1,66 @@
+"""Puntuacion vectorizada del catalogo para recomendar el entrenamiento del dia.
+
+score = GAP_WEIGHT * disposicion * cobertura de los deficits de capacidad
+      + LOAD_WEIGHT * ajuste de la carga de sesion a la carga objetivo (ratio agudo:cronico)
+      - RECENCY_WEIGHT * penalizacion por haberlo hecho hace poco (semivida en dias)
+
+La disposicion baja con la carga objetivo: con carga aguda alta manda descargar, no los deficits.
+
+Importa numpy: cargar solo de forma diferida (ver tests/test_import_time.py).
+"""
+
+from typing import Optional
+
+import numpy as np
+
+GAP_WEIGHT = 0.6
+LOAD_WEIGHT = 0.25
+RECENCY_WEIGHT = 0.8
+RECENCY_HALF_LIFE_DAYS = 5.0
+# Rango de intensity_factor * duration_factor del analisis (0.8 * 0.8 .. 1.25 * 1.3)
+MIN_SESSION_LOAD = 0.64
+MAX_SESSION_LOAD = 1.625
+
+
+def target_load(load_ratio: Optional[float]) -> float:
+    """Carga objetivo 0-1: 0.5 mantiene, ratio alto (>1.3) pide descargar, ratio bajo pide apretar."""
+    if load_ratio is None:
+        return 0.5
+    return float(min(1.0, max(0.0, 0.5 + (1.0 - load_ratio) * 1.25)))
+
+
+def gap_weights(gaps: np.ndarray) -> np.ndarray:
+    total = gaps.sum()
+    if total > 0:
+        return gaps / total
+    # Sin deficits conocidos todas las capacidades pesan igual
+    return np.full(len(gaps), 1.0 / len(gaps)) if len(gaps) else gaps
+
+
+def score_workouts(
+    capacities: np.ndarray,
+    session_load: np.ndarray,
+    gaps: np.ndarray,
+    load_target: float,
+    days_since: np.ndarray,
+) -> np.ndarray:
+    """
+    capacities: (n, c) valores 0-100 de cada workout; session_load: (n,) carga relativa;
+    gaps: (c,) deficit 0-1 del atleta por capacidad; days_since: (n,) dias desde la ultima
+    ejecucion (inf si nunca). Devuelve (n,) puntuaciones, mayor es mejor.
+    """
+    readiness = min(1.0, 2.0 * load_target)
+    gap_score = readiness * (capacities @ gap_weights(gaps)) / 100.0
+    load = np.clip((session_load - MIN_SESSION_LOAD) / (MAX_SESSION_LOAD - MIN_SESSION_LOAD), 0.0, 1.0)
+    load_score = 1.0 - np.abs(load - load_target)
+    recency = np.exp2(-days_since / RECENCY_HALF_LIFE_DAYS)
+    return GAP_WEIGHT * gap_score + LOAD_WEIGHT * load_score - RECENCY_WEIGHT * recency
+
+
+def top_indices(scores: np.ndarray, limit: int) -> np.ndarray:
+    """Indices de las ``limit`` mejores puntuaciones, ordenados de mayor a menor."""
+    limit = min(limit, len(scores))
+    if limit <= 0:
+        return np.zeros(0, dtype=np.int64)
+    top = np.argpartition(-scores, limit - 1)[:limit]
+    return top[np.argsort(-scores[top], kind="stable")]
@@ -0,0 +1,95 @@
+"""Carga de entrenamiento aguda/cronica con medias moviles exponenciales (EWMA).
+
+carga de sesion = minutos * RPE (sRPE); lambda = 2 / (N + 1) con N = 7 dias (aguda) y 28 (cronica).
+Una sesion nueva es O(1) sobre el estado guardado: los dias sin carga solo multiplican por
+(1 - lambda) ** dias, asi que se aplican al actualizar o al leer, sin recorrer el historico.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+DEFAULT_RPE = 5.0
+# granularidades de los rollups (semanas ISO, empiezan en lunes como date_trunc('week'))
+GRANULARITIES = ("day", "week", "month")
+
+
+def ewma_lambda(days: int) -> float:
+    return 2.0 / (days + 1)
+
+
+ACUTE_LAMBDA = ewma_lambda(ACUTE_DAYS)
+CHRONIC_LAMBDA = ewma_lambda(CHRONIC_DAYS)
+
+
+@dataclass(frozen=True)
+class LoadState:
+    """EWMA al cierre de ``as_of`` (incluye la carga de ese dia)."""
+
+    acute: float
+    chronic: float
+    as_of: date
+
+    @property
+    def ratio(self) -> Optional[float]:
+        return load_ratio(self.acute, self.chronic)
+
+
+def session_load(seconds: Optional[float], rpe: Optional[float] = None) -> float:
+    if not seconds or seconds <= 0:
+        return 0.0
+    return float(seconds) / 60.0 * float(rpe or DEFAULT_RPE)
+
+
+def load_ratio(acute: float, chronic: float) -> Optional[float]:
+    if chronic <= 0:
+        return None
+    return round(acute / chronic, 2)
+
+
+def decay(state: LoadState, to_date: date) -> LoadState:
+    """Estado a ``to_date`` sin carga en los dias intermedios; nunca retrocede."""
+    days = (to_date - state.as_of).days
+    if days <= 0:
+        return state
+    return LoadState(
+        acute=state.acute * (1.0 - ACUTE_LAMBDA) ** days,
+        chronic=state.chronic * (1.0 - CHRONIC_LAMBDA) ** days,
+        as_of=to_date,
+    )
+
+
+def add_load(state: Optional[LoadState], load: float, on_date: date) -> LoadState:
+    """Suma una sesion del dia ``on_date``; si es anterior al estado se aplica ya decaida."""
+    if state is None:
+        state = LoadState(acute=0.0, chronic=0.0, as_of=on_date)
+    state = decay(state, on_date)
+    lag = (state.as_of - on_date).days
+    return LoadState(
+        acute=state.acute + ACUTE_LAMBDA * load * (1.0 - ACUTE_LAMBDA) ** lag,
+        chronic=state.chronic + CHRONIC_LAMBDA * load * (1.0 - CHRONIC_LAMBDA) ** lag,
+        as_of=state.as_of,
+    )
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    raise ValueError(f"unknown granularity: {granularity}")
+
+
+def shift_bucket(start: date, granularity: str, buckets: int) -> date:
+    """Inicio del bucket ``buckets`` posiciones despues (o antes si es negativo) de ``start``."""
+    start = bucket_start(start, granularity)
+    if granularity == "day":
+        return start + timedelta(days=buckets)
+    if granularity == "week":
+        return start + timedelta(weeks=buckets)
+    year, month = divmod(start.year * 12 + start.month - 1 + buckets, 12)
+    return date(year, month + 1, 1)
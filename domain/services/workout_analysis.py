@@ -1,5 +1,5 @@
 from statistics import mean
-from typing import Dict, List
+from typing import Dict, List, Union
 
 from ..models import (
     Workout,
@@ -9,10 +9,15 @@ from ..models import (
     IntensityLevel,
     EnergyDomain,
     PhysicalCapacity,
+    WorkoutAnalysisInput,
 )
 
+# El analisis acepta la entidad completa o la entrada compacta (mismos atributos leidos)
+AnalysisSource = Union[Workout, WorkoutAnalysisInput]
 
-def _intensity_factor(intensity: IntensityLevel) -> float:
+
+def intensity_factor(intensity: IntensityLevel) -> float:
+    """Multiplicador de carga por intensidad (tambien lo usa el indice de similitud)."""
     return {
         IntensityLevel.LOW: 0.8,
         IntensityLevel.MEDIUM: 1.0,
@@ -28,7 +33,8 @@ def _domain_factor(domain: EnergyDomain) -> float:
     }.get(domain, 1.0)
 
 
-def _duration_factor(minutes: float) -> float:
+def duration_factor(minutes: float) -> float:
+    """Multiplicador por tramo de duracion: <=5, <=15, <=30 y mas de 30 minutos."""
     if minutes is None:
         return 1.0
     if minutes <= 5:
@@ -40,7 +46,7 @@ def _duration_factor(minutes: float) -> float:
     return 1.3
 
 
-def _resolve_duration_minutes(workout: Workout) -> float:
+def _resolve_duration_minutes(workout: AnalysisSource) -> float:
     # Prefer explicit estimated_time_minutes if present, fallback to avg_time_seconds, else safe default
     minutes = getattr(workout, "estimated_time_minutes", None)
     if minutes is None and getattr(workout, "avg_time_seconds", None):
@@ -51,13 +57,13 @@ def _resolve_duration_minutes(workout: Workout) -> float:
     return float(minutes) if minutes is not None else 15.0
 
 
-def estimate_fatigue_score(workout: Workout) -> float:
+def estimate_fatigue_score(workout: AnalysisSource) -> float:
     """Quick heuristic for session fatigue."""
-    base = (workout.estimated_difficulty or 0) * _intensity_factor(workout.intensity) * _domain_factor(workout.domain)
-    hyrox_weight = _intensity_factor(workout.hyrox_transfer)
+    base = (workout.estimated_difficulty or 0) * intensity_factor(workout.intensity) * _domain_factor(workout.domain)
+    hyrox_weight = intensity_factor(workout.hyrox_transfer)
     hyrox_component = hyrox_weight * 2
     duration_minutes = _resolve_duration_minutes(workout)
-    raw_fatigue = (base + hyrox_component) * _duration_factor(duration_minutes)
+    raw_fatigue = (base + hyrox_component) * duration_factor(duration_minutes)
     return min(10.0, round(raw_fatigue, 2))
 
 
@@ -90,7 +96,7 @@ def pacing_recommendation(level_times: List[WorkoutLevelTime]) -> Dict[str, str]
     }
 
 
-def analyze_workout(workout: Workout) -> Dict[str, object]:
+def analyze_workout(workout: AnalysisSource) -> Dict[str, object]:
     fatigue = estimate_fatigue_score(workout)
     transfer = hyrox_transfer_score(workout.hyrox_stations)
     capacities = capacity_focus(workout.capacities)
@@ -0,0 +1,129 @@
+"""Analisis de workouts por lotes con NumPy.
+
+Empaqueta los workouts en columnas (dificultad, codigo de intensidad, codigo de dominio,
+duracion, transfer de estaciones) y calcula fatiga, transfer Hyrox y top-3 de capacidades
+con operaciones vectorizadas. El resultado es identico al de ``analyze_workout``: la
+aritmetica sigue el mismo orden de operaciones en float64 y el redondeo final usa el
+``round`` de Python (``np.round`` escala por 10**n y difiere en los empates).
+
+Este modulo importa numpy al cargarse: importarlo solo dentro de funciones para no
+penalizar el arranque de la API (ver tests/test_import_time.py).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from ..models import EnergyDomain, IntensityLevel
+from .workout_analysis import AnalysisSource, _resolve_duration_minutes, hyrox_transfer_score, pacing_recommendation
+
+# Codigo 0 = desconocido (factor 1.0), igual que el .get(..., 1.0) del analisis escalar
+_INTENSITY_CODES = {IntensityLevel.LOW: 1, IntensityLevel.MEDIUM: 2, IntensityLevel.HIGH: 3}
+_INTENSITY_FACTORS = np.array([1.0, 0.8, 1.0, 1.25])
+_DOMAIN_CODES = {EnergyDomain.AEROBIC: 1, EnergyDomain.MIXED: 2, EnergyDomain.ANAEROBIC: 3}
+_DOMAIN_FACTORS = np.array([1.0, 0.9, 1.05, 1.1])
+_DURATION_EDGES = np.array([5.0, 15.0, 30.0])
+_DURATION_FACTORS = np.array([0.8, 1.0, 1.15, 1.3])
+CAPACITY_TOP = 3
+
+
+@dataclass
+class WorkoutColumns:
+    difficulty: np.ndarray
+    intensity: np.ndarray
+    domain: np.ndarray
+    hyrox_level: np.ndarray
+    duration_minutes: np.ndarray
+    station_pcts: np.ndarray
+    station_counts: np.ndarray
+    capacity_values: np.ndarray
+    capacity_counts: np.ndarray
+
+
+def _ragged(rows: List[list], fill: float) -> tuple:
+    """Lista de listas -> matriz (n, max_len) rellena con ``fill`` + vector de longitudes."""
+    counts = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+    matrix = np.full((len(rows), int(counts.max(initial=0))), fill)
+    flat = [value for row in rows for value in row]
+    if flat:
+        row_idx = np.repeat(np.arange(len(rows)), counts)
+        col_idx = np.arange(len(flat)) - np.repeat(np.cumsum(counts) - counts, counts)
+        matrix[row_idx, col_idx] = flat
+    return matrix, counts
+
+
+def pack_workouts(workouts: Sequence[AnalysisSource]) -> WorkoutColumns:
+    station_pcts, station_counts = _ragged([[s.transfer_pct for s in w.hyrox_stations] for w in workouts], 0.0)
+    capacity_values, capacity_counts = _ragged([[c.value for c in w.capacities] for w in workouts], -np.inf)
+    return WorkoutColumns(
+        difficulty=np.array([w.estimated_difficulty or 0 for w in workouts], dtype=np.float64),
+        intensity=np.array([_INTENSITY_CODES.get(w.intensity, 0) for w in workouts], dtype=np.int8),
+        domain=np.array([_DOMAIN_CODES.get(w.domain, 0) for w in workouts], dtype=np.int8),
+        hyrox_level=np.array([_INTENSITY_CODES.get(w.hyrox_transfer, 0) for w in workouts], dtype=np.int8),
+        duration_minutes=np.array([_resolve_duration_minutes(w) for w in workouts], dtype=np.float64),
+        station_pcts=station_pcts,
+        station_counts=station_counts,
+        capacity_values=capacity_values,
+        capacity_counts=capacity_counts,
+    )
+
+
+def _round_list(values: np.ndarray, digits: int = 2) -> List[float]:
+    return [round(v, digits) for v in values.tolist()]
+
+
+def fatigue_scores(columns: WorkoutColumns) -> List[float]:
+    intensity_f = _INTENSITY_FACTORS[columns.intensity]
+    base = columns.difficulty * intensity_f * _DOMAIN_FACTORS[columns.domain]
+    hyrox_component = _INTENSITY_FACTORS[columns.hyrox_level] * 2
+    # searchsorted(side="left") reproduce los cortes "<=" de duration_factor
+    duration_f = _DURATION_FACTORS[np.searchsorted(_DURATION_EDGES, columns.duration_minutes, side="left")]
+    raw = (base + hyrox_component) * duration_f
+    return [min(10.0, value) for value in _round_list(raw)]
+
+
+def hyrox_transfer_scores(columns: WorkoutColumns) -> List[float]:
+    counts = columns.station_counts
+    # Con pcts enteros la suma es exacta y sum/count coincide con statistics.mean
+    means = np.divide(columns.station_pcts.sum(axis=1), counts, out=np.zeros(len(counts)), where=counts > 0)
+    scores = _round_list(means / 10)
+    return [score if count else 0.0 for score, count in zip(scores, counts.tolist())]
+
+
+def top_capacity_indices(columns: WorkoutColumns, top: int = CAPACITY_TOP) -> List[List[int]]:
+    """Indices del top-N por valor desc; el argsort estable respeta el orden original en empates."""
+    order = np.argsort(-columns.capacity_values, axis=1, kind="stable")[:, :top]
+    limits = np.minimum(columns.capacity_counts, top).tolist()
+    return [row[:limit] for row, limit in zip(order.tolist(), limits)]
+
+
+def analyze_workouts_batch(workouts: Sequence[AnalysisSource]) -> List[Dict[str, object]]:
+    """Equivalente vectorizado de ``[analyze_workout(w) for w in workouts]``."""
+    if not workouts:
+        return []
+    columns = pack_workouts(workouts)
+    fatigue = fatigue_scores(columns)
+    transfer = hyrox_transfer_scores(columns)
+    top = top_capacity_indices(columns)
+
+    results = []
+    for i, workout in enumerate(workouts):
+        if any(not isinstance(s.transfer_pct, int) for s in workout.hyrox_stations):
+            # statistics.mean es exacto con decimales: se delega en la version escalar
+            transfer[i] = hyrox_transfer_score(workout.hyrox_stations)
+        capacities = [workout.capacities[j] for j in top[i]]
+        results.append(
+            {
+                "workout_id": workout.id,
+                "fatigue_score": fatigue[i],
+                "hyrox_transfer": transfer[i],
+                "capacity_focus": [
+                    {"capacity": c.capacity.value, "emphasis": f"{c.value}/100", "note": c.note} for c in capacities
+                ],
+                "pacing": pacing_recommendation(workout.level_times),
+                "expected_feel": workout.session_feel,
+                "session_load": workout.session_load,
+            }
+        )
+    return results
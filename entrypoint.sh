@@ -4,5 +4,8 @@ set -euo pipefail
 echo "[entrypoint] Running migrations..."
 alembic upgrade head
 
+echo "[entrypoint] Seeding catalog..."
+python -m infrastructure.db.seed
+
 echo "[entrypoint] Starting API..."
 exec uvicorn main:app --host 0.0.0.0 --port "${PORT:-8000}"
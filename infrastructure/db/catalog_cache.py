@@ -0,0 +1,110 @@
+"""Respuestas serializadas de los catalogos casi estaticos (lookups, movements, equipment).
+
+Cada grupo guarda en memoria el JSON ya serializado y su ETag. La validez se comprueba
+contra ``catalog_version`` (una fila por grupo, la incrementan triggers de Postgres en
+cualquier escritura, venga del proceso que venga) como mucho cada
+``VERSION_CHECK_SECONDS``; entre comprobaciones no se toca la BD. Las escrituras ORM de
+este proceso fuerzan la comprobacion en la siguiente peticion.
+"""
+
+import hashlib
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from infrastructure.db.models import (
+    AthleteLevelORM,
+    CatalogVersionORM,
+    EnergyDomainORM,
+    EquipmentORM,
+    HyroxStationORM,
+    IntensityLevelORM,
+    MovementAliasORM,
+    MovementMuscleORM,
+    MovementORM,
+    MuscleGroupORM,
+    PhysicalCapacityORM,
+)
+
+VERSION_CHECK_SECONDS = 5.0
+CATALOG_GROUPS = {
+    AthleteLevelORM: ("lookups",),
+    IntensityLevelORM: ("lookups",),
+    EnergyDomainORM: ("lookups",),
+    PhysicalCapacityORM: ("lookups",),
+    HyroxStationORM: ("lookups",),
+    MuscleGroupORM: ("lookups", "movements"),
+    MovementORM: ("movements",),
+    MovementMuscleORM: ("movements",),
+    MovementAliasORM: ("movements",),
+    EquipmentORM: ("equipment",),
+}
+
+
+@dataclass(frozen=True)
+class CatalogPayload:
+    body: bytes
+    etag: str
+    version: Optional[int]
+
+
+class CatalogCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._payloads: Dict[str, CatalogPayload] = {}
+        self._checked_at: Dict[str, float] = {}
+
+    def get(self, session: Session, group: str, build: Callable[[Session], bytes]) -> CatalogPayload:
+        """Payload vigente del grupo; ``build`` solo se llama si la version ha cambiado."""
+        cached = self._payloads.get(group)
+        if cached is not None and time.monotonic() - self._checked_at.get(group, 0.0) < VERSION_CHECK_SECONDS:
+            return cached
+        version = self._version(session, group)
+        if cached is None or version is None or cached.version != version:
+            body = build(session)
+            cached = CatalogPayload(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"', version=version)
+        with self._lock:
+            self._payloads[group] = cached
+            self._checked_at[group] = time.monotonic()
+        return cached
+
+    def mark_stale(self, group: Optional[str] = None) -> None:
+        with self._lock:
+            if group is None:
+                self._checked_at.clear()
+            else:
+                self._checked_at.pop(group, None)
+
+    @staticmethod
+    def _version(session: Session, group: str) -> Optional[int]:
+        # Sin fila (BD sin la migracion) se reconstruye en cada comprobacion; el ETag es el hash del body
+        return session.query(CatalogVersionORM.version).filter(CatalogVersionORM.name == group).scalar()
+
+
+catalog_cache = CatalogCache()
+
+
+def _collect_catalog_writes(session, flush_context):
+    groups = session.info.setdefault("catalog_stale_groups", set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        groups.update(CATALOG_GROUPS.get(type(obj), ()))
+
+
+def _mark_stale_after_commit(session):
+    # Tras el commit: antes, otra peticion podria volver a cachear la version anterior
+    for group in session.info.pop("catalog_stale_groups", ()):
+        catalog_cache.mark_stale(group)
+
+
+def _discard_on_rollback(session):
+    session.info.pop("catalog_stale_groups", None)
+
+
+event.listen(Session, "after_flush", _collect_catalog_writes)
+event.listen(Session, "after_commit", _mark_stale_after_commit)
+event.listen(Session, "after_rollback", _discard_on_rollback)
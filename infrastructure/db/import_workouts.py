@@ -0,0 +1,39 @@
+"""CLI de importacion masiva de workouts.
+
+Uso: ``python -m infrastructure.db.import_workouts wods.json [--batch-size 200]``
+El fichero es una lista JSON de payloads ``WorkoutImportItem`` (WorkoutCreate + blocks).
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+logger = logging.getLogger("workouts.import")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa workouts en lotes (una transaccion por lote).")
+    parser.add_argument("path", help="Fichero JSON con una lista de workouts.")
+    parser.add_argument("--batch-size", type=int, default=200, help="Workouts por transaccion.")
+    args = parser.parse_args(argv)
+
+    from application.services import WorkoutService
+    from infrastructure.db.session import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    with open(args.path, encoding="utf-8") as fh:
+        items = json.load(fh)
+    if not isinstance(items, list):
+        parser.error("el fichero debe contener una lista JSON")
+
+    with SessionLocal() as session:
+        report = WorkoutService(session).import_workouts(items, batch_size=args.batch_size)
+    for error in report.errors:
+        logger.warning("[import] item=%s title=%s error=%s", error.index, error.title, error.error)
+    logger.info("[import] received=%s created=%s errors=%s", report.received, report.created, len(report.errors))
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
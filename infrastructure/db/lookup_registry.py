@@ -0,0 +1,124 @@
+"""Registro code -> id de las tablas lookup, compartido por todo el proceso.
+
+Cada tabla se carga entera en la primera consulta (una sola query) y se invalida cuando se
+confirma (o se deshace) una escritura ORM en ella, o al re-sembrar el catalogo. Un code desconocido provoca como
+mucho una recarga cada ``MISS_REFRESH_SECONDS`` para recoger filas creadas por otro proceso.
+Los movimientos se resuelven igual pero por nombre (``lower(name)``), ver ``ids_by_name``.
+"""
+
+import itertools
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from infrastructure.db.models import (
+    AthleteLevelORM,
+    EnergyDomainORM,
+    HyroxStationORM,
+    IntensityLevelORM,
+    MovementORM,
+    MuscleGroupORM,
+    PhysicalCapacityORM,
+)
+
+LOOKUP_MODELS = (
+    AthleteLevelORM,
+    IntensityLevelORM,
+    EnergyDomainORM,
+    PhysicalCapacityORM,
+    MuscleGroupORM,
+    HyroxStationORM,
+)
+NAMED_MODELS = (MovementORM,)
+WATCHED_MODELS = LOOKUP_MODELS + NAMED_MODELS
+MISS_REFRESH_SECONDS = 30.0
+
+
+class LookupRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, Dict[str, int]] = {}
+        self._names: Dict[str, Dict[str, int]] = {}
+        self._loaded_at: Dict[str, float] = {}
+
+    def id_for(self, session: Session, model, code) -> Optional[int]:
+        if code is None:
+            return None
+        code_value = getattr(code, "value", code)
+        table = model.__tablename__
+        ids = self._ids.get(table)
+        if ids is None:
+            ids = self._load(session, model)
+        found = ids.get(code_value)
+        if found is None and time.monotonic() - self._loaded_at.get(table, 0.0) > MISS_REFRESH_SECONDS:
+            found = self._load(session, model).get(code_value)
+        return found
+
+    def ids(self, session: Session, model) -> Dict[str, int]:
+        ids = self._ids.get(model.__tablename__)
+        if ids is None:
+            ids = self._load(session, model)
+        return dict(ids)
+
+    def ids_by_name(self, session: Session, model, names: Iterable[str]) -> Dict[str, int]:
+        """name -> id (comparando en minusculas) de los nombres que existen en ``model``."""
+        table = model.__tablename__
+        keys = {name: name.strip().lower() for name in names}
+        ids = self._names.get(table)
+        if ids is None:
+            ids = self._load_names(session, model)
+        elif any(key not in ids for key in keys.values()):
+            if time.monotonic() - self._loaded_at.get(table, 0.0) > MISS_REFRESH_SECONDS:
+                ids = self._load_names(session, model)
+        return {name: ids[key] for name, key in keys.items() if key in ids}
+
+    def invalidate(self, model=None) -> None:
+        with self._lock:
+            if model is None:
+                self._ids.clear()
+                self._names.clear()
+                self._loaded_at.clear()
+            else:
+                self._ids.pop(model.__tablename__, None)
+                self._names.pop(model.__tablename__, None)
+                self._loaded_at.pop(model.__tablename__, None)
+
+    def _load(self, session: Session, model) -> Dict[str, int]:
+        mapping = {code: row_id for code, row_id in session.query(model.code, model.id).all()}
+        with self._lock:
+            self._ids[model.__tablename__] = mapping
+            self._loaded_at[model.__tablename__] = time.monotonic()
+        return mapping
+
+    def _load_names(self, session: Session, model) -> Dict[str, int]:
+        mapping = {name: row_id for name, row_id in session.query(func.lower(model.name), model.id).all()}
+        with self._lock:
+            self._names[model.__tablename__] = mapping
+            self._loaded_at[model.__tablename__] = time.monotonic()
+        return mapping
+
+
+lookup_registry = LookupRegistry()
+
+
+def _collect_lookup_writes(session, flush_context):
+    models = session.info.setdefault("lookup_written_models", set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, WATCHED_MODELS):
+            models.add(type(obj))
+
+
+def _invalidate_written(session):
+    # Solo al terminar la transaccion: antes, otra peticion podria recargar y cachear el estado
+    # anterior. En rollback tambien, porque una recarga dentro de la transaccion pudo cachear
+    # ids que ya no existen.
+    for model in session.info.pop("lookup_written_models", ()):
+        lookup_registry.invalidate(model)
+
+
+event.listen(Session, "after_flush", _collect_lookup_writes)
+event.listen(Session, "after_commit", _invalidate_written)
+event.listen(Session, "after_rollback", _invalidate_written)
@@ -9,11 +9,18 @@ from .entities import (  # noqa: F401
     EventORM,
     UserEventORM,
     UserTrainingLoadORM,
+    UserTrainingLoadStateORM,
+    UserLoadRollupORM,
     UserCapacityProfileORM,
     UserProgressORM,
     UserSkillORM,
+    UserSkillTotalsORM,
     UserBiometricORM,
+    UserCapacityCurrentORM,
+    UserSkillCurrentORM,
+    UserBiometricCurrentORM,
     UserPROM,
+    UserPRHistoryORM,
     WorkoutORM,
     WorkoutMetadataORM,
     WorkoutStatsORM,
@@ -33,6 +40,7 @@ from .entities import (  # noqa: F401
     TrainingPlanORM,
     TrainingPlanDayORM,
     WorkoutResultORM,
+    WorkoutBestResultORM,
     WorkoutExecutionORM,
     WorkoutExecutionBlockORM,
     WorkoutAnalysisORM,
@@ -43,4 +51,6 @@ from .entities import (  # noqa: F401
     MissionORM,
     UserMissionORM,
     SimilarWorkoutORM,
+    SeedStateORM,
+    CatalogVersionORM,
 )
@@ -1,4 +1,5 @@
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     CheckConstraint,
     Column,
@@ -13,6 +14,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
@@ -158,7 +160,6 @@ class UserTrainingLoadORM(Base):
     __tablename__ = "user_training_load"
     __table_args__ = (
         UniqueConstraint("user_id", "load_date", name="uq_user_load_date"),
-        Index("ix_user_training_load_user", "user_id"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -172,6 +173,33 @@ class UserTrainingLoadORM(Base):
     user = relationship("UserORM", back_populates="training_loads")
 
 
+class UserTrainingLoadStateORM(Base):
+    """Estado EWMA agudo/cronico por usuario al cierre de ``as_of``; el decaimiento posterior se aplica al leer."""
+
+    __tablename__ = "user_training_load_state"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    acute_load = Column(Numeric(12, 4), nullable=False, default=0, server_default="0")
+    chronic_load = Column(Numeric(12, 4), nullable=False, default=0, server_default="0")
+    as_of = Column(Date, nullable=False)
+    updated_at = Column(DateTime(timezone=False), nullable=False, server_default=func.now())
+
+
+class UserLoadRollupORM(Base):
+    """Totales de carga por usuario, granularidad (day/week/month), inicio del bucket y dominio."""
+
+    __tablename__ = "user_load_rollup"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    granularity = Column(String(5), primary_key=True, nullable=False)
+    bucket_start = Column(Date, primary_key=True, nullable=False)
+    domain_code = Column(String(50), primary_key=True, nullable=False, default="none", server_default="none")
+    load = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    sessions = Column(Integer, nullable=False, default=0, server_default="0")
+    total_seconds = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=False), nullable=False, server_default=func.now())
+
+
 class UserCapacityProfileORM(Base):
     __tablename__ = "user_capacity_profile"
     __table_args__ = (
@@ -203,7 +231,10 @@ class UserProgressORM(Base):
 
 class UserSkillORM(Base):
     __tablename__ = "user_skills"
-    __table_args__ = (Index("ix_user_skills_user", "user_id"),)
+    __table_args__ = (
+        Index("ix_user_skills_user_movement_measured", "user_id", "movement_id", "measured_at"),
+        Index("ix_user_skills_user_measured", "user_id", "measured_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -216,9 +247,24 @@ class UserSkillORM(Base):
     movement = relationship("MovementORM")
 
 
+class UserSkillTotalsORM(Base):
+    """Volumen acumulado por movimiento en los WODs aplicados; se incrementa en SQL (total = total + inc)."""
+
+    __tablename__ = "user_skill_totals"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    movement_id = Column(Integer, ForeignKey("movements.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    total_reps = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    total_kg = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    total_meters = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    total_cals = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    total_seconds = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=False), nullable=False, server_default=func.now())
+
+
 class UserBiometricORM(Base):
     __tablename__ = "user_biometrics"
-    __table_args__ = (Index("ix_user_biometrics_user", "user_id"),)
+    __table_args__ = (Index("ix_user_biometrics_user_measured", "user_id", "measured_at"),)
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -235,11 +281,42 @@ class UserBiometricORM(Base):
     user = relationship("UserORM", back_populates="biometrics")
 
 
+# Estado actual por usuario: punteros a la ultima fila (measured_at, id) de cada historico.
+# Los mantienen triggers de Postgres en la misma transaccion que la escritura; solo lectura desde el ORM.
+class UserCapacityCurrentORM(Base):
+    __tablename__ = "user_capacity_current"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    capacity_id = Column(Integer, ForeignKey("physical_capacities.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    capacity_profile_id = Column(
+        Integer, ForeignKey("user_capacity_profile.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    measured_at = Column(DateTime(timezone=False), nullable=False)
+
+
+class UserSkillCurrentORM(Base):
+    __tablename__ = "user_skill_current"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    movement_id = Column(Integer, ForeignKey("movements.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    skill_id = Column(Integer, ForeignKey("user_skills.id", ondelete="CASCADE"), nullable=False, unique=True)
+    measured_at = Column(DateTime(timezone=False), nullable=False)
+
+
+class UserBiometricCurrentORM(Base):
+    __tablename__ = "user_biometric_current"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    biometric_id = Column(Integer, ForeignKey("user_biometrics.id", ondelete="CASCADE"), nullable=False, unique=True)
+    measured_at = Column(DateTime(timezone=False), nullable=False)
+
+
 class UserPROM(Base):
+    """Mejor marca vigente por (usuario, movimiento, tipo); la progresion queda en user_pr_history."""
+
     __tablename__ = "user_pr"
     __table_args__ = (
         UniqueConstraint("user_id", "movement_id", "pr_type", name="uq_user_pr_unique"),
-        Index("ix_user_pr_user", "user_id"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -254,6 +331,22 @@ class UserPROM(Base):
     movement = relationship("MovementORM")
 
 
+class UserPRHistoryORM(Base):
+    """Una fila por cada mejora de PR, con el valor anterior."""
+
+    __tablename__ = "user_pr_history"
+    __table_args__ = (Index("ix_user_pr_history_key", "user_id", "movement_id", "pr_type", "achieved_at"),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    movement_id = Column(Integer, ForeignKey("movements.id", ondelete="CASCADE"), nullable=False)
+    pr_type = Column(String(30), nullable=False)
+    value = Column(Numeric(10, 2), nullable=False)
+    previous_value = Column(Numeric(10, 2), nullable=True)
+    unit = Column(String(20), nullable=True)
+    achieved_at = Column(DateTime(timezone=False), nullable=False, server_default=func.now())
+
+
 class WorkoutORM(Base):
     __tablename__ = "workouts"
     __table_args__ = (
@@ -353,6 +446,15 @@ class WorkoutStatsORM(Base):
     avg_rating = Column(Numeric(3, 2), nullable=True)
     avg_difficulty = Column(Numeric(3, 1), nullable=True)
     rating_count = Column(Integer, nullable=True)
+    # Agregados acumulados (n, suma, suma de cuadrados) mantenidos en cada escritura de workout_result
+    result_count = Column(Integer, nullable=False, server_default="0", default=0)
+    time_sum = Column(BigInteger, nullable=False, server_default="0", default=0)
+    time_sq_sum = Column(BigInteger, nullable=False, server_default="0", default=0)
+    rating_sum = Column(Integer, nullable=False, server_default="0", default=0)
+    rating_sq_sum = Column(Integer, nullable=False, server_default="0", default=0)
+    difficulty_count = Column(Integer, nullable=False, server_default="0", default=0)
+    difficulty_sum = Column(Integer, nullable=False, server_default="0", default=0)
+    difficulty_sq_sum = Column(Integer, nullable=False, server_default="0", default=0)
 
     workout = relationship("WorkoutORM", back_populates="stats")
 
@@ -557,7 +659,11 @@ class TrainingPlanDayORM(Base):
 
 class WorkoutResultORM(Base):
     __tablename__ = "workout_result"
-    __table_args__ = (Index("ix_workout_result_user", "user_id"), Index("ix_workout_result_workout", "workout_id"))
+    __table_args__ = (
+        Index("ix_workout_result_user_created", "user_id", "created_at"),
+        Index("ix_workout_result_user_workout_created", "user_id", "workout_id", "created_at"),
+        Index("ix_workout_result_workout_time", "workout_id", "time_seconds"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     workout_id = Column(Integer, ForeignKey("workouts.id", ondelete="CASCADE"), nullable=False)
@@ -572,6 +678,25 @@ class WorkoutResultORM(Base):
     user = relationship("UserORM", back_populates="results")
 
 
+class WorkoutBestResultORM(Base):
+    """Mejor tiempo por (workout, atleta); se mantiene en cada envio para el leaderboard."""
+
+    __tablename__ = "workout_best_result"
+    __table_args__ = (
+        Index("ix_workout_best_result_rank", "workout_id", "time_seconds", "user_id"),
+        Index("ix_workout_best_result_level_rank", "workout_id", "athlete_level_id", "time_seconds", "user_id"),
+    )
+
+    workout_id = Column(Integer, ForeignKey("workouts.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    athlete_level_id = Column(Integer, ForeignKey("athlete_levels.id"), nullable=True)
+    time_seconds = Column(SmallInteger, nullable=False)
+    achieved_at = Column(DateTime(timezone=False), nullable=False, server_default=func.now())
+
+    user = relationship("UserORM")
+    athlete_level = relationship("AthleteLevelORM")
+
+
 class SimilarWorkoutORM(Base):
     __tablename__ = "similar_workouts"
     __table_args__ = (
@@ -600,6 +725,7 @@ class WorkoutStatsByLevelORM(Base):
     percentile_90 = Column(Numeric(8, 2), nullable=True)
     avg_difficulty = Column(Numeric(4, 2), nullable=True)
     sample_size = Column(Integer, nullable=True)
+    time_digest = Column(JSONB, nullable=True)
 
     workout = relationship("WorkoutORM", back_populates="stats_by_level")
     athlete_level = relationship("AthleteLevelORM", back_populates="workout_stats_by_level")
@@ -607,7 +733,10 @@ class WorkoutStatsByLevelORM(Base):
 
 class WorkoutExecutionORM(Base):
     __tablename__ = "workout_execution"
-    __table_args__ = (Index("ix_workout_execution_user", "user_id"),)
+    __table_args__ = (
+        Index("ix_workout_execution_user_executed", "user_id", "executed_at"),
+        Index("ix_workout_execution_user_workout_executed", "user_id", "workout_id", "executed_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     workout_id = Column(Integer, ForeignKey("workouts.id", ondelete="CASCADE"), nullable=False)
@@ -641,7 +770,7 @@ class WorkoutExecutionBlockORM(Base):
 
 class WorkoutAnalysisORM(Base):
     __tablename__ = "workout_analysis"
-    __table_args__ = (Index("ix_workout_analysis_user", "user_id"),)
+    __table_args__ = (Index("ix_workout_analysis_user_workout_created", "user_id", "workout_id", "created_at"),)
 
     id = Column(Integer, primary_key=True)
     workout_id = Column(Integer, ForeignKey("workouts.id", ondelete="CASCADE"), nullable=False)
@@ -658,7 +787,16 @@ class WorkoutAnalysisORM(Base):
 
 class GlobalPerformanceDataORM(Base):
     __tablename__ = "global_performance_data"
-    __table_args__ = (Index("ix_global_perf_level", "athlete_level_id"),)
+    __table_args__ = (
+        Index("ix_global_perf_level", "athlete_level_id"),
+        Index(
+            "uq_global_perf_movement_level",
+            "movement_id",
+            "athlete_level_id",
+            unique=True,
+            postgresql_where=text("workout_id IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     workout_id = Column(Integer, ForeignKey("workouts.id", ondelete="CASCADE"), nullable=True)
@@ -672,6 +810,8 @@ class GlobalPerformanceDataORM(Base):
     percentile_50 = Column(Numeric(8, 2), nullable=True)
     percentile_75 = Column(Numeric(8, 2), nullable=True)
     percentile_90 = Column(Numeric(8, 2), nullable=True)
+    sample_size = Column(Integer, nullable=True)
+    digest = Column(JSONB, nullable=True)
     updated_at = Column(DateTime(timezone=False), nullable=False, server_default=func.now())
 
     movement = relationship("MovementORM", back_populates="global_performance")
@@ -764,7 +904,6 @@ class UserMissionORM(Base):
     __tablename__ = "user_missions"
     __table_args__ = (
         UniqueConstraint("user_id", "mission_id", name="uq_user_mission"),
-        Index("ix_user_missions_user", "user_id"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -778,3 +917,21 @@ class UserMissionORM(Base):
 
     user = relationship("UserORM", back_populates="missions")
     mission = relationship("MissionORM", back_populates="user_missions")
+
+
+class SeedStateORM(Base):
+    __tablename__ = "seed_state"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False)
+    applied_at = Column(DateTime(timezone=False), nullable=False, server_default=func.now())
+
+
+class CatalogVersionORM(Base):
+    """Sello de version por grupo de catalogo; lo incrementan triggers de Postgres en cada escritura."""
+
+    __tablename__ = "catalog_version"
+
+    name = Column(String(32), primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default="1")
+    updated_at = Column(DateTime(timezone=False), nullable=False, server_default=func.now())
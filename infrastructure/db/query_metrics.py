@@ -0,0 +1,100 @@
+"""Numero de consultas y tiempo de BD por peticion, y log de consultas lentas.
+
+``install(engine)`` engancha before/after_cursor_execute. Las peticiones abren un ``QueryStats`` con
+``start()`` (contextvar: los endpoints sync corren en el threadpool con una copia del contexto, asi que
+comparten el mismo objeto). Fuera de una peticion (scripts, startup) solo se registran las lentas.
+"""
+
+import logging
+import os
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("db.queries")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_MAX_SQL = 1000
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+@dataclass
+class QueryStats:
+    label: str = ""
+    count: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ms(self) -> float:
+        return round(self.seconds * 1000, 2)
+
+
+def start(label: str = "") -> Tuple[QueryStats, Token]:
+    stats = QueryStats(label=label)
+    return stats, _current.set(stats)
+
+
+def stop(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def redact(parameters: Any) -> Any:
+    """Solo tipos, nunca valores (emails, hashes, tokens...)."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        # executemany: lista de filas
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} rows>"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__ if parameters is not None else None
+
+
+def _before(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        sql = " ".join(statement.split())[:SLOW_QUERY_MAX_SQL]
+        logger.warning(
+            "[db][slow] ms=%.1f request=%s sql=%s params=%s",
+            elapsed * 1000,
+            stats.label if stats else "-",
+            sql,
+            redact(parameters),
+            extra={"duration_ms": round(elapsed * 1000, 2), "request": stats.label if stats else None},
+        )
+
+
+def _error(context):
+    # una sentencia fallida no llega a after_cursor_execute
+    if context.connection is not None:
+        started = context.connection.info.get("query_started")
+        if started:
+            started.pop()
+
+
+def install(engine: Engine) -> None:
+    if event.contains(engine, "after_cursor_execute", _after):
+        return
+    event.listen(engine, "before_cursor_execute", _before)
+    event.listen(engine, "after_cursor_execute", _after)
+    event.listen(engine, "handle_error", _error)
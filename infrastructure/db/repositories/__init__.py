@@ -6,4 +6,6 @@ from .training_plan_repository import TrainingPlanRepository
 from .workout_result_repository import WorkoutResultRepository
 from .lookup_repository import LookupRepository
 from .movement_repository import MovementRepository
-from .user_metrics_repository import UserTrainingLoadRepository, UserCapacityProfileRepository
+from .user_metrics_repository import UserTrainingLoadRepository, UserLoadRollupRepository, UserCapacityProfileRepository, UserSkillTotalsRepository, UserPRRepository
+from .workout_stats_repository import WorkoutStatsRepository
+from .leaderboard_repository import LeaderboardRepository
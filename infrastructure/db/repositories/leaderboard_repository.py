@@ -0,0 +1,124 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload
+
+from infrastructure.db.models import WorkoutBestResultORM, WorkoutResultORM
+from .base import BaseRepository
+
+
+class LeaderboardRepository(BaseRepository):
+    """Mejor resultado por atleta (workout_best_result). Las escrituras no hacen commit."""
+
+    def __init__(self, session: Session):
+        super().__init__(session, WorkoutBestResultORM)
+
+    def record(self, workout_id: int, user_id: int, athlete_level_id: Optional[int], time_seconds: int) -> None:
+        stmt = pg_insert(WorkoutBestResultORM).values(
+            workout_id=workout_id,
+            user_id=user_id,
+            athlete_level_id=athlete_level_id,
+            time_seconds=time_seconds,
+            achieved_at=datetime.utcnow(),
+        )
+        table = WorkoutBestResultORM.__table__
+        # Solo sustituye si mejora el tiempo
+        self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["workout_id", "user_id"],
+                set_={
+                    "time_seconds": stmt.excluded.time_seconds,
+                    "achieved_at": stmt.excluded.achieved_at,
+                },
+                where=stmt.excluded.time_seconds < table.c.time_seconds,
+            )
+        )
+        self.sync_level(user_id, athlete_level_id)
+
+    def sync_level(self, user_id: int, athlete_level_id: Optional[int]) -> None:
+        """El nivel va desnormalizado para filtrar por indice; se alinea con el nivel actual del atleta."""
+        self.session.query(WorkoutBestResultORM).filter(
+            WorkoutBestResultORM.user_id == user_id,
+            WorkoutBestResultORM.athlete_level_id.is_distinct_from(athlete_level_id),
+        ).update({WorkoutBestResultORM.athlete_level_id: athlete_level_id}, synchronize_session=False)
+
+    def refresh_user(
+        self,
+        workout_id: int,
+        user_id: int,
+        athlete_level_id: Optional[int],
+        exclude_result_id: Optional[int] = None,
+    ) -> None:
+        """Recalcula el mejor tiempo del atleta tras editar o borrar un resultado."""
+        query = self.session.query(WorkoutResultORM.time_seconds, WorkoutResultORM.created_at).filter(
+            WorkoutResultORM.workout_id == workout_id,
+            WorkoutResultORM.user_id == user_id,
+        )
+        if exclude_result_id is not None:
+            query = query.filter(WorkoutResultORM.id != exclude_result_id)
+        best = query.order_by(WorkoutResultORM.time_seconds.asc(), WorkoutResultORM.created_at.asc()).first()
+        if not best:
+            self.session.query(WorkoutBestResultORM).filter(
+                WorkoutBestResultORM.workout_id == workout_id,
+                WorkoutBestResultORM.user_id == user_id,
+            ).delete(synchronize_session=False)
+            return
+        stmt = pg_insert(WorkoutBestResultORM).values(
+            workout_id=workout_id,
+            user_id=user_id,
+            athlete_level_id=athlete_level_id,
+            time_seconds=best.time_seconds,
+            achieved_at=best.created_at,
+        )
+        self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["workout_id", "user_id"],
+                set_={
+                    "time_seconds": stmt.excluded.time_seconds,
+                    "achieved_at": stmt.excluded.achieved_at,
+                    "athlete_level_id": stmt.excluded.athlete_level_id,
+                },
+            )
+        )
+
+    def _scoped(self, workout_id: int, athlete_level_id: Optional[int]):
+        query = self.session.query(WorkoutBestResultORM).filter(WorkoutBestResultORM.workout_id == workout_id)
+        if athlete_level_id is not None:
+            query = query.filter(WorkoutBestResultORM.athlete_level_id == athlete_level_id)
+        return query
+
+    def page(
+        self,
+        workout_id: int,
+        athlete_level_id: Optional[int],
+        limit: int,
+        after: Optional[tuple] = None,
+    ) -> List[WorkoutBestResultORM]:
+        """Paginacion por clave (time_seconds, user_id): recorre el indice sin OFFSET."""
+        query = self._scoped(workout_id, athlete_level_id)
+        if after is not None:
+            query = query.filter(tuple_(WorkoutBestResultORM.time_seconds, WorkoutBestResultORM.user_id) > after)
+        return (
+            query.options(joinedload(WorkoutBestResultORM.user), joinedload(WorkoutBestResultORM.athlete_level))
+            .order_by(WorkoutBestResultORM.time_seconds.asc(), WorkoutBestResultORM.user_id.asc())
+            .limit(limit)
+            .all()
+        )
+
+    def get_entry(self, workout_id: int, user_id: int) -> Optional[WorkoutBestResultORM]:
+        return self.session.get(
+            WorkoutBestResultORM,
+            (workout_id, user_id),
+            options=[joinedload(WorkoutBestResultORM.user), joinedload(WorkoutBestResultORM.athlete_level)],
+        )
+
+    def count_faster(self, workout_id: int, athlete_level_id: Optional[int], time_seconds: int) -> int:
+        """Atletas estrictamente mas rapidos: rango de competicion = este valor + 1."""
+        return (
+            self._scoped(workout_id, athlete_level_id)
+            .filter(WorkoutBestResultORM.time_seconds < time_seconds)
+            .with_entities(func.count())
+            .scalar()
+        )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from sqlalchemy.orm import Session, joinedload
 
+from infrastructure.db.lookup_registry import lookup_registry
 from infrastructure.db.models import MovementMuscleORM, MovementORM, MuscleGroupORM
 from .base import BaseRepository
 
@@ -42,10 +43,10 @@ class MovementRepository(BaseRepository):
             muscle_code = mm.get("muscle_group")
             if not muscle_code:
                 continue
-            muscle_row = self.session.query(MuscleGroupORM).filter(MuscleGroupORM.code == muscle_code).first()
-            if not muscle_row:
+            muscle_id = lookup_registry.id_for(self.session, MuscleGroupORM, muscle_code)
+            if not muscle_id:
                 continue
             movement.muscles.append(
-                MovementMuscleORM(movement_id=movement.id, muscle_group_id=muscle_row.id, is_primary=mm.get("is_primary", True))
+                MovementMuscleORM(movement_id=movement.id, muscle_group_id=muscle_id, is_primary=mm.get("is_primary", True))
             )
         self.session.commit()
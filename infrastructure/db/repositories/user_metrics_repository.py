@@ -1,18 +1,143 @@
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from infrastructure.db.models import UserCapacityProfileORM, UserTrainingLoadORM, PhysicalCapacityORM
+from infrastructure.db.models import (
+    PhysicalCapacityORM,
+    UserCapacityProfileORM,
+    UserLoadRollupORM,
+    UserPRHistoryORM,
+    UserPROM,
+    UserSkillTotalsORM,
+    UserTrainingLoadORM,
+    UserTrainingLoadStateORM,
+)
 from .base import BaseRepository
 
+SKILL_TOTAL_COLUMNS = ("total_reps", "total_kg", "total_meters", "total_cals", "total_seconds")
+# tipos de PR en los que gana el valor mas bajo
+PR_LOWER_IS_BETTER = ("time", "BEST_TIME", "BEST_PACE")
+
+
+def pr_is_better(pr_type: str, new_value: float, old_value: float) -> bool:
+    if pr_type in PR_LOWER_IS_BETTER:
+        return new_value < old_value
+    return new_value > old_value
+
 
 class UserTrainingLoadRepository(BaseRepository):
     def __init__(self, session: Session):
         super().__init__(session, UserTrainingLoadORM)
 
-    def list_for_user(self, user_id: int):
+    def list_for_user(self, user_id: int, since: Optional[date] = None):
+        query = self.session.query(UserTrainingLoadORM).filter(UserTrainingLoadORM.user_id == user_id)
+        if since is not None:
+            query = query.filter(UserTrainingLoadORM.load_date >= since)
+        return query.order_by(UserTrainingLoadORM.load_date.desc()).all()
+
+    def get_state(self, user_id: int) -> Optional[UserTrainingLoadStateORM]:
+        return self.session.get(UserTrainingLoadStateORM, user_id)
+
+    def lock_state(self, user_id: int, on_date: date) -> UserTrainingLoadStateORM:
+        """Estado EWMA bloqueado (FOR UPDATE) hasta el commit; lo crea a cero si el usuario no tiene."""
+        # autoflush=False: sin flush, populate_existing pisaria una sesion anterior de la misma transaccion
+        self.session.flush()
+        self.session.execute(
+            pg_insert(UserTrainingLoadStateORM)
+            .values(user_id=user_id, as_of=on_date)
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
         return (
-            self.session.query(UserTrainingLoadORM)
-            .filter(UserTrainingLoadORM.user_id == user_id)
-            .order_by(UserTrainingLoadORM.load_date.desc())
+            self.session.query(UserTrainingLoadStateORM)
+            .filter(UserTrainingLoadStateORM.user_id == user_id)
+            .with_for_update()
+            .populate_existing()
+            .one()
+        )
+
+    def upsert_day(
+        self,
+        user_id: int,
+        load_date: date,
+        acute_load: float,
+        chronic_load: float,
+        load_ratio: Optional[float],
+        notes: Optional[str] = None,
+    ) -> None:
+        """Foto diaria del estado: una fila por (usuario, dia), las notas existentes se conservan."""
+        stmt = pg_insert(UserTrainingLoadORM).values(
+            user_id=user_id,
+            load_date=load_date,
+            acute_load=acute_load,
+            chronic_load=chronic_load,
+            load_ratio=load_ratio,
+            notes=notes,
+        )
+        table = UserTrainingLoadORM.__table__
+        self.session.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_user_load_date",
+                set_={
+                    "acute_load": stmt.excluded.acute_load,
+                    "chronic_load": stmt.excluded.chronic_load,
+                    "load_ratio": stmt.excluded.load_ratio,
+                    "notes": func.coalesce(table.c.notes, stmt.excluded.notes),
+                },
+            )
+        )
+
+
+class UserLoadRollupRepository(BaseRepository):
+    """Rollups de carga por bucket; se incrementan al registrar cada ejecucion. No hace commit."""
+
+    def __init__(self, session: Session):
+        super().__init__(session, UserLoadRollupORM)
+
+    def add(
+        self, user_id: int, buckets: Dict[str, date], domain_code: str, load: float, seconds: float
+    ) -> None:
+        """Suma una sesion a ``{granularidad: inicio de bucket}`` en un solo upsert."""
+        stmt = pg_insert(UserLoadRollupORM).values(
+            [
+                {
+                    "user_id": user_id,
+                    "granularity": granularity,
+                    "bucket_start": start,
+                    "domain_code": domain_code,
+                    "load": load,
+                    "sessions": 1,
+                    "total_seconds": seconds,
+                    "updated_at": datetime.utcnow(),
+                }
+                for granularity, start in buckets.items()
+            ]
+        )
+        table = UserLoadRollupORM.__table__
+        self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "granularity", "bucket_start", "domain_code"],
+                set_={
+                    "load": table.c.load + stmt.excluded.load,
+                    "sessions": table.c.sessions + stmt.excluded.sessions,
+                    "total_seconds": table.c.total_seconds + stmt.excluded.total_seconds,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+
+    def list_range(self, user_id: int, granularity: str, start: date, end: date) -> List[UserLoadRollupORM]:
+        return (
+            self.session.query(UserLoadRollupORM)
+            .filter(
+                UserLoadRollupORM.user_id == user_id,
+                UserLoadRollupORM.granularity == granularity,
+                UserLoadRollupORM.bucket_start >= start,
+                UserLoadRollupORM.bucket_start <= end,
+            )
+            .order_by(UserLoadRollupORM.bucket_start, UserLoadRollupORM.domain_code)
             .all()
         )
 
@@ -29,3 +154,124 @@ class UserCapacityProfileRepository(BaseRepository):
             .order_by(UserCapacityProfileORM.measured_at.desc())
             .all()
         )
+
+
+class UserSkillTotalsRepository(BaseRepository):
+    """Totales de volumen por (usuario, movimiento). Las escrituras no hacen commit."""
+
+    def __init__(self, session: Session):
+        super().__init__(session, UserSkillTotalsORM)
+
+    def increment(self, user_id: int, increments: Dict[int, Dict[str, float]]) -> Dict[int, Dict[str, float]]:
+        """Suma ``{movement_id: {total_x: inc}}`` en un solo upsert y devuelve los totales resultantes."""
+        if not increments:
+            return {}
+        now = datetime.utcnow()
+        stmt = pg_insert(UserSkillTotalsORM).values(
+            [
+                {
+                    "user_id": user_id,
+                    "movement_id": movement_id,
+                    "updated_at": now,
+                    **{column: inc.get(column) or 0 for column in SKILL_TOTAL_COLUMNS},
+                }
+                for movement_id, inc in increments.items()
+            ]
+        )
+        table = UserSkillTotalsORM.__table__
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "movement_id"],
+            set_={
+                **{column: table.c[column] + stmt.excluded[column] for column in SKILL_TOTAL_COLUMNS},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(table.c.movement_id, *(table.c[column] for column in SKILL_TOTAL_COLUMNS))
+        return {
+            row.movement_id: {column: float(row._mapping[column]) for column in SKILL_TOTAL_COLUMNS}
+            for row in self.session.execute(stmt)
+        }
+
+    def sums(self, user_id: int) -> Dict[str, float]:
+        table = UserSkillTotalsORM.__table__
+        sums = [func.coalesce(func.sum(table.c[column]), 0).label(column) for column in SKILL_TOTAL_COLUMNS]
+        row = self.session.query(*sums).filter(UserSkillTotalsORM.user_id == user_id).one()
+        return {column: float(row._mapping[column]) for column in SKILL_TOTAL_COLUMNS}
+
+
+class UserPRRepository(BaseRepository):
+    """Mejores marcas (user_pr, unica por usuario/movimiento/tipo) e historico de mejoras. No hace commit."""
+
+    def __init__(self, session: Session):
+        super().__init__(session, UserPROM)
+
+    def register_bests(self, user_id: int, candidates: Iterable[Dict[str, Any]]) -> int:
+        """Registra los candidatos que mejoran la marca vigente en una sola sentencia; devuelve cuantos mejoraron.
+
+        ``INSERT ... ON CONFLICT DO UPDATE WHERE <mejor>`` solo devuelve las filas insertadas o mejoradas, y
+        la misma sentencia las copia a user_pr_history junto al valor anterior (leido del mismo snapshot).
+        """
+        best: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        for item in candidates:
+            key = (item["movement_id"], item["pr_type"])
+            # ON CONFLICT no admite dos filas con la misma clave: gana el mejor candidato de la ejecucion
+            if key not in best or pr_is_better(item["pr_type"], float(item["value"]), float(best[key]["value"])):
+                best[key] = item
+        if not best:
+            return 0
+        now = datetime.utcnow()
+        table = UserPROM.__table__
+        history = UserPRHistoryORM.__table__
+        stmt = pg_insert(UserPROM).values(
+            [
+                {
+                    "user_id": user_id,
+                    "movement_id": movement_id,
+                    "pr_type": pr_type,
+                    "value": item["value"],
+                    "unit": item.get("unit") or ("s" if pr_type in PR_LOWER_IS_BETTER else None),
+                    "achieved_at": now,
+                }
+                for (movement_id, pr_type), item in best.items()
+            ]
+        )
+        excluded = stmt.excluded
+        improved = (
+            stmt.on_conflict_do_update(
+                constraint="uq_user_pr_unique",
+                set_={
+                    "value": excluded.value,
+                    "unit": func.coalesce(excluded.unit, table.c.unit),
+                    "achieved_at": excluded.achieved_at,
+                },
+                where=case(
+                    (excluded.pr_type.in_(PR_LOWER_IS_BETTER), excluded.value < table.c.value),
+                    else_=excluded.value > table.c.value,
+                ),
+            )
+            .returning(table.c.user_id, table.c.movement_id, table.c.pr_type, table.c.value, table.c.unit, table.c.achieved_at)
+            .cte("improved")
+        )
+        previous = select(table.c.movement_id, table.c.pr_type, table.c.value).where(table.c.user_id == user_id).cte("previous")
+        record = (
+            insert(history)
+            .from_select(
+                ["user_id", "movement_id", "pr_type", "value", "unit", "achieved_at", "previous_value"],
+                select(
+                    improved.c.user_id,
+                    improved.c.movement_id,
+                    improved.c.pr_type,
+                    improved.c.value,
+                    improved.c.unit,
+                    improved.c.achieved_at,
+                    previous.c.value,
+                ).select_from(
+                    improved.outerjoin(
+                        previous,
+                        and_(previous.c.movement_id == improved.c.movement_id, previous.c.pr_type == improved.c.pr_type),
+                    )
+                ),
+            )
+            .add_cte(improved, previous)
+            .returning(history.c.id)
+        )
+        return len(self.session.execute(record).all())
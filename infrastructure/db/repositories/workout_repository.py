@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import List, Optional, Set
 
-from sqlalchemy import or_
+from sqlalchemy import insert, or_
 from sqlalchemy.orm import Session, joinedload
 
 from domain.models.enums import EnergyDomain, IntensityLevel, MuscleGroup
@@ -26,15 +26,49 @@ from infrastructure.db.models import (
     WorkoutORM,
     WorkoutStatsORM,
 )
+from infrastructure.db.lookup_registry import lookup_registry
 from .base import BaseRepository
 
 
+METADATA_FIELDS = {
+    "volume_total",
+    "work_rest_ratio",
+    "dominant_stimulus",
+    "load_type",
+    "athlete_profile_desc",
+    "target_athlete_desc",
+    "pacing_tip",
+    "pacing_detail",
+    "break_tip",
+    "rx_variant",
+    "scaled_variant",
+    "ai_observation",
+    "session_load",
+    "session_feel",
+    "extra_attributes_json",
+}
+STATS_FIELDS = {"estimated_difficulty"}
+# Derivados de los resultados (WorkoutStatsRepository.apply_result_change): se ignoran en el payload
+DERIVED_STATS_FIELDS = {"avg_time_seconds", "avg_rating", "avg_difficulty", "rating_count"}
+# Postgres admite 65535 parametros por sentencia; margen para tablas anchas
+BULK_CHUNK_ROWS = 1000
+CHILD_FIELDS = ("level_times", "capacities", "hyrox_stations", "muscles", "equipment_ids", "similar_workout_ids", "blocks")
+
+
+def _chunks(rows: list, size: int = BULK_CHUNK_ROWS):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _present(payload: dict, fields) -> dict:
+    """Saca ``fields`` del payload dejando fuera los ausentes (None): sin NULL explicito, la
+    columna toma su default de servidor y los JSONB no acaban como 'null'."""
+    values = {key: payload.pop(key, None) for key in sorted(fields)}
+    return {key: value for key, value in values.items() if value is not None}
+
+
 def _lookup_id(session: Session, model, code):
-    if code is None:
-        return None
-    code_value = getattr(code, "value", code)
-    row = session.query(model).filter(model.code == code_value).first()
-    return row.id if row else None
+    return lookup_registry.id_for(session, model, code)
 
 
 class WorkoutRepository(BaseRepository):
@@ -70,27 +104,10 @@ class WorkoutRepository(BaseRepository):
         equipment_ids = payload.pop("equipment_ids", [])
         similar_ids = payload.pop("similar_workout_ids", [])
 
-        metadata_fields = {
-            "volume_total",
-            "work_rest_ratio",
-            "dominant_stimulus",
-            "load_type",
-            "athlete_profile_desc",
-            "target_athlete_desc",
-            "pacing_tip",
-            "pacing_detail",
-            "break_tip",
-            "rx_variant",
-            "scaled_variant",
-            "ai_observation",
-            "session_load",
-            "session_feel",
-            "extra_attributes_json",
-        }
-        stats_fields = {"estimated_difficulty", "avg_time_seconds", "avg_rating", "avg_difficulty", "rating_count"}
-
-        metadata_payload = {k: payload.pop(k) for k in list(payload.keys()) if k in metadata_fields}
-        stats_payload = {k: payload.pop(k) for k in list(payload.keys()) if k in stats_fields}
+        metadata_payload = _present(payload, METADATA_FIELDS)
+        stats_payload = _present(payload, STATS_FIELDS)
+        for key in DERIVED_STATS_FIELDS:
+            payload.pop(key, None)
 
         self._attach_lookup_ids(payload)
 
@@ -114,27 +131,10 @@ class WorkoutRepository(BaseRepository):
         equipment_ids = payload.pop("equipment_ids", None)
         similar_ids = payload.pop("similar_workout_ids", None)
 
-        metadata_fields = {
-            "volume_total",
-            "work_rest_ratio",
-            "dominant_stimulus",
-            "load_type",
-            "athlete_profile_desc",
-            "target_athlete_desc",
-            "pacing_tip",
-            "pacing_detail",
-            "break_tip",
-            "rx_variant",
-            "scaled_variant",
-            "ai_observation",
-            "session_load",
-            "session_feel",
-            "extra_attributes_json",
-        }
-        stats_fields = {"estimated_difficulty", "avg_time_seconds", "avg_rating", "avg_difficulty", "rating_count"}
-
-        metadata_payload = {k: payload.pop(k) for k in list(payload.keys()) if k in metadata_fields}
-        stats_payload = {k: payload.pop(k) for k in list(payload.keys()) if k in stats_fields}
+        metadata_payload = {k: payload.pop(k) for k in list(payload.keys()) if k in METADATA_FIELDS}
+        stats_payload = {k: payload.pop(k) for k in list(payload.keys()) if k in STATS_FIELDS}
+        for key in DERIVED_STATS_FIELDS:
+            payload.pop(key, None)
 
         self._attach_lookup_ids(payload)
 
@@ -244,13 +244,154 @@ class WorkoutRepository(BaseRepository):
             for sid in similar_ids:
                 workout.similar_from.append(SimilarWorkoutORM(workout_id=workout.id, similar_workout_id=sid))
 
+    def bulk_insert_with_relations(self, payloads: List[dict]) -> List[int]:
+        """Inserta workouts completos (metadata, stats, bloques, movimientos y enlaces) con una
+        sentencia multi-fila por tabla. No hace commit: el llamador confirma el lote."""
+        workout_rows, metadata_rows, stats_rows, children = [], [], [], []
+        for payload in payloads:
+            payload = dict(payload)
+            children.append({key: payload.pop(key, None) or [] for key in CHILD_FIELDS})
+            metadata_rows.append(_present(payload, METADATA_FIELDS))
+            stats_rows.append(_present(payload, STATS_FIELDS))
+            for key in DERIVED_STATS_FIELDS:
+                payload.pop(key, None)
+            self._attach_lookup_ids(payload)
+            workout_rows.append(payload)
+
+        workout_ids = self._insert_rows(WorkoutORM, workout_rows, returning=WorkoutORM.__table__.c.id)
+        for workout_id, meta, stats in zip(workout_ids, metadata_rows, stats_rows):
+            meta["workout_id"] = workout_id
+            stats["workout_id"] = workout_id
+        self._insert_rows(WorkoutMetadataORM, metadata_rows)
+        self._insert_rows(WorkoutStatsORM, stats_rows)
+
+        all_equipment = [eq for kids in children for eq in kids["equipment_ids"]]
+        known_equipment = self.existing_ids(EquipmentORM, all_equipment)
+        level_rows, capacity_rows, station_rows, muscle_rows, equipment_rows = {}, {}, {}, {}, {}
+        similar_rows, block_rows, block_movements = {}, [], []
+        for workout_id, kids in zip(workout_ids, children):
+            for lt in kids["level_times"]:
+                level_id = _lookup_id(self.session, AthleteLevelORM, lt["athlete_level"])
+                if level_id:
+                    level_rows[(workout_id, level_id)] = {
+                        "workout_id": workout_id,
+                        "athlete_level_id": level_id,
+                        "time_minutes": lt["time_minutes"],
+                        "time_range": lt["time_range"],
+                    }
+            for cap in kids["capacities"]:
+                cap_id = _lookup_id(self.session, PhysicalCapacityORM, cap["capacity"])
+                if cap_id:
+                    capacity_rows[(workout_id, cap_id)] = {
+                        "workout_id": workout_id,
+                        "capacity_id": cap_id,
+                        "value": cap["value"],
+                        "note": cap["note"],
+                    }
+            for hyrox in kids["hyrox_stations"]:
+                station_id = _lookup_id(self.session, HyroxStationORM, hyrox["station"])
+                if station_id:
+                    station_rows[(workout_id, station_id)] = {
+                        "workout_id": workout_id,
+                        "station_id": station_id,
+                        "transfer_pct": hyrox["transfer_pct"],
+                    }
+            for muscle in kids["muscles"]:
+                muscle_id = _lookup_id(self.session, MuscleGroupORM, muscle)
+                if muscle_id:
+                    muscle_rows[(workout_id, muscle_id)] = {"workout_id": workout_id, "muscle_group_id": muscle_id}
+            for eq_id in kids["equipment_ids"]:
+                if eq_id in known_equipment:
+                    equipment_rows[(workout_id, eq_id)] = {"workout_id": workout_id, "equipment_id": eq_id}
+            for sid in kids["similar_workout_ids"]:
+                if sid == workout_id:
+                    continue
+                # ck_similar_ordering exige workout_id < similar_workout_id
+                pair = (min(workout_id, sid), max(workout_id, sid))
+                similar_rows[pair] = {"workout_id": pair[0], "similar_workout_id": pair[1]}
+            for b_idx, block in enumerate(kids["blocks"]):
+                block_rows.append(
+                    {
+                        "workout_id": workout_id,
+                        "position": block.get("position") or b_idx + 1,
+                        "block_type": block.get("block_type"),
+                        "title": block.get("title"),
+                        "description": block.get("description"),
+                        "duration_seconds": block.get("duration_seconds"),
+                        "rounds": block.get("rounds"),
+                        "notes": block.get("notes"),
+                    }
+                )
+                block_movements.append(block.get("movements") or [])
+
+        self._insert_rows(WorkoutLevelTimeORM, list(level_rows.values()))
+        self._insert_rows(WorkoutCapacityORM, list(capacity_rows.values()))
+        self._insert_rows(WorkoutHyroxStationORM, list(station_rows.values()))
+        self._insert_rows(WorkoutMuscleORM, list(muscle_rows.values()))
+        self._insert_rows(WorkoutEquipmentORM, list(equipment_rows.values()))
+        self._insert_rows(SimilarWorkoutORM, list(similar_rows.values()))
+
+        block_ids = self._insert_rows(WorkoutBlockORM, block_rows, returning=WorkoutBlockORM.__table__.c.id)
+        movement_rows = [
+            {
+                "workout_block_id": block_id,
+                "movement_id": mv["movement_id"],
+                "position": mv.get("position") or m_idx + 1,
+                "reps": mv.get("reps"),
+                "load": mv.get("load"),
+                "load_unit": mv.get("load_unit"),
+                "distance_meters": mv.get("distance_meters"),
+                "duration_seconds": mv.get("duration_seconds"),
+                "calories": mv.get("calories"),
+            }
+            for block_id, movements in zip(block_ids, block_movements)
+            for m_idx, mv in enumerate(movements)
+        ]
+        self._insert_rows(WorkoutBlockMovementORM, movement_rows)
+        return workout_ids
+
+    def existing_ids(self, model, ids) -> Set[int]:
+        ids = {i for i in ids if i is not None}
+        if not ids:
+            return set()
+        return {row_id for (row_id,) in self.session.query(model.id).filter(model.id.in_(ids)).all()}
+
+    def _insert_rows(self, model, rows: List[dict], returning=None) -> list:
+        """INSERT multi-fila troceado. Con ``returning`` usa insertmanyvalues ordenado por parametro."""
+        if not rows:
+            return []
+        table = model.__table__
+        if returning is not None:
+            stmt = insert(table).returning(returning, sort_by_parameter_order=True)
+            return list(self.session.execute(stmt, rows).scalars())
+        # un VALUES multi-fila necesita las mismas columnas en todas las filas: agrupar por claves
+        groups: dict = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        for group in groups.values():
+            for chunk in _chunks(group):
+                self.session.execute(insert(table).values(chunk))
+        return []
+
     def get_similar_workouts(self, workout_id: int) -> List[WorkoutORM]:
-        similar_rel = self.session.query(SimilarWorkoutORM).filter(SimilarWorkoutORM.workout_id == workout_id).all()
-        ids = [rel.similar_workout_id for rel in similar_rel]
+        # Los pares se guardan ordenados (workout_id < similar_workout_id): hay que mirar ambos lados
+        similar_rel = (
+            self.session.query(SimilarWorkoutORM)
+            .filter(or_(SimilarWorkoutORM.workout_id == workout_id, SimilarWorkoutORM.similar_workout_id == workout_id))
+            .all()
+        )
+        ids = [rel.similar_workout_id if rel.workout_id == workout_id else rel.workout_id for rel in similar_rel]
         if not ids:
             return []
         return self.session.query(WorkoutORM).filter(WorkoutORM.id.in_(ids)).all()
 
+    def get_many(self, workout_ids: List[int]) -> List[WorkoutORM]:
+        """Workouts en el orden de ``workout_ids`` (una sola consulta IN)."""
+        if not workout_ids:
+            return []
+        found = {w.id: w for w in self.session.query(WorkoutORM).filter(WorkoutORM.id.in_(workout_ids)).all()}
+        return [found[wid] for wid in workout_ids if wid in found]
+
     def get_with_structure(self, workout_id: int) -> WorkoutORM | None:
         return (
             self.session.query(WorkoutORM)
@@ -0,0 +1,93 @@
+import math
+from typing import Optional
+
+from sqlalchemy import Numeric, SmallInteger, case, cast, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from infrastructure.db.models import WorkoutResultORM, WorkoutStatsORM
+from .base import BaseRepository
+
+
+def _contribution(result: Optional[WorkoutResultORM], sign: int) -> dict:
+    if result is None:
+        return {}
+    delta = {
+        "result_count": sign,
+        "time_sum": sign * int(result.time_seconds or 0),
+        "time_sq_sum": sign * int(result.time_seconds or 0) ** 2,
+    }
+    if result.rating is not None:
+        delta.update(rating_count=sign, rating_sum=sign * result.rating, rating_sq_sum=sign * result.rating**2)
+    if result.difficulty is not None:
+        delta.update(
+            difficulty_count=sign,
+            difficulty_sum=sign * result.difficulty,
+            difficulty_sq_sum=sign * result.difficulty**2,
+        )
+    return delta
+
+
+def _merge(*deltas: dict) -> dict:
+    merged: dict = {}
+    for delta in deltas:
+        for key, value in delta.items():
+            merged[key] = merged.get(key, 0) + value
+    return {key: value for key, value in merged.items() if value}
+
+
+def time_stddev_seconds(stats: Optional[WorkoutStatsORM]) -> Optional[float]:
+    """Desviacion tipica poblacional del tiempo a partir de n, suma y suma de cuadrados."""
+    if not stats or not stats.result_count:
+        return None
+    n = stats.result_count
+    mean = stats.time_sum / n
+    variance = max(stats.time_sq_sum / n - mean * mean, 0.0)
+    return round(math.sqrt(variance), 2)
+
+
+class WorkoutStatsRepository(BaseRepository):
+    """Mantiene workout_stats de forma incremental (O(1) por escritura de resultado).
+
+    No hace commit: el llamador confirma junto con el insert/update/delete del resultado.
+    """
+
+    def __init__(self, session: Session):
+        super().__init__(session, WorkoutStatsORM)
+
+    def apply_result_change(
+        self,
+        workout_id: int,
+        added: Optional[WorkoutResultORM] = None,
+        removed: Optional[WorkoutResultORM] = None,
+    ) -> None:
+        delta = _merge(_contribution(added, 1), _contribution(removed, -1))
+        if not delta:
+            return
+        self.session.execute(
+            pg_insert(WorkoutStatsORM)
+            .values(workout_id=workout_id, rating_count=0)
+            .on_conflict_do_nothing(index_elements=["workout_id"])
+        )
+        table = WorkoutStatsORM.__table__
+        c = table.c
+
+        def total(column: str):
+            return func.coalesce(c[column], 0) + delta.get(column, 0)
+
+        values = {column: total(column) for column in delta}
+        n_results, n_rating, n_difficulty = total("result_count"), total("rating_count"), total("difficulty_count")
+        # Las medias se recalculan en la misma sentencia; sin muestras quedan a NULL
+        values["avg_time_seconds"] = case(
+            (n_results > 0, cast(func.round(cast(total("time_sum"), Numeric) / n_results), SmallInteger)),
+            else_=None,
+        )
+        values["avg_rating"] = case(
+            (n_rating > 0, func.round(cast(total("rating_sum"), Numeric) / n_rating, 2)),
+            else_=None,
+        )
+        values["avg_difficulty"] = case(
+            (n_difficulty > 0, func.round(cast(total("difficulty_sum"), Numeric) / n_difficulty, 1)),
+            else_=None,
+        )
+        self.session.execute(update(table).where(c.workout_id == workout_id).values(**values))
@@ -1,9 +1,14 @@
-﻿import os
+﻿import argparse
+import logging
+import os
 from datetime import date, datetime, timedelta
 
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
 
 from infrastructure.auth.security import hash_password
+from infrastructure.db.lookup_registry import lookup_registry
 from infrastructure.db.models import (
     AchievementORM,
     AthleteLevelORM,
@@ -17,6 +22,7 @@ from infrastructure.db.models import (
     MovementORM,
     MuscleGroupORM,
     PhysicalCapacityORM,
+    SeedStateORM,
     TrainingPlanDayORM,
     TrainingPlanORM,
     UserAchievementORM,
@@ -28,7 +34,6 @@ from infrastructure.db.models import (
     UserPROM,
     UserProgressORM,
     UserSkillORM,
-    UserTrainingLoadORM,
     WorkoutBlockMovementORM,
     WorkoutBlockORM,
     WorkoutCapacityORM,
@@ -43,13 +48,40 @@ from infrastructure.db.models import (
     WorkoutStatsORM,
 )
 
+logger = logging.getLogger("db.seed")
+
+# Subir este numero cuando cambie el catalogo base (lookups, logros, misiones).
+CATALOG_SEED_VERSION = 1
+CATALOG_SEED_NAME = "catalog"
+SEED_BATCH_SIZE = 500
+# Clave fija para pg_advisory_xact_lock: evita que varios workers/replicas sembren a la vez.
+SEED_LOCK_KEY = 730_412_026
+
+# Arreglo de codificaciones malas anteriores (utf-8 mal decodificado como latin1)
+BAD_TO_GOOD_CODES = {
+    "AerÃƒÂ³bico": "Aeróbico",
+    "AnaerÃƒÂ³bico": "Anaeróbico",
+    "GimnÃ¡sticos": "Gimnásticos",
+}
+
+
+def _chunks(rows, size=SEED_BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _bulk_insert_ignore(conn, model, rows, conflict_columns=("code",)):
+    """INSERT ... ON CONFLICT DO NOTHING en lotes. Devuelve las filas realmente insertadas."""
+    inserted = 0
+    for batch in _chunks(list(rows)):
+        stmt = pg_insert(model.__table__).values(batch).on_conflict_do_nothing(index_elements=list(conflict_columns))
+        result = conn.execute(stmt)
+        inserted += max(result.rowcount or 0, 0)
+    return inserted
+
 
 def _ensure_lookup(session, model, records):
-    for rec in records:
-        existing = session.query(model).filter_by(code=rec["code"]).first()
-        if not existing:
-            session.add(model(**rec))
-    session.flush()
+    _bulk_insert_ignore(session, model, records)
 
 
 def _xp_levels():
@@ -72,6 +104,65 @@ def _xp_levels():
     return levels
 
 
+def _catalog_lookups():
+    intensity_levels = [
+        {"code": "Baja", "name": "Baja", "sort_order": 1},
+        {"code": "Media", "name": "Media", "sort_order": 2},
+        {"code": "Alta", "name": "Alta", "sort_order": 3},
+    ]
+    energy_domains = [
+        {"code": "Aeróbico", "name": "Aeróbico", "description": None},
+        {"code": "Anaeróbico", "name": "Anaeróbico", "description": None},
+        {"code": "Mixto", "name": "Mixto", "description": None},
+    ]
+    physical_capacities = [
+        {"code": "Fuerza", "name": "Fuerza", "description": None},
+        {"code": "Resistencia", "name": "Resistencia", "description": None},
+        {"code": "Velocidad", "name": "Velocidad", "description": None},
+        {"code": "Gimnásticos", "name": "Gimnásticos", "description": None},
+        {"code": "Metcon", "name": "Metcon", "description": None},
+        {"code": "Carga muscular", "name": "Carga muscular", "description": None},
+    ]
+    muscle_groups = [
+        {"code": "Piernas", "name": "Piernas", "description": None},
+        {"code": "Core", "name": "Core", "description": None},
+        {"code": "Hombros", "name": "Hombros", "description": None},
+        {"code": "Posterior", "name": "Posterior", "description": None},
+        {"code": "Grip", "name": "Grip", "description": None},
+        {"code": "Pecho", "name": "Pecho", "description": None},
+        {"code": "Brazos", "name": "Brazos", "description": None},
+    ]
+    hyrox_stations = [
+        {"code": "SkiErg", "name": "SkiErg", "description": None},
+        {"code": "Sled Push", "name": "Sled Push", "description": None},
+        {"code": "Sled Pull", "name": "Sled Pull", "description": None},
+        {"code": "Farmers Carry", "name": "Farmers Carry", "description": None},
+        {"code": "Burpee Broad Jump", "name": "Burpee Broad Jump", "description": None},
+        {"code": "Row", "name": "Row", "description": None},
+        {"code": "Sandbag Lunges", "name": "Sandbag Lunges", "description": None},
+        {"code": "Wall Balls", "name": "Wall Balls", "description": None},
+    ]
+    return [
+        (AthleteLevelORM, _xp_levels()),
+        (IntensityLevelORM, intensity_levels),
+        (EnergyDomainORM, energy_domains),
+        (PhysicalCapacityORM, physical_capacities),
+        (MuscleGroupORM, muscle_groups),
+        (HyroxStationORM, hyrox_stations),
+    ]
+
+
+def _fix_bad_encodings(conn):
+    for model in (EnergyDomainORM, PhysicalCapacityORM):
+        table = model.__table__
+        for bad, good in BAD_TO_GOOD_CODES.items():
+            # Si ya existe el codigo bueno, el malo se deja para no violar uq_*_code.
+            exists_good = conn.execute(table.select().with_only_columns(table.c.id).where(table.c.code == good)).first()
+            if exists_good:
+                continue
+            conn.execute(table.update().where(table.c.code == bad).values(code=good, name=good))
+
+
 def _seed_achievements(session):
     achievements = [
         {"code": "LEVEL_5", "name": "Nivel 5 alcanzado", "category": "progression", "xp_reward": 100},
@@ -80,10 +171,7 @@ def _seed_achievements(session):
         {"code": "FIRST_PR", "name": "Primer PR registrado", "category": "pr", "xp_reward": 50},
         {"code": "HYROX_TRANSFER", "name": "Transfer HYROX alto", "category": "hyrox", "xp_reward": 150},
     ]
-    for ach in achievements:
-        if not session.query(AchievementORM).filter_by(code=ach["code"]).first():
-            session.add(AchievementORM(**ach))
-    session.flush()
+    _bulk_insert_ignore(session, AchievementORM, achievements)
 
 
 def _seed_missions(session):
@@ -110,15 +198,66 @@ def _seed_missions(session):
             "condition_json": {"type": "pr", "target": 1, "window": "week"},
         },
     ]
-    for mission in missions:
-        exists = (
-            session.query(MissionORM)
-            .filter(MissionORM.type == mission["type"], MissionORM.title == mission["title"])
-            .first()
-        )
-        if not exists:
-            session.add(MissionORM(**mission))
-    session.flush()
+    # missions no tiene clave unica: una sola lectura de (type, title) y un insert multi-fila.
+    table = MissionORM.__table__
+    existing = {(row.type, row.title) for row in session.execute(table.select().with_only_columns(table.c.type, table.c.title))}
+    missing = [m for m in missions if (m["type"], m["title"]) not in existing]
+    if missing:
+        session.execute(table.insert().values(missing))
+
+
+def seed_catalog(conn):
+    """
+    Siembra el catalogo base (lookups, logros y misiones) con inserts masivos idempotentes.
+    Acepta una Session o una Connection (se usa tambien desde Alembic).
+    """
+    _fix_bad_encodings(conn)
+    for model, records in _catalog_lookups():
+        _ensure_lookup(conn, model, records)
+    _seed_achievements(conn)
+    _seed_missions(conn)
+
+
+def record_seed_version(conn, version=CATALOG_SEED_VERSION, name=CATALOG_SEED_NAME):
+    stmt = pg_insert(SeedStateORM.__table__).values(name=name, version=version, applied_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"version": stmt.excluded.version, "applied_at": stmt.excluded.applied_at},
+    )
+    conn.execute(stmt)
+
+
+def seed_version(session, name=CATALOG_SEED_NAME):
+    """Version sembrada o None si la tabla seed_state aun no existe / no hay registro."""
+    try:
+        row = session.execute(
+            SeedStateORM.__table__.select()
+            .with_only_columns(SeedStateORM.version)
+            .where(SeedStateORM.name == name)
+        ).first()
+    except SQLAlchemyError:
+        session.rollback()
+        return None
+    return row.version if row else None
+
+
+def check_seed_version(session) -> bool:
+    """
+    Chequeo barato para el arranque: una sola consulta a seed_state.
+    Solo siembra si SEED_ON_STARTUP=true; por defecto se limita a avisar.
+    """
+    current = seed_version(session)
+    if current is not None and current >= CATALOG_SEED_VERSION:
+        return True
+    logger.warning(
+        "[seed] catalog seed version %s < %s; run `python -m infrastructure.db.seed`",
+        current,
+        CATALOG_SEED_VERSION,
+    )
+    if os.getenv("SEED_ON_STARTUP", "false").lower() == "true":
+        run_seed(session, demo=False)
+        return True
+    return False
 
 
 def ensure_seed_user(session, reset: bool = False):
@@ -175,7 +314,28 @@ def ensure_seed_user(session, reset: bool = False):
     print("[seed] Seed user ensured (created)")
 
 
+def run_seed(session, demo: bool = True):
+    """
+    Punto de entrada del comando de seed. Serializa workers con un advisory lock de
+    transaccion y registra la version sembrada en seed_state.
+    """
+    if not inspect(session.bind).has_table(UserORM.__tablename__):
+        logger.warning("[seed] schema not migrated; run `alembic upgrade head` first")
+        return
+    session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SEED_LOCK_KEY})
+    if demo:
+        seed_data(session)
+    else:
+        seed_catalog(session)
+        ensure_seed_user(session, os.getenv("RESET_SEED", "false").lower() == "true")
+    record_seed_version(session)
+    session.commit()
+    # El catalogo se inserta con sentencias core (sin eventos ORM): invalidar a mano
+    lookup_registry.invalidate()
+
+
 def seed_data(session):
+    """Dataset demo. Solo hace flush: el commit unico lo hace run_seed, que mantiene el advisory lock."""
     inspector = inspect(session.bind)
     # Si no existen tablas base (ej: users), salimos sin romper el arranque.
     if not inspector.has_table(UserORM.__tablename__):
@@ -187,73 +347,11 @@ def seed_data(session):
     seed_emails = {seed_email, *legacy_seed_emails}
     had_non_seed_users_before = session.query(UserORM).filter(~UserORM.email.in_(seed_emails)).count() > 0
 
-    athlete_levels = _xp_levels()
-    intensity_levels = [
-        {"code": "Baja", "name": "Baja", "sort_order": 1},
-        {"code": "Media", "name": "Media", "sort_order": 2},
-        {"code": "Alta", "name": "Alta", "sort_order": 3},
-    ]
-    energy_domains = [
-        {"code": "Aeróbico", "name": "Aeróbico", "description": None},
-        {"code": "Anaeróbico", "name": "Anaeróbico", "description": None},
-        {"code": "Mixto", "name": "Mixto", "description": None},
-    ]
-    physical_capacities = [
-        {"code": "Fuerza", "name": "Fuerza", "description": None},
-        {"code": "Resistencia", "name": "Resistencia", "description": None},
-        {"code": "Velocidad", "name": "Velocidad", "description": None},
-        {"code": "Gimnásticos", "name": "Gimnásticos", "description": None},
-        {"code": "Metcon", "name": "Metcon", "description": None},
-        {"code": "Carga muscular", "name": "Carga muscular", "description": None},
-    ]
-
-    # Arreglo de codificaciones malas anteriores (utf-8 mal decodificado como latin1)
-    bad_to_good = {
-        "AerÃƒÂ³bico": "Aeróbico",
-        "AnaerÃƒÂ³bico": "Anaeróbico",
-        "GimnÃ¡sticos": "Gimnásticos",
-    }
-    for bad, good in bad_to_good.items():
-        row = session.query(EnergyDomainORM).filter_by(code=bad).first()
-        if row:
-            row.code = good
-            row.name = good
-    row = session.query(PhysicalCapacityORM).filter_by(code="GimnÃ¡sticos").first()
-    if row:
-        row.code = "Gimnásticos"
-        row.name = "Gimnásticos"
-    muscle_groups = [
-        {"code": "Piernas", "name": "Piernas", "description": None},
-        {"code": "Core", "name": "Core", "description": None},
-        {"code": "Hombros", "name": "Hombros", "description": None},
-        {"code": "Posterior", "name": "Posterior", "description": None},
-        {"code": "Grip", "name": "Grip", "description": None},
-        {"code": "Pecho", "name": "Pecho", "description": None},
-        {"code": "Brazos", "name": "Brazos", "description": None},
-    ]
-    hyrox_stations = [
-        {"code": "SkiErg", "name": "SkiErg", "description": None},
-        {"code": "Sled Push", "name": "Sled Push", "description": None},
-        {"code": "Sled Pull", "name": "Sled Pull", "description": None},
-        {"code": "Farmers Carry", "name": "Farmers Carry", "description": None},
-        {"code": "Burpee Broad Jump", "name": "Burpee Broad Jump", "description": None},
-        {"code": "Row", "name": "Row", "description": None},
-        {"code": "Sandbag Lunges", "name": "Sandbag Lunges", "description": None},
-        {"code": "Wall Balls", "name": "Wall Balls", "description": None},
-    ]
-
-    _ensure_lookup(session, AthleteLevelORM, athlete_levels)
-    _ensure_lookup(session, IntensityLevelORM, intensity_levels)
-    _ensure_lookup(session, EnergyDomainORM, energy_domains)
-    _ensure_lookup(session, PhysicalCapacityORM, physical_capacities)
-    _ensure_lookup(session, MuscleGroupORM, muscle_groups)
-    _ensure_lookup(session, HyroxStationORM, hyrox_stations)
-    _seed_achievements(session)
-    _seed_missions(session)
+    seed_catalog(session)
     ensure_seed_user(session, reset_seed)
+    session.flush()
 
     if had_non_seed_users_before:
-        session.commit()
         return
 
     def id_for(model, code):
@@ -1794,21 +1892,7 @@ def seed_data(session):
     )
 
 
-    # Training load last 5 days
     today = date.today()
-    loads = []
-    for i, vals in enumerate([(320, 300, 1.07), (340, 305, 1.11), (360, 310, 1.16), (310, 300, 1.03), (295, 298, 0.99)]):
-        loads.append(
-            UserTrainingLoadORM(
-                user_id=user.id,
-                load_date=today - timedelta(days=i),
-                acute_load=vals[0],
-                chronic_load=vals[1],
-                load_ratio=vals[2],
-                notes="Semana demo",
-            )
-        )
-    session.add_all(loads)
 
     # Capacity profile
     session.add_all(
@@ -1909,17 +1993,50 @@ def seed_data(session):
         executions.append(exec_row)
     session.add_all(exec_blocks)
 
+    # Carga de entrenamiento: las ejecuciones demo pasan por el mismo servicio que submit_result
+    # (estado EWMA, foto diaria y rollups), de la mas antigua a la mas reciente
+    from application.services.training_load_service import TrainingLoadService
+    from domain.services.training_load import session_load
+
+    load_service = TrainingLoadService(session)
+    for exec_row in reversed(executions):
+        load_service.record_session(
+            user.id,
+            session_load(exec_row.total_time_seconds),
+            on_date=exec_row.executed_at.date(),
+            notes="Sesion demo",
+            seconds=exec_row.total_time_seconds,
+            domain_code=exec_row.workout.domain.code if exec_row.workout.domain else None,
+        )
+
     # Event demo (solo si existe tabla events)
     try:
         if inspector.has_table("events"):
-            event = EventORM(name="HYROX Madrid", date=today, location="Madrid", type="HYROX")
-            session.add(event)
-            session.flush()
-            session.add(UserEventORM(user_id=user.id, event_id=event.id))
+            # savepoint: un fallo aqui no deshace el resto del seed ni suelta el advisory lock
+            with session.begin_nested():
+                event = EventORM(name="HYROX Madrid", date=today, location="Madrid", type="HYROX")
+                session.add(event)
+                session.flush()
+                session.add(UserEventORM(user_id=user.id, event_id=event.id))
     except Exception:
         # tabla eliminada por migraciÃ³n: ignorar silenciosamente para no romper seed
-        session.rollback()
+        pass
 
-    session.commit()
+    session.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed idempotente del catalogo base y datos demo de HybridForce.")
+    parser.add_argument("--skip-demo", action="store_true", help="Solo catalogo y usuario seed, sin dataset demo.")
+    args = parser.parse_args(argv)
+
+    from infrastructure.db.session import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as session:
+        run_seed(session, demo=not args.skip_demo)
+    logger.info("[seed] done (catalog version %s)", CATALOG_SEED_VERSION)
 
 
+if __name__ == "__main__":
+    main()
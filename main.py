@@ -3,16 +3,24 @@ import os
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
+from adapters.api.query_metrics import QueryMetricsMiddleware
 from adapters.api.routes import api_router
 from adapters.api.routes.workouts import analysis_router
 from adapters.api.routes.auth import router as auth_router
 from infrastructure.db.session import SessionLocal
-from infrastructure.db.seed import seed_data
+from infrastructure.db.seed import check_seed_version
 
 load_dotenv()
 
-app = FastAPI(title=os.getenv("APP_NAME", "HybridForce API"))
+# orjson serializa los listados grandes (workouts, analisis, catalogos) varias veces mas rapido
+app = FastAPI(title=os.getenv("APP_NAME", "HybridForce API"), default_response_class=ORJSONResponse)
+
+# Por debajo de ~1 KB la cabecera y el coste de CPU de gzip no compensan
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
 
 
 def _get_origins():
@@ -29,12 +37,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+# la ultima en registrarse es la mas externa: mide la peticion completa
+app.add_middleware(QueryMetricsMiddleware)
 
 
 @app.on_event("startup")
 def on_startup():
     with SessionLocal() as session:
-        seed_data(session)
+        check_seed_version(session)
 
 
 @app.get("/")
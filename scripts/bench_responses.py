@@ -0,0 +1,69 @@
+"""Benchmark: bytes en la red (sin comprimir vs gzip) y CPU de serializacion (json vs orjson).
+
+Uso: ``PYTHONPATH=. python scripts/bench_responses.py [--email ... --password ...] [--path /workouts/ ...]``
+Necesita ``DATABASE_URL`` con datos (seed). Llama a la API en proceso con TestClient.
+"""
+
+import argparse
+import time
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+
+from main import app
+
+DEFAULT_PATHS = [
+    "/workouts/",
+    "/workouts/stats",
+    "/workouts/1/structure",
+    "/workouts/1/analysis",
+    "/movements/",
+    "/lookups/",
+    "/athlete/profile",
+]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--email", default="seed@hybridforce.com")
+    parser.add_argument("--password", default="changeme")
+    parser.add_argument("--path", action="append", help="Endpoint GET a medir (repetible).")
+    parser.add_argument("--repeat", type=int, default=200, help="Se reporta el mejor de N renders.")
+    args = parser.parse_args(argv)
+
+    client = TestClient(app)
+    login = client.post("/auth/login", json={"email": args.email, "password": args.password})
+    if login.status_code != 200:
+        raise SystemExit(f"login failed: {login.status_code} {login.text}")
+
+    for path in args.path or DEFAULT_PATHS:
+        raw = client.get(path, headers={"Accept-Encoding": "identity"})
+        if raw.status_code != 200:
+            print(f"{path}: status={raw.status_code}, omitido")
+            continue
+        gzipped = client.get(path, headers={"Accept-Encoding": "gzip"})
+        # httpx descomprime el cuerpo: el tamano en la red es el Content-Length de la respuesta
+        wire = int(gzipped.headers.get("content-length", len(gzipped.content)))
+        encoding = gzipped.headers.get("content-encoding", "identity")
+
+        content = raw.json()
+        json_s = _best_of(lambda: JSONResponse(content), args.repeat)
+        orjson_s = _best_of(lambda: ORJSONResponse(content), args.repeat)
+        print(
+            f"{path}: raw={len(raw.content)}B wire={wire}B ({encoding}) "
+            f"json={json_s * 1e6:.0f}us orjson={orjson_s * 1e6:.0f}us speedup={json_s / orjson_s:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark: analyze_workout escalar vs analyze_workouts_batch (NumPy).
+
+Uso: ``PYTHONPATH=. python scripts/bench_workout_analysis.py [--count 10000]``
+Genera workouts sinteticos, comprueba que ambos caminos dan el mismo resultado y mide tiempos.
+"""
+
+import argparse
+import random
+import time
+
+from domain.models import (
+    EnergyDomain,
+    HyroxStation,
+    IntensityLevel,
+    PhysicalCapacity,
+    Workout,
+    WorkoutCapacity,
+    WorkoutHyroxStation,
+    WorkoutLevelTime,
+)
+from domain.services.workout_analysis import (
+    analyze_workout,
+    capacity_focus,
+    estimate_fatigue_score,
+    hyrox_transfer_score,
+)
+from domain.services.workout_analysis_batch import (
+    analyze_workouts_batch,
+    fatigue_scores,
+    hyrox_transfer_scores,
+    pack_workouts,
+    top_capacity_indices,
+)
+
+
+def synthetic_workouts(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    intensities = list(IntensityLevel) + [None]
+    domains = list(EnergyDomain) + [None]
+    workouts = []
+    for idx in range(count):
+        capacities = rng.sample(list(PhysicalCapacity), rng.randint(0, len(PhysicalCapacity)))
+        stations = rng.sample(list(HyroxStation), rng.randint(0, 4))
+        workouts.append(
+            Workout(
+                id=idx,
+                title=f"WOD {idx}",
+                description="",
+                domain=rng.choice(domains),
+                intensity=rng.choice(intensities),
+                hyrox_transfer=rng.choice(intensities),
+                wod_type="AMRAP",
+                estimated_difficulty=rng.choice([None, round(rng.uniform(1, 10), 1)]),
+                avg_time_seconds=rng.choice([None, rng.randint(120, 3600)]),
+                capacities=[
+                    WorkoutCapacity(workout_id=idx, capacity=cap, value=rng.randint(0, 10) * 10, note="")
+                    for cap in capacities
+                ],
+                hyrox_stations=[
+                    WorkoutHyroxStation(workout_id=idx, station=st, transfer_pct=rng.randint(0, 100)) for st in stations
+                ],
+                level_times=[WorkoutLevelTime(workout_id=idx, athlete_level="RX", time_minutes=12.0, time_range="10-14")],
+            )
+        )
+    return workouts
+
+
+def _timed(fn, repeat: int):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return value, best
+
+
+def _scalar_core(workouts):
+    return (
+        [estimate_fatigue_score(w) for w in workouts],
+        [hyrox_transfer_score(w.hyrox_stations) for w in workouts],
+        [capacity_focus(w.capacities) for w in workouts],
+    )
+
+
+def _batch_core(workouts):
+    columns = pack_workouts(workouts)
+    return fatigue_scores(columns), hyrox_transfer_scores(columns), top_capacity_indices(columns)
+
+
+def _report(label, count, scalar_s, batch_s):
+    print(f"{label}: workouts={count} scalar={scalar_s * 1000:.1f}ms batch={batch_s * 1000:.1f}ms speedup={scalar_s / batch_s:.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="Se reporta el mejor de N.")
+    args = parser.parse_args(argv)
+
+    workouts = synthetic_workouts(args.count, args.seed)
+    analyze_workouts_batch(workouts[:10])  # calentamiento (import y primeras llamadas de numpy)
+    scalar, scalar_s = _timed(lambda: [analyze_workout(w) for w in workouts], args.repeat)
+    batch, batch_s = _timed(lambda: analyze_workouts_batch(workouts), args.repeat)
+    if scalar != batch:
+        raise SystemExit("batch result differs from scalar analyze_workout")
+    # Nucleo numerico (fatiga, transfer, top-3) sin construir los dicts de salida
+    _, core_scalar_s = _timed(lambda: _scalar_core(workouts), args.repeat)
+    _, core_batch_s = _timed(lambda: _batch_core(workouts), args.repeat)
+    _report("analysis", args.count, scalar_s, batch_s)
+    _report("numeric core", args.count, core_scalar_s, core_batch_s)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""EXPLAIN de las consultas calientes sobre datos sinteticos grandes; falla si alguna hace Seq Scan.
+
+Uso: ``PYTHONPATH=. python scripts/explain_hot_queries.py [--users 2000] [--rows 40] [--verbose]``
+Necesita ``DATABASE_URL`` migrada con catalogo (seed). Todo corre en una transaccion que se deshace:
+inserta ``--users`` usuarios sinteticos con ``--rows`` filas por tabla caliente, hace ANALYZE, ejecuta
+cada consulta registrada por su camino real (servicio/repositorio), captura el SQL emitido y lanza
+``EXPLAIN (FORMAT JSON)`` de cada SELECT. Sale con codigo 1 si hay un Seq Scan sobre una tabla caliente;
+con ``--strict`` tambien si un indice deja un filtro residual (el indice no cubre el predicado).
+"""
+
+import argparse
+import sys
+from datetime import date
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import Session
+
+from adapters.api.routes.athlete import _executed_on
+from application.services import AthleteService, AthleteStatsService, OverviewCache, TrainingLoadService
+from application.services.career_service import CareerService
+from application.services.recommendation_service import RecommendationService
+from application.services.workout_xp_service import WorkoutXPService
+from infrastructure.db.models import (
+    UserMissionORM,
+    UserPROM,
+    WorkoutAnalysisORM,
+    WorkoutExecutionORM,
+)
+from infrastructure.db.repositories import UserPRRepository, WorkoutResultRepository
+from infrastructure.db.session import engine
+
+# tablas que crecen con el uso: aqui un Seq Scan es un fallo; los catalogos pequenos pueden escanearse
+HOT_TABLES = {
+    "user_pr",
+    "user_pr_history",
+    "user_skills",
+    "user_skill_current",
+    "user_skill_totals",
+    "user_biometrics",
+    "user_biometric_current",
+    "user_capacity_profile",
+    "user_capacity_current",
+    "user_training_load",
+    "user_load_rollup",
+    "user_missions",
+    "workout_result",
+    "workout_analysis",
+    "workout_execution",
+}
+
+HOT_QUERIES: Dict[str, Callable[[Session, Dict[str, int]], object]] = {}
+
+
+def hot_query(name: str):
+    def register(fn):
+        HOT_QUERIES[name] = fn
+        return fn
+
+    return register
+
+
+@hot_query("athlete.skills")
+def _athlete_skills(session, ids):
+    AthleteService(session)._skills(ids["user_id"])
+
+
+@hot_query("athlete.prs")
+def _athlete_prs(session, ids):
+    AthleteService(session)._prs(ids["user_id"])
+
+
+@hot_query("athlete.latest_biometrics")
+def _athlete_biometrics(session, ids):
+    AthleteService(session)._latest_biometrics(ids["user_id"])
+
+
+@hot_query("athlete.latest_capacity")
+def _athlete_capacity(session, ids):
+    AthleteService(session)._latest_capacity(ids["user_id"])
+
+
+@hot_query("stats.overview")
+def _stats_overview(session, ids):
+    AthleteStatsService(session, cache=OverviewCache(max_entries=0)).overview(ids["user_id"])
+
+
+@hot_query("stats.prs")
+def _stats_prs(session, ids):
+    AthleteStatsService(session).prs(ids["user_id"])
+
+
+@hot_query("prs.register_bests")
+def _register_bests(session, ids):
+    UserPRRepository(session).register_bests(
+        ids["user_id"], [{"movement_id": ids["movement_id"], "pr_type": "time", "value": 1, "unit": "s"}]
+    )
+
+
+@hot_query("training_load.daily")
+def _training_load_daily(session, ids):
+    TrainingLoadService(session).daily(ids["user_id"])
+
+
+@hot_query("training_load.rollups")
+def _training_load_rollups(session, ids):
+    TrainingLoadService(session).rollups(ids["user_id"], "day")
+
+
+@hot_query("results.latest_for_user_workout")
+def _latest_result(session, ids):
+    WorkoutResultRepository(session).latest_for_user_workout(ids["user_id"], ids["workout_id"])
+
+
+@hot_query("results.weekly_streak")
+def _result_streak(session, ids):
+    WorkoutXPService(session)._weekly_streak(ids["user_id"])
+
+
+@hot_query("career.weekly_streak")
+def _career_streak(session, ids):
+    CareerService(session)._weekly_streak(ids["user_id"])
+
+
+@hot_query("recommendations.days_since_last")
+def _days_since_last(session, ids):
+    RecommendationService(session)._days_since_last(ids["user_id"])
+
+
+@hot_query("missions.for_user")
+def _missions(session, ids):
+    session.query(UserMissionORM).filter(UserMissionORM.user_id == ids["user_id"]).all()
+
+
+@hot_query("executions.today")
+def _execution_today(session, ids):
+    # submit_result / apply-impact: ejecucion del dia para el workout
+    session.query(WorkoutExecutionORM).filter(
+        WorkoutExecutionORM.user_id == ids["user_id"],
+        WorkoutExecutionORM.workout_id == ids["workout_id"],
+        _executed_on(date.today()),
+    ).order_by(WorkoutExecutionORM.executed_at.desc()).first()
+
+
+@hot_query("executions.recent")
+def _execution_recent(session, ids):
+    # /users/{id}/training-load/details
+    session.query(WorkoutExecutionORM).filter(WorkoutExecutionORM.user_id == ids["user_id"]).order_by(
+        WorkoutExecutionORM.executed_at.desc()
+    ).limit(50).all()
+
+
+@hot_query("analysis.latest_for_workout")
+def _latest_analysis(session, ids):
+    # apply-impact sin analysis_id
+    session.query(WorkoutAnalysisORM).filter(
+        WorkoutAnalysisORM.user_id == ids["user_id"], WorkoutAnalysisORM.workout_id == ids["workout_id"]
+    ).order_by(WorkoutAnalysisORM.created_at.desc()).first()
+
+
+@hot_query("pr.best_for_movement")
+def _best_pr(session, ids):
+    session.execute(
+        select(UserPROM.value).where(
+            UserPROM.user_id == ids["user_id"], UserPROM.movement_id == ids["movement_id"], UserPROM.pr_type == "time"
+        )
+    ).first()
+
+
+# recalculo de los punteros actuales en los triggers sync_*_current (plpgsql, no pasa por SQLAlchemy)
+@hot_query("trigger.skill_current_recompute")
+def _skill_recompute(session, ids):
+    session.execute(
+        text(
+            "SELECT user_id, movement_id, id, measured_at FROM user_skills WHERE user_id = :user_id "
+            "AND movement_id = :movement_id ORDER BY measured_at DESC, id DESC LIMIT 1"
+        ),
+        ids,
+    )
+
+
+@hot_query("trigger.biometric_current_recompute")
+def _biometric_recompute(session, ids):
+    session.execute(
+        text(
+            "SELECT user_id, id, measured_at FROM user_biometrics WHERE user_id = :user_id "
+            "ORDER BY measured_at DESC, id DESC LIMIT 1"
+        ),
+        ids,
+    )
+
+
+@hot_query("trigger.capacity_current_recompute")
+def _capacity_recompute(session, ids):
+    session.execute(
+        text(
+            "SELECT user_id, capacity_id, id, measured_at FROM user_capacity_profile WHERE user_id = :user_id "
+            "AND capacity_id = :capacity_id ORDER BY measured_at DESC, id DESC LIMIT 1"
+        ),
+        ids,
+    )
+
+
+SYNTHETIC_SQL = [
+    # workout_result.time_seconds es SmallInteger
+    "INSERT INTO workout_result (workout_id, user_id, time_seconds, created_at) "
+    "SELECT w[1 + g % cardinality(w)], u, 300 + g % 900, now() - g * interval '6 hours' "
+    "FROM unnest(:users) u, generate_series(1, :rows) g, (SELECT array_agg(id) w FROM workouts) ws",
+    "INSERT INTO workout_execution (workout_id, user_id, executed_at, total_time_seconds) "
+    "SELECT w[1 + g % cardinality(w)], u, now() - g * interval '6 hours', 600 "
+    "FROM unnest(:users) u, generate_series(1, :rows) g, (SELECT array_agg(id) w FROM workouts) ws",
+    "INSERT INTO workout_analysis (workout_id, user_id, created_at) "
+    "SELECT w[1 + g % cardinality(w)], u, now() - g * interval '6 hours' "
+    "FROM unnest(:users) u, generate_series(1, :rows) g, (SELECT array_agg(id) w FROM workouts) ws",
+    "INSERT INTO user_skills (user_id, movement_id, skill_score, note, measured_at) "
+    "SELECT u, m[1 + g % cardinality(m)], 50, 'explain', now() - g * interval '1 hour' "
+    "FROM unnest(:users) u, generate_series(1, :rows) g, (SELECT array_agg(id) m FROM movements) ms",
+    "INSERT INTO user_biometrics (user_id, measured_at) "
+    "SELECT u, now() - g * interval '1 day' FROM unnest(:users) u, generate_series(1, :rows) g",
+    "INSERT INTO user_capacity_profile (user_id, capacity_id, value, measured_at) "
+    "SELECT u, c[1 + g % cardinality(c)], 50, now() - g * interval '1 hour' "
+    "FROM unnest(:users) u, generate_series(1, :rows) g, (SELECT array_agg(id) c FROM physical_capacities) cs",
+    "INSERT INTO user_training_load (user_id, load_date, acute_load, chronic_load, load_ratio) "
+    "SELECT u, current_date - g, 300, 300, 1 FROM unnest(:users) u, generate_series(1, :rows) g",
+    "INSERT INTO user_load_rollup (user_id, granularity, bucket_start, load, sessions) "
+    "SELECT u, 'day', current_date - g, 300, 1 FROM unnest(:users) u, generate_series(1, :rows) g",
+    "INSERT INTO user_pr (user_id, movement_id, pr_type, value, unit, achieved_at) "
+    "SELECT u, m.id, 'time', 100, 's', now() FROM unnest(:users) u, "
+    "(SELECT id FROM movements ORDER BY id LIMIT :rows) m",
+    "INSERT INTO user_skill_totals (user_id, movement_id, total_reps) "
+    "SELECT u, m.id, 100 FROM unnest(:users) u, (SELECT id FROM movements ORDER BY id LIMIT :rows) m",
+    "INSERT INTO user_missions (user_id, mission_id, status, progress_value) "
+    "SELECT u, m.id, 'assigned', 0 FROM unnest(:users) u, missions m",
+]
+
+
+def _seed(connection, users: int, rows: int) -> List[int]:
+    user_ids = list(
+        connection.execute(
+            text(
+                "INSERT INTO users (name, email, password) "
+                "SELECT 'explain ' || g, 'explain-' || g || '@example.invalid', 'x' FROM generate_series(1, :n) g "
+                "RETURNING id"
+            ),
+            {"n": users},
+        ).scalars()
+    )
+    for sql in SYNTHETIC_SQL:
+        connection.execute(text(sql), {"users": user_ids, "rows": rows})
+    for table in sorted(HOT_TABLES):
+        connection.execute(text(f"ANALYZE {table}"))
+    return user_ids
+
+
+def _scans(node) -> List[Tuple[str, str, str]]:
+    out = []
+    if "Relation Name" in node:
+        out.append((node["Node Type"], node["Relation Name"], node.get("Filter", "")))
+    for child in node.get("Plans", []):
+        out.extend(_scans(child))
+    return out
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    # las tablas de estado actual tienen una fila por usuario: hacen falta muchos usuarios para que pesen
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=40, help="Filas sinteticas por usuario y tabla.")
+    parser.add_argument("--verbose", action="store_true", help="Muestra el SQL de cada sentencia.")
+    parser.add_argument("--strict", action="store_true", help="Falla tambien con filtros residuales.")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            user_ids = _seed(connection, args.users, args.rows)
+            user_id = user_ids[len(user_ids) // 2]
+            ids = {"user_id": user_id}
+            for key, sql in (
+                ("workout_id", "SELECT workout_id FROM workout_result WHERE user_id = :u LIMIT 1"),
+                ("movement_id", "SELECT movement_id FROM user_skills WHERE user_id = :u LIMIT 1"),
+                ("capacity_id", "SELECT capacity_id FROM user_capacity_profile WHERE user_id = :u LIMIT 1"),
+            ):
+                ids[key] = connection.execute(text(sql), {"u": user_id}).scalar()
+            print(f"synthetic users={len(user_ids)} rows/user={args.rows} target={ids}")
+
+            # cada consulta corre en un savepoint: las escrituras (p.ej. register_bests) se deshacen al terminar
+            session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+            captured: List[Tuple[str, object]] = []
+
+            def capture(conn, cursor, statement, parameters, context, executemany):
+                if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                    captured.append((statement, parameters))
+
+            for name, run in HOT_QUERIES.items():
+                captured.clear()
+                event.listen(connection, "before_cursor_execute", capture)
+                try:
+                    run(session, ids)
+                    session.flush()
+                finally:
+                    event.remove(connection, "before_cursor_execute", capture)
+                for statement, parameters in captured:
+                    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+                    scans = _scans(plan[0]["Plan"])
+                    hot = [(node_type, table, residual) for node_type, table, residual in scans if table in HOT_TABLES]
+                    seq = sorted({table for node_type, table, _ in hot if node_type == "Seq Scan"})
+                    filtered = sorted({f"{table} ({residual})" for node_type, table, residual in hot if residual and node_type != "Seq Scan"})
+                    failed = bool(seq) or (args.strict and bool(filtered))
+                    failures += failed
+                    status = f"SEQ SCAN {','.join(seq)}" if seq else "FILTER" if filtered else "ok"
+                    print(f"[{status}] {name}: {', '.join(f'{node_type}:{table}' for node_type, table, _ in scans)}")
+                    for residual in filtered:
+                        print(f"    filtro residual en {residual}")
+                    if args.verbose or failed:
+                        print(f"    {' '.join(statement.split())}")
+                session.rollback()
+            session.close()
+        finally:
+            transaction.rollback()
+
+    print(f"{len(HOT_QUERIES)} hot queries, {failures} failing statements")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
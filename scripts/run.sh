@@ -46,4 +46,5 @@ PY
 fi
 
 alembic upgrade head
+python -m infrastructure.db.seed
 uvicorn main:app --host 0.0.0.0 --port 8000
@@ -0,0 +1,23 @@
+from application.services.analysis_cache import AnalysisCache, payload_key
+from domain.models.enums import IntensityLevel
+
+
+def test_key_ignores_key_order_and_serializes_enums():
+    left = {"title": "A", "intensity": IntensityLevel.HIGH, "capacities": [{"value": 80}]}
+    right = {"capacities": [{"value": 80}], "intensity": "Alta", "title": "A"}
+    assert payload_key(left) == payload_key(right)
+    assert payload_key(left) != payload_key({**right, "title": "B"})
+
+
+def test_lru_eviction_and_hit_ratio():
+    cache = AnalysisCache(max_entries=2)
+    cache.put("a", {"fatigue_score": 1.0})
+    cache.put("b", {"fatigue_score": 2.0})
+    assert cache.get("a") == {"fatigue_score": 1.0}
+    cache.put("c", {"fatigue_score": 3.0})  # expulsa "b", el menos usado
+
+    assert cache.get("b") is None
+    returned = cache.get("c")
+    returned["xp_estimate"] = 10
+    assert cache.get("c") == {"fatigue_score": 3.0}
+    assert cache.stats() == {"size": 2, "max_entries": 2, "hits": 3, "misses": 1, "evictions": 1, "hit_ratio": 0.75}
@@ -0,0 +1,49 @@
+import os
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from adapters.api.routes.athlete import _executed_on
+from infrastructure.db.models import WorkoutExecutionORM
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_executed_on_is_half_open_range_on_the_raw_column():
+    sql = _sql(_executed_on(date(2026, 2, 28)))
+    assert "date(" not in sql.lower()
+    assert "workout_execution.executed_at >= '2026-02-28 00:00:00'" in sql
+    assert "workout_execution.executed_at < '2026-03-01 00:00:00'" in sql
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+@pytest.mark.skipif(not os.getenv("DATABASE_URL"), reason="needs a migrated database (DATABASE_URL)")
+def test_todays_execution_lookup_uses_composite_index():
+    engine = create_engine(os.environ["DATABASE_URL"])
+    try:
+        connection = engine.connect()
+    except OperationalError:
+        pytest.skip("database not reachable")
+    with connection, Session(bind=connection) as session:
+        # sin seq scan disponible el planner solo elige el indice si el predicado es indexable
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        query = session.query(WorkoutExecutionORM.id).filter(
+            WorkoutExecutionORM.user_id == 1,
+            WorkoutExecutionORM.workout_id == 1,
+            _executed_on(date.today()),
+        )
+        plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {_sql(query.statement)}")).scalar()[0]["Plan"]
+        scans = [node for node in _plan_nodes(plan) if node.get("Relation Name") == "workout_execution"]
+        assert scans and all(node.get("Index Name") == "ix_workout_execution_user_workout_executed" for node in scans)
+        assert "executed_at" in scans[0].get("Index Cond", "")
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = {"cv2", "numpy", "PIL", "pytesseract"}
+
+
+def _imported_modules(target: str) -> set:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        name = line.rsplit("|", 1)[1].strip()
+        modules.add(name.split(".", 1)[0])
+    return modules
+
+
+def test_api_import_does_not_load_ocr_stack():
+    loaded = _imported_modules("main") & HEAVY_MODULES
+    assert not loaded, f"API cold start imports OCR deps: {sorted(loaded)}"
+
+
+def test_ocr_module_is_loaded_on_demand():
+    loaded = _imported_modules("application.services.ocr_image")
+    assert HEAVY_MODULES <= loaded
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from application.services.athlete_stats_service import (
+    SKILL_AGGREGATE_NOTE,
+    AthleteStatsService,
+    OverviewCache,
+    skill_breakdown,
+)
+from infrastructure.db.models import MovementORM, UserORM, UserSkillORM, UserSkillTotalsORM
+
+
+def test_invalidate_ttl_and_lru():
+    cache = OverviewCache(max_entries=2, ttl_seconds=60)
+    cache.put(1, {"totals": {"prs_total": 1}})
+    cache.put(2, {"totals": {"prs_total": 2}})
+    assert cache.get(1) == {"totals": {"prs_total": 1}}
+    cache.put(3, {"totals": {"prs_total": 3}})  # expulsa 2, el menos usado
+    assert cache.get(2) is None
+
+    cache.invalidate(1)
+    assert cache.get(1) is None
+
+    expired = OverviewCache(ttl_seconds=-1)
+    expired.put(1, {})
+    assert expired.get(1) is None
+
+
+def test_breakdown_picks_first_non_zero_metric():
+    totals = {"total_reps": 12, "total_kg": 0, "total_meters": 400, "total_cals": 0, "total_seconds": 0}
+    breakdown = skill_breakdown(totals, None)
+    assert breakdown["primary_metric"] == "total_reps"
+    assert breakdown["primary_value"] == 12.0
+    assert skill_breakdown(None, None) == {}
+
+
+@pytest.mark.skipif(not os.getenv("DATABASE_URL"), reason="needs a migrated database (DATABASE_URL)")
+def test_skills_total_sums_the_displayed_values():
+    engine = create_engine(os.environ["DATABASE_URL"])
+    try:
+        connection = engine.connect()
+    except OperationalError:
+        pytest.skip("database not reachable")
+    with connection, Session(bind=connection) as session:
+        user = UserORM(name="stats", email="stats-total@example.com", password="x")
+        session.add(user)
+        session.flush()
+        first, second = session.query(MovementORM.id).order_by(MovementORM.id).limit(2).all()
+        # puntuacion 0-100 + fila de volumen (se muestra total_kg, no su skill_score)
+        session.add_all(
+            [
+                UserSkillORM(user_id=user.id, movement_id=first.id, skill_score=80, note="manual"),
+                UserSkillORM(user_id=user.id, movement_id=second.id, skill_score=5, note=SKILL_AGGREGATE_NOTE),
+                UserSkillTotalsORM(user_id=user.id, movement_id=second.id, total_reps=50, total_kg=1200),
+            ]
+        )
+        session.flush()
+        overview = AthleteStatsService(session, cache=OverviewCache(max_entries=0)).overview(user.id)
+        assert sorted(item["value"] for item in overview["topSkills"]) == [80.0, 1200.0]
+        assert overview["totals"]["skills_total"] == 1280.0
+        connection.rollback()
@@ -0,0 +1,49 @@
+import random
+
+from domain.services.quantile_sketch import TDigest
+
+
+def _exact(sorted_values, q):
+    return sorted_values[int(q * (len(sorted_values) - 1))]
+
+
+def test_quantiles_close_to_exact_with_bounded_size():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(6, 0.4) for _ in range(20000)]
+    digest = TDigest()
+    for value in values:
+        digest.add(value)
+
+    ordered = sorted(values)
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        assert abs(digest.quantile(q) - _exact(ordered, q)) / _exact(ordered, q) < 0.01
+    assert digest.count == len(values)
+    assert len(digest.to_json()["m"]) <= digest.compression
+
+
+def test_merge_after_roundtrip_matches_single_digest():
+    rng = random.Random(11)
+    values = [rng.uniform(300, 900) for _ in range(5000)]
+    left, right, whole = TDigest(), TDigest(), TDigest()
+    for value in values[:2500]:
+        left.add(value)
+    for value in values[2500:]:
+        right.add(value)
+    for value in values:
+        whole.add(value)
+
+    merged = TDigest.from_json(left.to_json()).merge(right)
+    assert merged.count == whole.count
+    assert merged.min == min(values) and merged.max == max(values)
+    for q in (0.1, 0.5, 0.9):
+        assert abs(merged.quantile(q) - whole.quantile(q)) < 5
+
+
+def test_small_samples_are_exact():
+    digest = TDigest()
+    for value in (500, 600, 700):
+        digest.add(value)
+    assert digest.quantile(0.5) == 600
+    assert digest.quantile(0.0) == 500
+    assert digest.quantile(1.0) == 700
+    assert TDigest().quantile(0.5) is None
@@ -0,0 +1,54 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from adapters.api.query_metrics import QueryMetricsMiddleware
+from infrastructure.db import query_metrics
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    query_metrics.install(engine)
+    return engine
+
+
+def test_counts_queries_and_redacts_parameters():
+    engine = _engine()
+    stats, token = query_metrics.start("test")
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT :email"), {"email": "athlete@example.com"})
+            connection.execute(text("SELECT 1"))
+    finally:
+        query_metrics.stop(token)
+    assert stats.count == 2 and stats.seconds > 0
+    assert query_metrics.current() is None
+    assert query_metrics.redact({"email": "athlete@example.com", "n": 3}) == {"email": "str", "n": "int"}
+    assert query_metrics.redact([{"a": 1}, {"a": 2}]) == "<2 rows>"
+
+
+def _app(debug: bool) -> FastAPI:
+    engine = _engine()
+    app = FastAPI()
+
+    # endpoint sync: corre en el threadpool, el contador debe seguir llegando
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        with engine.connect() as connection:
+            for _ in range(3):
+                connection.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    app.add_middleware(QueryMetricsMiddleware, debug=debug)
+    return app
+
+
+def test_server_timing_header_only_in_debug(caplog):
+    caplog.set_level("INFO", logger="http.queries")
+    response = TestClient(_app(debug=True)).get("/items/7")
+    assert response.status_code == 200
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+    record = next(r for r in caplog.records if r.name == "http.queries")
+    assert record.route == "/items/{item_id}" and record.queries == 3
+
+    assert "server-timing" not in TestClient(_app(debug=False)).get("/items/7").headers
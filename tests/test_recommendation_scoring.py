@@ -0,0 +1,25 @@
+import numpy as np
+
+from domain.services.recommendation_scoring import score_workouts, target_load, top_indices
+
+
+def test_gaps_load_and_recency_drive_ranking():
+    # Workouts: 0 = fuerza intensa, 1 = resistencia suave, 2 = igual que 1 pero hecho ayer
+    capacities = np.array([[90, 10], [10, 90], [10, 90]], dtype=np.float32)
+    session_load = np.array([1.6, 0.8, 0.8], dtype=np.float32)
+    never = np.array([np.inf, np.inf, 1.0])
+    endurance_gap = np.array([0.0, 0.3], dtype=np.float32)
+
+    scores = score_workouts(capacities, session_load, endurance_gap, target_load(1.0), never)
+    assert top_indices(scores, 3).tolist() == [1, 0, 2]
+
+    # Con carga aguda alta (ratio 1.5) la sesion suave gana aunque el deficit sea de fuerza
+    strength_gap = np.array([0.05, 0.0], dtype=np.float32)
+    scores = score_workouts(capacities, session_load, strength_gap, target_load(1.5), never)
+    assert top_indices(scores, 1).tolist() == [1]
+
+
+def test_target_load_is_clamped():
+    assert target_load(None) == 0.5
+    assert target_load(3.0) == 0.0
+    assert target_load(0.2) == 1.0
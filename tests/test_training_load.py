@@ -0,0 +1,99 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from application.services.training_load_service import NO_DOMAIN, ROLLUP_MAX_BUCKETS, TrainingLoadService
+from domain.services.training_load import ACUTE_LAMBDA, CHRONIC_LAMBDA, add_load, bucket_start, decay, shift_bucket
+
+
+def _full_ewma(daily_loads, lam):
+    value = 0.0
+    for load in daily_loads:
+        value = lam * load + (1 - lam) * value
+    return value
+
+
+def test_incremental_state_matches_full_recompute():
+    start = date(2026, 1, 1)
+    daily = [300, 0, 0, 450, 200, 0, 0, 0, 0, 0, 600, 0, 350]
+    state = None
+    for offset, load in enumerate(daily):
+        if load:
+            # dos sesiones el mismo dia equivalen a una con la suma
+            for half in (load / 2, load / 2):
+                state = add_load(state, half, start + timedelta(days=offset))
+    today = decay(state, start + timedelta(days=len(daily) + 2))
+
+    expected = daily + [0, 0, 0]
+    assert abs(today.acute - _full_ewma(expected, ACUTE_LAMBDA)) < 1e-9
+    assert abs(today.chronic - _full_ewma(expected, CHRONIC_LAMBDA)) < 1e-9
+    assert today.ratio == round(today.acute / today.chronic, 2)
+
+
+def test_backdated_session_lands_decayed():
+    day = date(2026, 3, 10)
+    late = add_load(add_load(None, 400, day), 200, day - timedelta(days=2))
+    in_order = decay(add_load(add_load(None, 200, day - timedelta(days=2)), 400, day), day)
+    assert late.as_of == day
+    assert abs(late.acute - in_order.acute) < 1e-9
+    assert abs(late.chronic - in_order.chronic) < 1e-9
+
+
+def test_bucket_start_and_shift_align_to_monday_and_first_of_month():
+    day = date(2026, 3, 5)  # jueves
+    assert bucket_start(day, "day") == day
+    assert bucket_start(day, "week") == date(2026, 3, 2)
+    assert bucket_start(day, "month") == date(2026, 3, 1)
+    assert shift_bucket(day, "week", -1) == date(2026, 2, 23)
+    assert shift_bucket(day, "month", -3) == date(2025, 12, 1)
+    assert shift_bucket(date(2026, 1, 31), "month", 1) == date(2026, 2, 1)
+    with pytest.raises(ValueError):
+        bucket_start(day, "year")
+
+
+class _RollupRepo:
+    def __init__(self, rows):
+        self.rows = rows
+        self.ranges = []
+
+    def list_range(self, user_id, granularity, start, end):
+        self.ranges.append((start, end))
+        return [row for row in self.rows if start <= row.bucket_start <= end]
+
+
+def _service(rows=()):
+    service = TrainingLoadService.__new__(TrainingLoadService)
+    service.rollup_repo = _RollupRepo(list(rows))
+    return service
+
+
+def _row(bucket, domain, load, sessions=1, seconds=600):
+    return SimpleNamespace(bucket_start=bucket, domain_code=domain, load=load, sessions=sessions, total_seconds=seconds)
+
+
+def test_rollups_default_range_and_bucket_cap():
+    service = _service()
+    service.rollups(1, "month", end=date(2026, 10, 19))
+    service.rollups(1, "week", end=date(2026, 10, 19))
+    assert service.rollup_repo.ranges == [
+        (date(2025, 11, 1), date(2026, 10, 1)),  # 12 meses
+        (date(2026, 8, 3), date(2026, 10, 19)),  # 12 semanas
+    ]
+    end = date(2026, 10, 19)
+    service.rollups(1, "day", start=end - timedelta(days=ROLLUP_MAX_BUCKETS - 1), end=end)
+    with pytest.raises(ValueError):
+        service.rollups(1, "day", start=end - timedelta(days=ROLLUP_MAX_BUCKETS), end=end)
+    with pytest.raises(ValueError):
+        service.rollups(1, "month", start=shift_bucket(end, "month", -ROLLUP_MAX_BUCKETS), end=end)
+
+
+def test_rollups_merge_domains_and_keep_undomained_in_totals_only():
+    week = date(2026, 10, 12)
+    service = _service(
+        [_row(week, "Aeróbico", 300), _row(week, "Mixto", 200, sessions=2), _row(week, NO_DOMAIN, 100)]
+    )
+    [bucket] = service.rollups(1, "week", start=week, end=week)
+    assert bucket["load"] == 600 and bucket["sessions"] == 4 and bucket["total_seconds"] == 1800
+    assert set(bucket["by_domain"]) == {"Aeróbico", "Mixto"}
+    assert bucket["by_domain"]["Mixto"] == {"load": 200.0, "sessions": 2, "total_seconds": 600.0}
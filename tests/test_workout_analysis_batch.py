@@ -0,0 +1,69 @@
+import random
+
+from domain.models import (
+    AnalysisCapacity,
+    AnalysisHyroxStation,
+    EnergyDomain,
+    HyroxStation,
+    IntensityLevel,
+    PhysicalCapacity,
+    Workout,
+    WorkoutCapacity,
+    WorkoutAnalysisInput,
+    WorkoutHyroxStation,
+)
+from domain.services.workout_analysis import analyze_workout
+from domain.services.workout_analysis_batch import analyze_workouts_batch
+
+
+def _workout(rng, idx):
+    capacities = rng.sample(list(PhysicalCapacity), rng.randint(0, 5))
+    stations = rng.sample(list(HyroxStation), rng.randint(0, 4))
+    return Workout(
+        id=idx,
+        title=f"WOD {idx}",
+        description="",
+        domain=rng.choice(list(EnergyDomain) + [None, "Mixto"]),
+        intensity=rng.choice(list(IntensityLevel) + [None]),
+        hyrox_transfer=rng.choice(list(IntensityLevel) + [None]),
+        wod_type="AMRAP",
+        # Duraciones en los cortes 5/15/30 min y dificultades con empates de redondeo
+        estimated_difficulty=rng.choice([None, 0, 7, rng.uniform(0, 10), round(rng.uniform(0, 10), 3)]),
+        avg_time_seconds=rng.choice([None, 0, 300, 900, 1800, rng.randint(60, 4000)]),
+        capacities=[
+            WorkoutCapacity(workout_id=idx, capacity=cap, value=rng.choice([50, 70, 70, rng.randint(0, 100)]), note="n")
+            for cap in capacities
+        ],
+        hyrox_stations=[
+            WorkoutHyroxStation(workout_id=idx, station=st, transfer_pct=rng.choice([rng.randint(0, 100), 33.5]))
+            for st in stations
+        ],
+    )
+
+
+def test_batch_matches_scalar_analysis():
+    rng = random.Random(3)
+    workouts = [_workout(rng, idx) for idx in range(2000)]
+    assert analyze_workouts_batch(workouts) == [analyze_workout(w) for w in workouts]
+
+
+def test_empty_batch():
+    assert analyze_workouts_batch([]) == []
+
+
+def test_lean_input_matches_full_entity():
+    rng = random.Random(5)
+    for idx in range(200):
+        full = _workout(rng, idx)
+        lean = WorkoutAnalysisInput(
+            id=full.id,
+            domain=full.domain,
+            intensity=full.intensity,
+            hyrox_transfer=full.hyrox_transfer,
+            estimated_difficulty=full.estimated_difficulty,
+            avg_time_seconds=full.avg_time_seconds,
+            capacities=[AnalysisCapacity(capacity=c.capacity, value=c.value, note=c.note) for c in full.capacities],
+            hyrox_stations=[AnalysisHyroxStation(transfer_pct=s.transfer_pct) for s in full.hyrox_stations],
+        )
+        assert not hasattr(lean, "__dict__")
+        assert analyze_workout(lean) == analyze_workout(full)
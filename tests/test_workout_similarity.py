@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+
+from application.services.workout_similarity import (
+    FeatureLayout,
+    WorkoutFeatures,
+    WorkoutSimilarityIndex,
+    build_vectors,
+)
+
+LAYOUT = FeatureLayout(
+    capacity_ids={"Fuerza": 1, "Metcon": 2, "Resistencia": 3},
+    muscle_ids={"Core": 10, "Piernas": 11},
+    domain_ids={"Aeróbico": 20, "Mixto": 21},
+    intensity_ids={"Alta": 31, "Baja": 32, "Media": 30},
+)
+
+
+def _features(rng):
+    return WorkoutFeatures(
+        domain_id=rng.choice([20, 21, None]),
+        intensity_id=rng.choice([30, 31, 32, None]),
+        minutes=rng.choice([None, 4.0, 5.0, 12.0, 30.0, 45.0]),
+        capacities={cid: rng.randint(0, 100) for cid in rng.sample([1, 2, 3], rng.randint(0, 3))},
+        muscles=set(rng.sample([10, 11], rng.randint(0, 2))),
+        movements={rng.randint(1, 300) for _ in range(rng.randint(0, 4))},
+    )
+
+
+def _index(features):
+    index = WorkoutSimilarityIndex()
+    index._replace(LAYOUT, features)
+    return index
+
+
+def _rows(index):
+    return {int(wid): index._rows[int(wid)] for wid in index._ids[: index.size]}
+
+
+def test_vectors_are_unit_rows_and_identical_workouts_score_one():
+    rng = random.Random(3)
+    feats = [_features(rng) for _ in range(20)]
+    feats.append(feats[0])
+    matrix = build_vectors(LAYOUT, feats)
+    assert matrix.shape == (21, LAYOUT.dim)
+    norms = np.linalg.norm(matrix, axis=1)
+    # la duracion siempre tiene una columna activa: ninguna fila queda a cero
+    assert np.allclose(norms, 1.0, atol=1e-5)
+    assert np.isclose(matrix[0] @ matrix[20], 1.0, atol=1e-5)
+
+
+def test_incremental_upsert_and_remove_match_full_rebuild():
+    rng = random.Random(11)
+    catalog = {wid: _features(rng) for wid in range(1, 31)}
+    index = _index(catalog)
+
+    # altas (crecen la matriz), ediciones y bajas mezcladas en varios lotes
+    removed = added = 0
+    for _ in range(6):
+        touched = rng.sample(range(1, 51), 8)
+        for wid in touched:
+            if wid in catalog and rng.random() < 0.4:
+                catalog.pop(wid)
+                removed += 1
+            else:
+                added += wid not in catalog
+                catalog[wid] = _features(rng)
+        # ids sin cambios o inexistentes en el mismo lote no deben alterar nada
+        index._apply(touched + rng.sample(range(1, 61), 4), catalog)
+    assert removed and added and len(index._matrix) > 30
+
+    rebuilt = _index(catalog)
+    assert index.size == rebuilt.size == len(catalog)
+    assert set(_rows(index)) == set(catalog)
+    for wid, row in _rows(index).items():
+        other = rebuilt._rows[wid]
+        assert np.allclose(index._matrix[row], rebuilt._matrix[other], atol=1e-6)
+        assert np.array_equal(index._capacities[row], rebuilt._capacities[other])
+        assert np.isclose(index._loads[row], rebuilt._loads[other])
+    for wid in rng.sample(sorted(catalog), 5):
+        got, expected = index.nearest(None, wid, 5), rebuilt.nearest(None, wid, 5)
+        assert [w for w, _ in got] == [w for w, _ in expected]
+        assert np.allclose([s for _, s in got], [s for _, s in expected], atol=1e-6)